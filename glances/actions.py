@@ -83,6 +83,7 @@ class GlancesActions:
         :param commands: a list of command line with optional {{mustache}}
         :param repeat: If True, then repeat the action
         :param  mustache_dict: Plugin stats (can be use within {{mustache}})
+                               or a function returning the stats (only called if the action is ran)
 
         :return: True if the commands have been ran.
         """
@@ -90,6 +91,9 @@ class GlancesActions:
             # Action already executed => Exit
             return False
 
+        if callable(mustache_dict):
+            mustache_dict = mustache_dict()
+
         logger.debug(
             "{} action {} for {} ({}) with stats {}".format(
                 "Repeat" if repeat else "Run", commands, stat_name, criticality, mustache_dict
@@ -70,6 +70,9 @@ class AmpsList:
         # Log AMPs list
         logger.debug(f"AMPs list: {self.getList()}")
 
+        # Processes monitored by the AMPs always have the full stats
+        glances_processes.set_watched_regex([v.regex() for v in self.__amps_dict.values() if v.enable() and v.regex()])
+
         return True
 
     def __str__(self):
@@ -7,7 +7,8 @@
 #
 
 from glances import __version__ as glances_version
-from glances.globals import auto_unit, weak_lru_cache
+from glances.cache import GlancesStatsCache
+from glances.globals import auto_unit
 from glances.main import GlancesMain
 from glances.outputs.glances_bars import Bar
 from glances.processes import sort_stats
@@ -31,20 +32,25 @@ class GlancesAPI:
 
         # Set the cache TTL for the API
         self.ttl = self.args.time if self.args.time is not None else self.ttl
+        self._cache = GlancesStatsCache(ttl=self.ttl)
 
         # Init the stats of all plugins in order to ensure that rate are computed
         self._stats.update()
 
-    @weak_lru_cache(maxsize=1, ttl=ttl)
     def __getattr__(self, item):
-        """Fallback to the stats object for any missing attributes."""
-        if item in self._stats.getPluginsList():
-            if item in plugin_dependencies_tree:
-                # Ensure dependencies are updated before accessing the plugin
-                for dependency in plugin_dependencies_tree[item]:
-                    self._stats.get_plugin(dependency).update()
-            # Update the plugin stats
-            self._stats.get_plugin(item).update()
+        """Fallback to the stats object for any missing attributes.
+
+        The plugin stats are updated at most once every ttl seconds.
+        """
+        if not item.startswith('_') and item in self._stats.getPluginsList():
+            if not self._cache.get(item):
+                if item in plugin_dependencies_tree:
+                    # Ensure dependencies are updated before accessing the plugin
+                    for dependency in plugin_dependencies_tree[item]:
+                        self._stats.get_plugin(dependency).update()
+                # Update the plugin stats
+                self._stats.get_plugin(item).update()
+                self._cache.set(item)
             return self._stats.get_plugin(item)
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
 
@@ -114,4 +120,4 @@ class GlancesAPI:
             for p in self._stats.get_plugin('processlist').get_raw()
             if p['cmdline'] and 'glances' not in (p['cmdline'] or ())
         ]
-        return sort_stats(all_but_glances, sorted_by=sorted_by, sorted_by_secondary=sorted_by_secondary)[:limit]
+        return sort_stats(all_but_glances, sorted_by=sorted_by, sorted_by_secondary=sorted_by_secondary, limit=limit)
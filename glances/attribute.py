@@ -8,7 +8,14 @@
 
 """Attribute class."""
 
+import math
+import mmap
+import os
+import struct
+import time
+from array import array
 from datetime import datetime
+from itertools import chain
 
 # Ugly hack waiting for Python 3.10 deprecation
 try:
@@ -27,13 +34,16 @@ class GlancesAttribute:
         :param description: Attribute human reading description (string)
         :param history_max_size: Maximum size of the history list (default is no limit)
 
-        History is stored as a list for tuple: [(date, value), ...]
+        History is stored as a ring buffer of two columns:
+        - timestamps: array of float (epoch, UTC)
+        - values: array of int or float (or a list for others types)
+        The history is returned as a list for tuple: [(date, value), ...]
         """
         self._name = name
         self._description = description
         self._value = None
         self._history_max_size = history_max_size
-        self._history = []
+        self._history_init()
 
     def __repr__(self):
         return self.value
@@ -71,8 +81,9 @@ class GlancesAttribute:
 
     @property
     def value(self):
-        if self.history_len() > 0:
-            return (self._value[1] - self.history_value()[1]) / (self._value[0] - self.history_value()[0])
+        if self._value is not None and self.history_len() > 1:
+            t, v = self._history_item(-2)
+            return (self._value[1] - v) / (self._value[0] - t)
         return None
 
     @value.setter
@@ -81,59 +92,300 @@ class GlancesAttribute:
 
         Value is a tuple: (<timestamp>, <new_value>)
         """
-        self._value = (datetime.now(UTC), new_value)
+        self._value = (time.time(), new_value)
         self.history_add(self._value)
 
+    @property
+    def timestamp(self):
+        """Return the timestamp (epoch) of the last value set"""
+        return self._value[0] if self._value else None
+
+    @staticmethod
+    def to_datetime(timestamp):
+        """Convert an history timestamp (epoch) to a datetime (UTC)"""
+        return datetime.fromtimestamp(timestamp, UTC)
+
     """
     Properties for the attribute history
     """
 
     @property
     def history(self):
-        return self._history
+        return self.history_raw()
 
     @history.setter
     def history(self, new_history):
-        self._history = new_history
+        self.history_reset()
+        for d, v in new_history:
+            self.history_add((d.timestamp() if isinstance(d, datetime) else d, v))
 
     @history.deleter
     def history(self):
-        del self._history
+        self.history_reset()
+
+    def _history_init(self):
+        """Init the history storage"""
+        self.history_reset()
 
     def history_reset(self):
-        self._history = []
+        self._timestamps = array('d')
+        # The values typecode is set with the first value
+        self._values = None
+        # Position of the oldest value (when the ring buffer is full)
+        self._start = 0
 
     def history_add(self, value):
-        """Add a value in the history"""
-        if self._history_max_size:
-            if self.history_len() >= self._history_max_size:
-                self._history.pop(0)
-            self._history.append(value)
+        """Add a value (tuple: (<timestamp>, <value>)) in the history"""
+        if not self._history_max_size:
+            return
+        timestamp, v = value
+        self._check_values_type(v)
+        if len(self._timestamps) < self._history_max_size:
+            self._values.append(v)
+            self._timestamps.append(timestamp)
+        else:
+            # The ring buffer is full: overwrite the oldest value
+            self._values[self._start] = v
+            self._timestamps[self._start] = timestamp
+            self._start = (self._start + 1) % len(self._timestamps)
+
+    def _check_values_type(self, v):
+        """Init or convert the values storage according to the type of v."""
+        if isinstance(self._values, list):
+            return
+        if isinstance(v, bool) or not isinstance(v, (int, float)) or (isinstance(v, int) and not -(2**63) <= v < 2**63):
+            # Not a number (or an integer too large for the array): fallback to a list (any types)
+            self._values = list(self._values or [])
+        elif self._values is None:
+            self._values = array('q' if isinstance(v, int) else 'd')
+        elif isinstance(v, float) and self._values.typecode == 'q':
+            self._values = array('d', self._values)
 
     def history_size(self):
         """Return the history size (maximum number of value in the history)"""
-        return len(self._history)
+        return self.history_len()
 
     def history_len(self):
         """Return the current history length"""
-        return len(self._history)
+        return len(self._timestamps)
+
+    def _history_item(self, pos):
+        """Return the (timestamp, value) in position pos (negative from the latest) in the history."""
+        i = (self._start + self.history_len() + pos) % self.history_len()
+        return self._timestamps[i], self._values[i]
+
+    def _history_slice(self, column, nb=0):
+        """Return an iterator on the last nb items (all if nb is 0) of the given column.
+
+        Only the last nb items of the ring buffer are read (at most two slices of the column).
+        """
+        size = self.history_len()
+        nb = size if nb <= 0 or nb > size else nb
+        first = (self._start + size - nb) % size if size else 0
+        if first + nb <= size:
+            return iter(column[first : first + nb])
+        return chain(column[first:size], column[0 : first + nb - size])
+
+    def _history_since(self, since):
+        """Return the number of values added since the given timestamp (epoch).
+
+        The timestamps are sorted in the ring order, so a binary search is used.
+        """
+        size = self.history_len()
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[(self._start + middle) % size] < since:
+                low = middle + 1
+            else:
+                high = middle
+        return size - low
 
     def history_value(self, pos=1):
         """Return the value in position pos in the history.
 
         Default is to return the latest value added to the history.
         """
-        return self._history[-pos]
+        t, v = self._history_item(-pos)
+        return self.to_datetime(t), v
 
-    def history_raw(self, nb=0):
-        """Return the history in ISO JSON format"""
-        return self._history[-nb:]
+    def history_timestamps(self, nb=0):
+        """Return the history timestamps (epoch) as a list"""
+        return list(self._history_slice(self._timestamps, nb))
+
+    def _history_values(self, nb=0):
+        """Return an iterator on the last nb values of the history"""
+        return self._history_slice(self._values, nb)
+
+    def history_values(self, nb=0):
+        """Return the history values as a list"""
+        if not self.history_len():
+            return []
+        return list(self._history_values(nb))
+
+    def history_raw(self, nb=0, since=None):
+        """Return the history as a list of (datetime, value)
+
+        If since (epoch) is set, only return the values added since this timestamp.
+        """
+        if since is not None:
+            nb_since = self._history_since(since)
+            if nb_since == 0:
+                return []
+            nb = min(nb, nb_since) if nb > 0 else nb_since
+        if not self.history_len():
+            return []
+        return [
+            (self.to_datetime(t), v)
+            for t, v in zip(self._history_slice(self._timestamps, nb), self._history_values(nb))
+        ]
 
     def history_json(self, nb=0):
         """Return the history in ISO JSON format"""
-        return [(i[0].isoformat(), i[1]) for i in self._history[-nb:]]
+        return [(d.isoformat(), v) for d, v in self.history_raw(nb=nb)]
 
     def history_mean(self, nb=5):
         """Return the mean on the <nb> values in the history."""
-        _, v = zip(*self._history)
-        return sum(v[-nb:]) / float(v[-1] - v[-nb])
+        v = self.history_values(nb=nb)
+        return sum(v) / float(v[-1] - v[0])
+
+
+class GlancesMmapAttribute(GlancesAttribute):
+    """Attribute with a persistent history (memory-mapped file).
+
+    The file contains a fixed size ring buffer:
+    - header: magic, capacity, count, start position and values type
+    - timestamps: capacity * float64 (epoch)
+    - values: capacity * float64 (NaN for None)
+
+    Appends are written in the mapping (no fsync, the OS flushes the pages).
+    Reads are done in place through memoryviews of the mapping.
+    Only numerical (or None) values can be stored.
+    """
+
+    MAGIC = b'GLHIST01'
+    HEADER = struct.Struct('<8sIIIc')
+    HEADER_SIZE = 32
+
+    def __init__(self, name, path, description='', history_max_size=None):
+        """Init the attribute
+
+        :param path: history file (created if it does not exist)
+        :param history_max_size: ring buffer capacity (default is the capacity of an existing file)
+        """
+        self._path = path
+        self._mmap = None
+        super().__init__(name, description=description, history_max_size=history_max_size)
+
+    def _history_init(self):
+        """Attach the history file (create or resize it if needed)"""
+        previous = self._read_file()
+        if previous is not None and (not self._history_max_size or previous[0] == int(self._history_max_size)):
+            capacity, count, start, is_int = previous
+        else:
+            capacity, count, start, is_int = int(self._history_max_size or 0), 0, 0, True
+        self._history_max_size = capacity
+        self._capacity = capacity
+        size = self.HEADER_SIZE + 16 * capacity
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        with open(self._path, 'a+b') as f:
+            if os.fstat(f.fileno()).st_size != size:
+                f.truncate(0)
+                f.truncate(size)
+            self._mmap = mmap.mmap(f.fileno(), size)
+        self._view = memoryview(self._mmap)
+        self._timestamps = self._view[self.HEADER_SIZE : self.HEADER_SIZE + 8 * capacity].cast('d')
+        self._values = self._view[self.HEADER_SIZE + 8 * capacity :].cast('d')
+        self._count, self._start, self._is_int = count, start, is_int
+        if previous is not None and previous[0] != capacity and previous[1]:
+            # The history size changed: keep the last values
+            self._count, self._start = 0, 0
+            for t, v in previous[4]:
+                if v != v:
+                    v = None
+                elif previous[3]:
+                    v = int(v)
+                self.history_add((t, v))
+        self._write_header()
+
+    def _read_file(self):
+        """Read an existing history file.
+
+        Return (capacity, count, start, is_int[, last values if the capacity changed]) or None
+        """
+        try:
+            with open(self._path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < self.HEADER_SIZE:
+            return None
+        magic, capacity, count, start, is_int = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or len(data) != self.HEADER_SIZE + 16 * capacity or count > capacity:
+            return None
+        if not self._history_max_size or capacity == int(self._history_max_size):
+            return capacity, count, start, is_int == b'i'
+        # Capacity changed: return the values (oldest first) to copy them in the new file
+        timestamps = array('d', data[self.HEADER_SIZE : self.HEADER_SIZE + 8 * capacity])
+        values = array('d', data[self.HEADER_SIZE + 8 * capacity :])
+        order = list(range(start, count)) + list(range(0, start))
+        return capacity, count, start, is_int == b'i', [(timestamps[i], values[i]) for i in order]
+
+    def _write_header(self):
+        self.HEADER.pack_into(
+            self._mmap, 0, self.MAGIC, self._capacity, self._count, self._start, b'i' if self._is_int else b'd'
+        )
+
+    def history_reset(self):
+        if self._mmap is None:
+            return
+        self._count, self._start, self._is_int = 0, 0, True
+        self._write_header()
+
+    def history_add(self, value):
+        """Add a value (tuple: (<timestamp>, <value>)) in the history"""
+        if self._mmap is None or not self._capacity:
+            return
+        timestamp, v = value
+        if v is None or isinstance(v, bool) or not isinstance(v, (int, float)):
+            v = math.nan
+        elif isinstance(v, float):
+            self._is_int = False
+        if self._count < self._capacity:
+            i = self._count
+            self._count += 1
+        else:
+            # The ring buffer is full: overwrite the oldest value
+            i = self._start
+            self._start = (self._start + 1) % self._capacity
+        self._timestamps[i] = timestamp
+        self._values[i] = v
+        self._write_header()
+
+    def history_len(self):
+        """Return the current history length"""
+        return self._count
+
+    def _history_item(self, pos):
+        """Return the (timestamp, value) in position pos (negative from the latest) in the history (NaN is None)."""
+        t, v = super()._history_item(pos)
+        if v != v:
+            return t, None
+        return t, int(v) if self._is_int else v
+
+    def _history_values(self, nb=0):
+        """Return an iterator on the last nb values of the history (NaN are None)"""
+        if self._is_int:
+            return (None if v != v else int(v) for v in self._history_slice(self._values, nb))
+        return (None if v != v else v for v in self._history_slice(self._values, nb))
+
+    def close(self):
+        """Flush and close the history file"""
+        if self._mmap is None:
+            return
+        self._timestamps.release()
+        self._values.release()
+        self._view.release()
+        self._mmap.flush()
+        self._mmap.close()
+        self._mmap = None
@@ -0,0 +1,96 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Manage the stats cache (avoid to update the same stats too often)."""
+
+import threading
+import time
+
+
+class GlancesStatsCache:
+    """This class is a TTL cache for the stats updates.
+
+    Each key (ex: a plugin name) stores the (monotonic) time of its last update.
+    A lookup is:
+    - a hit if the key has been updated less than ttl seconds ago
+    - a miss if the key has never been updated (or has been invalidated)
+    - stale if the key has been updated more than ttl seconds ago
+
+    Counters are kept for each key and can be retrieved with get_stats().
+    """
+
+    def __init__(self, ttl=1):
+        """Init the cache.
+
+        :ttl: time to live (in seconds) of a cache entry
+        """
+        self.ttl = ttl
+        # Last update time: key = cache key, value = monotonic time
+        self._entries = {}
+        # Counters: key = cache key, value = {'hit': int, 'miss': int, 'stale': int}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl=None):
+        """Return True if the key is in the cache and not expired (hit), else False.
+
+        :ttl: overwrite the default cache ttl for this lookup
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            counters = self._counters.setdefault(key, {'hit': 0, 'miss': 0, 'stale': 0})
+            last_update = self._entries.get(key)
+            if last_update is None:
+                counters['miss'] += 1
+                return False
+            if time.monotonic() - last_update >= ttl:
+                counters['stale'] += 1
+                return False
+            counters['hit'] += 1
+            return True
+
+    def set(self, key):
+        """Set the key as updated now."""
+        with self._lock:
+            self._entries[key] = time.monotonic()
+
+    def invalidate(self, key=None):
+        """Invalidate the given key (or all the keys if key is None)."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_age(self, key):
+        """Return the age (in seconds) of the key (None if not in the cache)."""
+        last_update = self._entries.get(key)
+        if last_update is None:
+            return None
+        return time.monotonic() - last_update
+
+    def get_stats(self):
+        """Return the cache counters as a dict.
+
+        Global counters are the sum of the keys counters.
+        """
+        with self._lock:
+            keys = {k: dict(v) for k, v in self._counters.items()}
+        ret = {'ttl': self.ttl, 'hit': 0, 'miss': 0, 'stale': 0}
+        for counters in keys.values():
+            for c in ('hit', 'miss', 'stale'):
+                ret[c] += counters[c]
+        lookups = ret['hit'] + ret['miss'] + ret['stale']
+        ret['hit_ratio'] = round(ret['hit'] / lookups, 3) if lookups else None
+        ret['keys'] = keys
+        return ret
+
+    def reset_stats(self):
+        """Reset the cache counters."""
+        with self._lock:
+            self._counters.clear()
@@ -96,7 +96,7 @@ class GlancesEvent:
             # TOP PROCESS LIST (only for CRITICAL ALERT)
             self.sort = sort_key
             # Count of the top processes
-            for p in sort_stats(proc_list, sort_key)[0:6]:
+            for p in sort_stats(proc_list, sort_key, limit=6):
                 if p['name'] not in self.top_dict.keys():
                     self.top_dict[p['name']] = 1
                 else:
@@ -11,13 +11,85 @@ I am your father...
 ...for all Glances exports IF.
 """
 
-import re
+import os
+import time
 
+from glances.exports.spool import GlancesExportSpool
+from glances.filter import GlancesRegexList
 from glances.globals import NoOptionError, NoSectionError, json_dumps
 from glances.logger import logger
 from glances.timer import Counter
 
 
+def flatten_stats(stats):
+    """Flatten the stats (dict or list of dict).
+
+    :return: a tuple of 3 tuples: the names, the keys checked by the exclude_fields
+             option and the values (see GlancesExport.build_export)
+    """
+    names, checks, values = [], [], []
+
+    if isinstance(stats, dict):
+        # Stats is a dict
+        # Is there a key ?
+        if "key" in stats and stats["key"] in stats:
+            pre_key = "{}.".format(stats[stats["key"]])
+        else:
+            pre_key = ""
+        # Walk through the dict
+        # Priviously, we sort the dict but it breaks export for some plugins (see #3449)
+        for key, value in stats.items():
+            # Convert the key to a string and lower case it
+            key = str(key).lower()
+            if isinstance(value, bool):
+                value = json_dumps(value).decode()
+
+            if isinstance(value, list):
+                value = " ".join([str(v) for v in value])
+
+            if isinstance(value, dict):
+                item_names, item_checks, item_values = flatten_stats(value)
+                names += [pre_key + key + str(i) for i in item_names]
+                checks += item_checks
+                values += item_values
+            else:
+                # We are on a simple value
+                names.append(pre_key + key)
+                checks.append(pre_key + key)
+                values.append(value)
+    elif isinstance(stats, list):
+        # Stats is a list (of dict)
+        # Recursive loop through the list
+        for item in stats:
+            item_names, item_checks, item_values = flatten_stats(item)
+            names += item_names
+            checks += item_checks
+            values += item_values
+    return tuple(names), tuple(checks), tuple(values)
+
+
+def build_export_columns(plugin, stats, limits):
+    """Return the flattened stats (see flatten_stats) of the plugin with its limits.
+
+    Return None if the stats can not be exported.
+    """
+    if isinstance(stats, dict):
+        stats = dict(stats)
+        stats.update(limits)
+        # Remove the <plugin>_disable field
+        stats.pop(f"{plugin}_disable", None)
+    elif isinstance(stats, list):
+        # TypeError: string indices must be integers (Network plugin) #1054
+        stats = [dict(i) for i in stats]
+        for i in stats:
+            i.update(limits)
+            # Remove the <plugin>_disable field
+            i.pop(f"{plugin}_disable", None)
+    else:
+        return None
+    return flatten_stats(stats)
+
+
 class GlancesExport:
     """Main class for Glances export IF."""
 
@@ -31,6 +103,9 @@ class GlancesExport:
         "version",
     ]
 
+    # True if the exporter supports the batch mode (it implements export_bulk)
+    bulk = False
+
     def __init__(self, config=None, args=None):
         """Init the export class."""
         # Export name
@@ -55,10 +130,42 @@ class GlancesExport:
         # Fields description
         self._fields_description = None
 
+        # Fields not exported (see the exclude_fields option)
+        self._exclude_fields = GlancesRegexList([])
+
+        # Batch mode (only for the exporters with a bulk export method, see export_bulk)
+        # Rows are flushed when batch_size rows are waiting, every batch_cycles cycles
+        # or when the first waiting row is older than batch_timeout seconds (0 to disable)
+        self.batch_size = 1000
+        self.batch_cycles = 1
+        self.batch_timeout = 0
+        # Waiting rows: list of (name, columns, points)
+        self._batch = []
+        self._batch_nb_cycles = 0
+        self._batch_start = None
+
+        # Spool of the rows which could not be exported (disabled if spool_path is not set)
+        # At most spool_replay_rows spooled rows are exported again (oldest first) per flush
+        self.spool_path = None
+        self.spool_segment_size = 1048576
+        self.spool_max_size = 104857600
+        self.spool_replay_rows = 1000
+        self._spool = None
+
         # Load the default common export configuration
         if self.config is not None:
             self.load_common_conf()
 
+    @property
+    def exclude_fields(self):
+        """Return the list of the excluded fields (regex)."""
+        return list(self._exclude_fields.patterns)
+
+    @exclude_fields.setter
+    def exclude_fields(self, value):
+        """Set the list of the excluded fields (regex): the include/exclude decisions are computed again."""
+        self._exclude_fields = GlancesRegexList(value)
+
     def _log_result_decorator(fct):
         """Log (DEBUG) the result of the function fct."""
 
@@ -76,6 +183,8 @@ class GlancesExport:
     def exit(self):
         """Close the export module."""
         logger.debug(f"Finalise export interface {self.export_name}")
+        if self._spool is not None:
+            self._spool.close()
 
     def load_common_conf(self):
         """Load the common export configuration in the Glances configuration file.
@@ -91,10 +200,21 @@ class GlancesExport:
         except NoOptionError:
             logger.debug(f"{opt} option not found in the {section} configuration section")
 
+        self.load_batch_conf(section)
+
         logger.debug(f"Load common {section} from the Glances configuration file")
 
         return True
 
+    def load_batch_conf(self, section):
+        """Load the batch mode and spool options (batch_* and spool_*) from the given section."""
+        self.batch_size = max(1, self.config.get_int_value(section, 'batch_size', default=self.batch_size))
+        self.batch_cycles = max(1, self.config.get_int_value(section, 'batch_cycles', default=self.batch_cycles))
+        self.batch_timeout = self.config.get_float_value(section, 'batch_timeout', default=self.batch_timeout)
+        self.spool_path = self.config.get_value(section, 'spool_path', default=self.spool_path)
+        for opt in ('spool_segment_size', 'spool_max_size', 'spool_replay_rows'):
+            setattr(self, opt, max(1, self.config.get_int_value(section, opt, default=getattr(self, opt))))
+
     def load_conf(self, section, mandatories=["host", "port"], options=None):
         """Load the export <section> configuration in the Glances configuration file.
 
@@ -127,6 +247,10 @@ class GlancesExport:
             except NoOptionError:
                 logger.debug(f"{opt} option not found in the {section} configuration section")
 
+        # The batch mode options of the [export] section can be overwritten in the exporter section
+        if self.is_bulk():
+            self.load_batch_conf(section)
+
         logger.debug(f"Load {section} from the Glances configuration file")
         logger.debug(f"{section} parameters: { ({opt: getattr(self, opt) for opt in mandatories + options}) }")
 
@@ -236,8 +360,8 @@ class GlancesExport:
         return ret
 
     def is_excluded(self, field):
-        """Return true if the field is excluded."""
-        return any(re.fullmatch(i, field, re.I) for i in (getattr(self, 'exclude_fields') or ()))
+        """Return true if the field is excluded (the decision is memoised per field)."""
+        return self._exclude_fields.match(field)
 
     def plugins_to_export(self, stats):
         """Return the list of plugins to export.
@@ -263,34 +387,33 @@ class GlancesExport:
     def update(self, stats):
         """Update stats to a server.
 
-        The method builds two lists: names and values and calls the export method to export the stats.
+        The method gets the flattened stats of each plugin (names and values lists, computed once
+        per cycle for all the exporters) and calls the export method to export the stats.
 
         Note: if needed this class can be overwritten.
         """
         if not self.export_enable:
             return False
 
-        # Get all the stats & limits
+        # Get the flattened stats & limits (shared by all the exporters of a cycle)
         self._last_exported_list = self.plugins_to_export(stats)
-        all_stats = stats.getAllExportsAsDict(plugin_list=self.last_exported_list())
-        all_limits = stats.getAllLimitsAsDict(plugin_list=self.last_exported_list())
 
         # Loop over plugins to export
+        bulk = self.is_bulk()
+        # Time of the cycle (a batched or spooled row is exported later)
+        timestamp = getattr(stats, 'timestamp', None)
         for plugin in self.last_exported_list():
-            if isinstance(all_stats[plugin], dict):
-                all_stats[plugin].update(all_limits[plugin])
-                # Remove the <plugin>_disable field
-                all_stats[plugin].pop(f"{plugin}_disable", None)
-            elif isinstance(all_stats[plugin], list):
-                # TypeError: string indices must be integers (Network plugin) #1054
-                for i in all_stats[plugin]:
-                    i.update(all_limits[plugin])
-                    # Remove the <plugin>_disable field
-                    i.pop(f"{plugin}_disable", None)
-            else:
+            columns = stats.getExportColumns(plugin)
+            if columns is None:
                 continue
-            export_names, export_values = self.build_export(all_stats[plugin])
-            self.export(plugin, export_names, export_values)
+            export_names, export_values = self.exclude_columns(*columns)
+            if bulk:
+                self.add_to_batch(plugin, export_names, export_values, timestamp=timestamp)
+            else:
+                self.export(plugin, export_names, export_values)
+
+        if bulk:
+            self.end_batch_cycle()
 
         return True
 
@@ -298,49 +421,89 @@ class GlancesExport:
         """Build the export lists.
         This method builds two lists: names and values.
         """
+        return self.exclude_columns(*flatten_stats(stats))
 
-        # Initialize export lists
-        export_names = []
-        export_values = []
+    def exclude_columns(self, names, checks, values):
+        """Return the export lists (names and values) without the excluded fields.
 
-        if isinstance(stats, dict):
-            # Stats is a dict
-            # Is there a key ?
-            if "key" in stats and stats["key"] in stats:
-                pre_key = "{}.".format(stats[stats["key"]])
-            else:
-                pre_key = ""
-            # Walk through the dict
-            # Priviously, we sort the dict but it breaks export for some plugins (see #3449)
-            for key, value in stats.items():
-                # Convert the key to a string and lower case it
-                key = str(key).lower()
-                if isinstance(value, bool):
-                    value = json_dumps(value).decode()
-
-                if isinstance(value, list):
-                    value = " ".join([str(v) for v in value])
-
-                if isinstance(value, dict):
-                    item_names, item_values = self.build_export(value)
-                    item_names = [pre_key + key + str(i) for i in item_names]
-                    export_names += item_names
-                    export_values += item_values
-                else:
-                    # We are on a simple value
-                    if self.is_excluded(pre_key + key):
-                        continue
-                    export_names.append(pre_key + key)
-                    export_values.append(value)
-        elif isinstance(stats, list):
-            # Stats is a list (of dict)
-            # Recursive loop through the list
-            for item in stats:
-                item_names, item_values = self.build_export(item)
-                export_names += item_names
-                export_values += item_values
-        return export_names, export_values
+        :param checks: the keys checked by the exclude_fields option (see flatten_stats)
+        """
+        keep = [not self.is_excluded(c) for c in checks]
+        return [n for n, k in zip(names, keep) if k], [v for v, k in zip(values, keep) if k]
 
     def export(self, name, columns, points):
         # This method should be implemented by each exporter
         pass
+
+    def export_bulk(self, rows):
+        """Export a batch of rows (list of (name, columns, points, timestamp)) with a single operation.
+
+        The timestamp (epoch) is the time of the cycle of the row.
+        It should return False if the rows could not be exported, or the list of the rows
+        which could not be exported (they are spooled).
+        """
+        # This method should be implemented by each exporter supporting the batch mode (bulk = True)
+        pass
+
+    def is_bulk(self):
+        """Return True if the exporter supports the batch mode."""
+        return self.bulk
+
+    def add_to_batch(self, name, columns, points, timestamp=None):
+        """Add a row to the batch (the batch is flushed if batch_size rows are waiting).
+
+        :timestamp: time (epoch) of the cycle of the row (default is now)
+        """
+        if not self._batch:
+            self._batch_start = time.monotonic()
+        self._batch.append((name, columns, points, time.time() if timestamp is None else timestamp))
+        if len(self._batch) >= self.batch_size:
+            self.flush_batch()
+
+    def end_batch_cycle(self):
+        """End of a cycle: flush the batch every batch_cycles cycles or if it is older than batch_timeout."""
+        self._batch_nb_cycles += 1
+        if self._batch_nb_cycles >= self.batch_cycles or (
+            self.batch_timeout and self._batch and time.monotonic() - self._batch_start >= self.batch_timeout
+        ):
+            self.flush_batch()
+
+    def flush_batch(self):
+        """Export the waiting rows (if any) with the bulk export method."""
+        if not self.is_bulk():
+            return
+        rows, self._batch = self._batch, []
+        self._batch_nb_cycles = 0
+        if rows:
+            logger.debug(f"Export a batch of {len(rows)} rows with {self.export_name}")
+            unexported = self.safe_export_bulk(rows)
+            if unexported:
+                if self.get_spool() is not None:
+                    self._spool.append(unexported)
+                return
+        # The server is reachable: replay the oldest spooled rows
+        if self.get_spool() is not None and not self._spool.is_empty():
+            nb = self._spool.replay(self.safe_export_bulk, self.spool_replay_rows)
+            logger.debug(f"Replay {nb} spooled rows with {self.export_name}")
+
+    def safe_export_bulk(self, rows):
+        """Export the rows with the bulk export method. Return the list of the rows which could not be exported."""
+        try:
+            ret = self.export_bulk(rows)
+        except Exception as e:
+            logger.error(f"Can not export a batch of {len(rows)} rows with {self.export_name} ({e})")
+            return rows
+        if ret is False:
+            return rows
+        return ret if isinstance(ret, list) else []
+
+    def get_spool(self):
+        """Return the spool of the rows which could not be exported (None if disabled or not a bulk exporter)."""
+        if self._spool is None and self.spool_path and self.is_bulk():
+            path = os.path.join(os.path.expanduser(self.spool_path), self.export_name.split('.')[-1])
+            try:
+                self._spool = GlancesExportSpool(path, self.spool_segment_size, self.spool_max_size)
+            except OSError as e:
+                logger.error(f"Can not create the export spool {path} ({e}), spool is disabled")
+                self.spool_path = None
+        return self._spool
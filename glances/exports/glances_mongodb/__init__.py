@@ -9,9 +9,11 @@
 """MongoDB interface class."""
 
 import sys
+from datetime import datetime, timezone
 from urllib.parse import quote_plus
 
 import pymongo
+import pymongo.errors
 
 from glances.exports.export import GlancesExport
 from glances.logger import logger
@@ -20,6 +22,9 @@ from glances.logger import logger
 class Export(GlancesExport):
     """This class manages the MongoDB export module."""
 
+    # Rows are exported with a single operation (see export_bulk)
+    bulk = True
+
     def __init__(self, config=None, args=None):
         """Init the MongoDB export IF."""
         super().__init__(config=config, args=args)
@@ -73,3 +78,31 @@ class Export(GlancesExport):
             self.database()[name].insert_one(data)
         except Exception as e:
             logger.error(f"Cannot export {name} stats to MongoDB ({e})")
+
+    def export_bulk(self, rows):
+        """Write a batch of rows to the MongoDB server (one insert_many per collection).
+
+        The time of the cycle is stored in the timestamp field of the documents.
+        Return the list of the rows which could not be written.
+        """
+        collections = {}
+        for row in rows:
+            name, columns, points, timestamp = row
+            document = dict(zip(columns, points))
+            document['timestamp'] = datetime.fromtimestamp(timestamp, timezone.utc)
+            collections.setdefault(name, []).append((row, document))
+
+        ret = []
+        for name, items in collections.items():
+            logger.debug(f"Export {len(items)} {name} stats to MongoDB")
+            try:
+                self.database()[name].insert_many([document for _, document in items], ordered=False)
+            except pymongo.errors.BulkWriteError as e:
+                # Unordered insert: only the documents in error are not written
+                errors = {error['index'] for error in e.details.get('writeErrors', [])}
+                logger.error(f"Cannot export {len(errors)} {name} stats to MongoDB ({e})")
+                ret += [items[i][0] for i in sorted(errors)]
+            except Exception as e:
+                logger.error(f"Cannot export {name} stats to MongoDB ({e})")
+                ret += [row for row, _ in items]
+        return ret
@@ -19,6 +19,9 @@ from glances.logger import logger
 class Export(GlancesExport):
     """This class manages the Statsd export module."""
 
+    # Rows are exported with a single operation (see export_bulk)
+    bulk = True
+
     def __init__(self, config=None, args=None):
         """Init the Statsd export IF."""
         super().__init__(config=config, args=args)
@@ -61,6 +64,21 @@ class Export(GlancesExport):
                 logger.error(f"Can not export stats to Statsd ({e})")
         logger.debug(f"Export {name} stats to Statsd")
 
+    def export_bulk(self, rows):
+        """Export a batch of rows to the Statsd server (packed in as few packets as possible)."""
+        try:
+            with self.client.pipeline() as pipe:
+                # The time of the cycle can not be sent (Statsd uses the reception time)
+                for name, columns, points, _ in rows:
+                    for column, point in zip(columns, points):
+                        if isinstance(point, Number):
+                            pipe.gauge(normalize(f'{name}.{column}'), point)
+        except Exception as e:
+            logger.error(f"Can not export stats to Statsd ({e})")
+            return False
+        logger.debug(f"Export {len(rows)} stats to Statsd")
+        return True
+
 
 def normalize(name):
     """Normalize name for the Statsd convention"""
@@ -0,0 +1,182 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Store-and-forward spool of the stats which could not be exported."""
+
+import os
+
+from glances.globals import json_dumps, json_loads
+from glances.logger import logger
+
+
+class GlancesExportSpool:
+    """This class manages an append-only on-disk spool of rows (see GlancesExport.export_bulk).
+
+    Each batch of rows which could not be exported is appended (one JSON line)
+    to the current segment file (<path>/<number>.spool). A new segment is
+    started when the current one is bigger than segment_size bytes. When the
+    spool is bigger than max_size bytes, the oldest segment is removed (its
+    rows are lost).
+
+    The rows are replayed oldest first. The replay position in the oldest
+    segment is saved in the <path>/replay.pos file, so a restart does not
+    replay the same rows again. A replayed segment is removed.
+
+    The spool is not thread safe: it is used by the export thread of its exporter.
+    """
+
+    def __init__(self, path, segment_size=1048576, max_size=104857600):
+        """Init the spool (the existing segments in path are kept).
+
+        :path: folder of the segments files
+        :segment_size: maximum size (in bytes) of a segment file
+        :max_size: maximum size (in bytes) of the spool
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.max_size = max(max_size, segment_size)
+        os.makedirs(path, exist_ok=True)
+        # Segments: key = segment number (oldest first), value = size in bytes
+        self._segments = {}
+        for f in sorted(os.listdir(path)):
+            name, ext = os.path.splitext(f)
+            if ext == '.spool' and name.isdigit():
+                self._segments[int(name)] = os.path.getsize(os.path.join(path, f))
+        self._segments = dict(sorted(self._segments.items()))
+        # Current segment (opened in append mode, a new one is started after a restart)
+        self._current = max(self._segments, default=0)
+        self._file = None
+        # Replay position: (segment number, offset)
+        self._position = self._load_position()
+        # Number of batches lost (spool full or corrupted)
+        self.dropped = 0
+
+    def _segment_path(self, number):
+        return os.path.join(self.path, f'{number:012d}.spool')
+
+    def _load_position(self):
+        """Return the saved replay position (or the beginning of the oldest segment)."""
+        try:
+            with open(os.path.join(self.path, 'replay.pos')) as f:
+                number, offset = (int(i) for i in f.read().split())
+        except (OSError, ValueError):
+            number, offset = None, 0
+        if number not in self._segments:
+            number, offset = next(iter(self._segments), None), 0
+        return number, offset
+
+    def _save_position(self):
+        """Save the replay position (atomic update)."""
+        tmp = os.path.join(self.path, 'replay.pos.tmp')
+        with open(tmp, 'w') as f:
+            f.write('{} {}'.format(*self._position))
+        os.replace(tmp, os.path.join(self.path, 'replay.pos'))
+
+    def __len__(self):
+        """Return the spool size (in bytes)."""
+        return sum(self._segments.values())
+
+    def is_empty(self):
+        """Return True if there is nothing to replay."""
+        return not self._segments
+
+    def append(self, rows):
+        """Append a batch of rows (list of (name, columns, points, timestamp)) to the spool."""
+        try:
+            line = json_dumps(rows) + b'\n'
+        except Exception as e:
+            logger.error(f"Can not write the rows in the export spool {self.path} ({e})")
+            self.dropped += 1
+            return
+        if self._file is None or self._segments[self._current] >= self.segment_size:
+            self._new_segment()
+        self._file.write(line)
+        self._file.flush()
+        self._segments[self._current] += len(line)
+        # Spool is full: the oldest segment is lost
+        while len(self) > self.max_size and len(self._segments) > 1:
+            number = next(iter(self._segments))
+            logger.warning(f"Export spool {self.path} is full, remove the oldest segment")
+            with open(self._segment_path(number), 'rb') as f:
+                self.dropped += sum(1 for _ in f)
+            self._remove(number)
+
+    def _new_segment(self):
+        """Start a new segment (the current one is closed)."""
+        if self._file is not None:
+            self._file.close()
+        self._current += 1
+        self._segments[self._current] = 0
+        self._file = open(self._segment_path(self._current), 'ab')
+        if self._position[0] is None:
+            self._position = (self._current, 0)
+
+    def _remove(self, number):
+        """Remove the given segment."""
+        if self._file is not None and number == self._current:
+            self._file.close()
+            self._file = None
+        del self._segments[number]
+        os.remove(self._segment_path(number))
+        if self._position[0] == number:
+            self._position = (next(iter(self._segments), None), 0)
+            self._save_position()
+
+    def read(self, max_rows):
+        """Return the oldest rows (at least one batch, at most max_rows rows if possible) and the next position."""
+        number, offset = self._position
+        rows = []
+        if number is None:
+            return rows, self._position
+        with open(self._segment_path(number), 'rb') as f:
+            f.seek(offset)
+            while not rows or len(rows) < max_rows:
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    batch = json_loads(line)
+                except ValueError as e:
+                    logger.error(f"Corrupted batch in the export spool {self.path} ({e})")
+                    self.dropped += 1
+                    batch = []
+                if rows and len(rows) + len(batch) > max_rows:
+                    break
+                rows += batch
+                offset = f.tell()
+        return rows, (number, offset)
+
+    def replay(self, export_fct, max_rows):
+        """Export the oldest rows (at most max_rows if possible) with export_fct.
+
+        export_fct returns the list of the rows which could not be exported. If none of the rows
+        has been exported, they are kept in place. Else, the not exported ones are appended
+        to the spool (the exported ones are not replayed again).
+        Return the number of exported rows.
+        """
+        if self.is_empty():
+            return 0
+        rows, position = self.read(max_rows)
+        unexported = export_fct(rows) if rows else []
+        if rows and len(unexported) == len(rows):
+            return 0
+        number, offset = self._position = position
+        if offset >= self._segments[number]:
+            # The segment is replayed
+            self._remove(number)
+        else:
+            self._save_position()
+        if unexported:
+            self.append(unexported)
+        return len(rows) - len(unexported)
+
+    def close(self):
+        """Close the current segment."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,133 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Export the stats in a dedicated long-lived thread (one per exporter)."""
+
+import threading
+import time
+from collections import deque
+
+from glances.logger import logger
+from glances.perf import glances_perf
+
+# Policies applied when the export queue is full
+overflow_policies = ['drop-oldest', 'drop-newest', 'block']
+
+# Maximum time (in seconds) to export the waiting snapshots when Glances exits
+exit_timeout = 10
+
+
+class GlancesExportWorker:
+    """This class exports the stats snapshots of an exporter in a dedicated thread.
+
+    The snapshots (one per cycle) are put in a bounded queue. If the exporter
+    is too slow and the queue is full, the overflow policy is applied:
+    - drop-oldest: the oldest waiting snapshot is dropped (default)
+    - drop-newest: the new snapshot is dropped
+    - block: the Glances main loop waits until a snapshot is exported
+
+    The queue depth, the number of dropped cycles and the export latency
+    (time between the snapshot and the end of its export) are available
+    in the self-monitoring stats.
+    """
+
+    def __init__(self, name, export_fct, queue_size=3, overflow='drop-oldest'):
+        """Init the worker.
+
+        :name: exporter name
+        :export_fct: function called with a snapshot to export it
+        :queue_size: maximum number of snapshots waiting to be exported
+        :overflow: policy applied when the queue is full (see overflow_policies)
+        """
+        self.name = name
+        self._export_fct = export_fct
+        self.queue_size = max(1, queue_size)
+        if overflow not in overflow_policies:
+            logger.warning(f"Unknown export overflow policy {overflow} for {name}, use drop-oldest")
+            overflow = 'drop-oldest'
+        self.overflow = overflow
+        # Waiting snapshots: (time, snapshot)
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        # Counters
+        self.dropped = 0
+        self.exported = 0
+        glances_perf.watch_queue(name, self.get_stats, category='export')
+
+    def put(self, snapshot):
+        """Put a snapshot in the queue (the overflow policy is applied if the queue is full).
+
+        Return False if the snapshot has been dropped.
+        """
+        with self._cond:
+            if self._stopped:
+                return False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f'glances_export_{self.name}', daemon=True)
+                self._thread.start()
+            if len(self._queue) >= self.queue_size:
+                if self.overflow == 'drop-newest':
+                    self.dropped += 1
+                    logger.debug(f"Export queue of {self.name} is full, drop the new snapshot")
+                    return False
+                if self.overflow == 'drop-oldest':
+                    self._queue.popleft()
+                    self.dropped += 1
+                    logger.debug(f"Export queue of {self.name} is full, drop the oldest snapshot")
+                else:
+                    self._cond.wait_for(lambda: len(self._queue) < self.queue_size or self._stopped)
+            self._queue.append((time.monotonic(), snapshot))
+            self._cond.notify_all()
+        return True
+
+    def _run(self):
+        """Worker loop: export the snapshots in the queue order."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopped)
+                if not self._queue:
+                    # Stopped and all the snapshots are exported
+                    return
+                start, snapshot = self._queue.popleft()
+                self._cond.notify_all()
+            try:
+                self._export_fct(snapshot)
+            except Exception as e:
+                logger.error(f"Error while exporting stats with {self.name} ({e})")
+            else:
+                self.exported += 1
+            glances_perf.add(self.name, 'latency', time.monotonic() - start, category='export')
+
+    def get_stats(self):
+        """Return the queue stats (dict)."""
+        with self._cond:
+            depth = len(self._queue)
+        return {
+            'queue_size': self.queue_size,
+            'queue_depth': depth,
+            'overflow': self.overflow,
+            'dropped': self.dropped,
+            'exported': self.exported,
+        }
+
+    def stop(self, timeout=None):
+        """Stop the worker once the waiting snapshots are exported (wait at most timeout seconds).
+
+        Return False if the waiting snapshots are not exported after timeout seconds
+        (the thread is a daemon, it does not prevent Glances to exit).
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
@@ -7,6 +7,7 @@
 #
 
 import re
+import threading
 
 from glances.logger import logger
 
@@ -181,3 +182,140 @@ class GlancesFilter:
             # AttributeError -  Filter processes crashes with a bad regular expression pattern (issue #665)
             # TypeError - Filter processes crashes if value is None (issue #1105)
             return False
+
+
+class GlancesFilterEngine:
+    """Apply several named filters to the processes list in a single pass
+
+    Filters are given as a list of (name, key, source, match) where:
+    - name: name of the filters group (a process matches the group if it matches one of its filters)
+    - key: process key used by the filter (None for the process name and command line)
+    - source: filter as entered by the user (used to detect a filter change)
+    - match: function returning True if the given process matches the filter
+
+    The results of the filters on the name and the command line are cached per process,
+    key = (pid, create_time, hash of the name and command line). So only the new processes
+    (or the ones which have executed a new program) are matched again. The filters on another
+    key (username...) are applied on every pass because the value could change.
+
+    >>> f = GlancesFilter()
+    >>> f.filter = '.*python.*'
+    >>> e = GlancesFilterEngine()
+    >>> e.set_filters([('display', f.filter_key, f.filter_input, f.is_filtered)])
+    >>> e.match([{'pid': 1, 'name': 'python3'}, {'pid': 2, 'name': 'bash'}])
+    {'display': {1}}
+    """
+
+    # Process keys which does not change during the process life (except after an exec)
+    cached_keys = (None, 'name', 'cmdline')
+
+    def __init__(self):
+        # Compiled filters: list of (name, match) for the cached and the not cached filters
+        self._cached = []
+        self._not_cached = []
+        # Filters currently set (used to detect a change)
+        self._signature = ()
+        # Results of the cached filters, key = (pid, create_time, hash) / value = tuple of booleans
+        self._cache = {}
+        # Incremented when the filters change (results computed with old filters are not cached)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def set_filters(self, filters):
+        """Set the filters (list of (name, key, source, match)).
+
+        Nothing is done if the filters have not changed, else the cache is cleared.
+        """
+        signature = tuple((name, key, source) for name, key, source, _ in filters)
+        if signature == self._signature:
+            return
+        with self._lock:
+            self._signature = signature
+            self._cached = [(name, match) for name, key, _, match in filters if key in self.cached_keys]
+            self._not_cached = [(name, match) for name, key, _, match in filters if key not in self.cached_keys]
+            self._cache = {}
+            self._generation += 1
+
+    @staticmethod
+    def cache_key(process):
+        """Return the cache key of the given process."""
+        cmdline = process.get('cmdline')
+        return (
+            process['pid'],
+            process.get('create_time'),
+            hash((process.get('name'), tuple(cmdline) if isinstance(cmdline, list) else cmdline)),
+        )
+
+    def match(self, processlist):
+        """Return a dict with, for each filters group, the set of the matching pids."""
+        with self._lock:
+            cached, not_cached = self._cached, self._not_cached
+            cache, generation = self._cache, self._generation
+        ret = {name: set() for name, _ in cached + not_cached}
+        new_cache = {}
+        for process in processlist:
+            if cached:
+                key = self.cache_key(process)
+                results = cache.get(key)
+                if results is None:
+                    results = tuple(match(process) for _, match in cached)
+                new_cache[key] = results
+                for (name, _), result in zip(cached, results):
+                    if result:
+                        ret[name].add(process['pid'])
+            for name, match in not_cached:
+                if match(process):
+                    ret[name].add(process['pid'])
+        with self._lock:
+            # Only the processes of the list are kept (the dead ones are removed from the cache)
+            if generation == self._generation:
+                self._cache = new_cache
+        return ret
+
+
+class GlancesRegexList:
+    """Match values against a list of regular expressions (full match, case insensitive)
+
+    The regular expressions are compiled into a single alternation and the
+    result is memoised per value (field names are almost stable between cycles).
+
+    >>> r = GlancesRegexList(['.*_critical', 'sda.*'])
+    >>> r.match('mem_critical')
+    True
+    >>> r.match('SDA1')
+    True
+    >>> r.match('mem_careful')
+    False
+    """
+
+    # Maximum number of memoised values (the cache is cleared when it is full)
+    cache_size = 10000
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns or ())
+        self._cache = {}
+        self._re = []
+        for p in self.patterns:
+            try:
+                self._re.append(re.compile(p, re.I))
+            except re.error as e:
+                logger.error(f"Cannot compile regex: {p} ({e})")
+        # Back references can not be used in an alternation (groups are renumbered)
+        if len(self._re) > 1 and not any(re.search(r'\\[1-9]|\(\?P=', r.pattern) for r in self._re):
+            try:
+                self._re = [re.compile('|'.join(f'(?:{r.pattern})' for r in self._re), re.I)]
+            except re.error:
+                # Ex: global flags not at the start of a regex
+                pass
+
+    def match(self, value):
+        """Return True if the value matches one of the regular expressions."""
+        try:
+            return self._cache[value]
+        except KeyError:
+            pass
+        ret = any(r.fullmatch(value) for r in self._re)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[value] = ret
+        return ret
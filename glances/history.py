@@ -8,35 +8,274 @@
 
 """Manage stats history"""
 
-from glances.attribute import GlancesAttribute
+import os
+import time
+from array import array
+from urllib.parse import quote, unquote
+
+from glances.attribute import GlancesAttribute, GlancesMmapAttribute
+from glances.logger import logger
+
+# Consolidated history tiers (RRD-style)
+# key: resolution name, value: (step in seconds, maximum number of points)
+# Default: 1 day with a 1 minute step and 1 week with a 15 minutes step
+# Can be overwritten by the history_tiers option of the [global] section (see parse_history_tiers)
+HISTORY_TIERS = {
+    '1m': (60, 1440),
+    '15m': (900, 672),
+}
+# Units of the resolution names (in seconds)
+HISTORY_TIERS_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+# Available consolidation functions
+HISTORY_CONSOLIDATIONS = ['avg', 'min', 'max']
+
+
+def parse_history_tiers(value):
+    """Return the consolidated history tiers (see HISTORY_TIERS) from the history_tiers option.
+
+    The option is a comma separated list of <resolution>:<number of points>,
+    the resolution being a number of seconds (s), minutes (m), hours (h) or days (d).
+    Example: 1m:1440,15m:672
+    Return the default tiers if value is None and no tier if value is empty or 'none'.
+    """
+    if value is None:
+        return dict(HISTORY_TIERS)
+    ret = {}
+    if value.strip().lower() in ('', 'none'):
+        return ret
+    for tier in value.split(','):
+        try:
+            resolution, size = (i.strip() for i in tier.split(':'))
+            step = int(resolution[:-1]) * HISTORY_TIERS_UNITS[resolution[-1]]
+            size = int(size)
+            if step <= 0 or size <= 0:
+                raise ValueError
+        except (KeyError, ValueError):
+            logger.warning(f"Bad history tier {tier} (should be <resolution>:<number of points>, ex: 1m:1440)")
+            continue
+        ret[resolution] = (step, size)
+    return ret
+
+
+class GlancesHistoryTier:
+    """This class manage a consolidated history (min/avg/max) with a fixed step.
+
+    Values are aggregated in buckets of step seconds. When a bucket is closed,
+    its timestamp and its min/avg/max are stored in ring buffers (arrays of
+    max_size doubles) sharing the same position: one timestamp per bucket.
+    Only numerical values are consolidated.
+    """
+
+    def __init__(self, step, max_size):
+        self.step = step
+        self.max_size = max_size
+        self.reset()
+
+    def reset(self):
+        """Reset the consolidated history and the current bucket"""
+        self._timestamps = array('d')
+        self._consolidated = {c: array('d') for c in HISTORY_CONSOLIDATIONS}
+        # Position of the oldest bucket (once the ring buffers are full)
+        self._start = 0
+        # Current (not closed) bucket
+        self._bucket = None
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+
+    def add(self, timestamp, value):
+        """Add a value (with its epoch timestamp) to the current bucket"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        bucket = timestamp - timestamp % self.step
+        if bucket != self._bucket:
+            self._flush()
+            self._bucket = bucket
+        self._count += 1
+        self._sum += value
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = value if self._max is None else max(self._max, value)
+
+    def _flush(self):
+        """Close the current bucket"""
+        if not self._count:
+            return
+        if len(self._timestamps) < self.max_size:
+            self._timestamps.append(self._bucket)
+            for c, v in self._current().items():
+                self._consolidated[c].append(v)
+        else:
+            # Ring buffers are full: the oldest bucket is overwritten
+            self._timestamps[self._start] = self._bucket
+            for c, v in self._current().items():
+                self._consolidated[c][self._start] = v
+            self._start = (self._start + 1) % self.max_size
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+
+    def _current(self):
+        """Return the consolidated values of the current bucket"""
+        return {'avg': self._sum / self._count, 'min': self._min, 'max': self._max}
+
+    def get(self, nb=0, consolidation='avg', since=None):
+        """Return the consolidated history as a list of (epoch, value).
+
+        The current bucket (not closed) is the last value.
+        """
+        values = self._consolidated[consolidation]
+        ret = list(
+            zip(
+                self._timestamps[self._start :] + self._timestamps[: self._start],
+                values[self._start :] + values[: self._start],
+            )
+        )
+        if self._count:
+            ret.append((self._bucket, self._current()[consolidation]))
+        if since is not None:
+            ret = [i for i in ret if i[0] >= since - self.step]
+        return ret[-nb:] if nb > 0 else ret
 
 
 class GlancesHistory:
     """This class manage a dict of GlancesAttribute
     - key: stats name
-    - value: GlancesAttribute"""
+    - value: GlancesAttribute
+
+    For each key, consolidated histories (see HISTORY_TIERS) are also kept
+    (if tiers is not empty).
+
+    If path is set, the history of the numerical keys is stored in
+    memory-mapped files (one file per key) in order to survive restarts.
+    """
 
-    def __init__(self):
+    # Extension of the history files
+    FILE_EXT = '.hist'
+
+    def __init__(self, path=None, tiers=None):
         """
         items_history_list: list of stats to historized (define inside plugins)
+        path: folder of the persistent history files (None for an history in memory only)
+        tiers: consolidated history tiers (see HISTORY_TIERS, None for the default ones)
         """
         self.stats_history = {}
+        self.tiers = dict(HISTORY_TIERS) if tiers is None else tiers
+        # Consolidated histories: key = stats name, value = dict of GlancesHistoryTier
+        self.stats_tiers = {}
+        self.path = path
+        # Keys loaded from the history files (but not yet updated)
+        self._loaded = set()
+        if self.path:
+            self.load()
+
+    def _init_tiers(self, key):
+        """Init the consolidated histories of the given key (with the current history)"""
+        self.stats_tiers[key] = {r: GlancesHistoryTier(step, size) for r, (step, size) in self.tiers.items()}
+        attribute = self.stats_history[key]
+        if not self.tiers or not attribute.history_len():
+            return
+        for t, v in zip(attribute.history_timestamps(), attribute.history_values()):
+            for tier in self.stats_tiers[key].values():
+                tier.add(t, v)
+
+    def load(self):
+        """Attach the existing history files"""
+        try:
+            files = [f for f in os.listdir(self.path) if f.endswith(self.FILE_EXT)]
+        except OSError:
+            return
+        for f in files:
+            key = unquote(f[: -len(self.FILE_EXT)])
+            try:
+                self.stats_history[key] = GlancesMmapAttribute(key, os.path.join(self.path, f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Can not load history file {os.path.join(self.path, f)} ({e})")
+                continue
+            self._loaded.add(key)
+            self._init_tiers(key)
+        logger.debug(f"{len(files)} history files loaded from {self.path}")
+
+    def _new_attribute(self, key, value, description, history_max_size):
+        """Return a new GlancesAttribute (persistent if possible) for the given key."""
+        if self.path and (value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))):
+            try:
+                return GlancesMmapAttribute(
+                    key,
+                    os.path.join(self.path, quote(key, safe='') + self.FILE_EXT),
+                    description=description,
+                    history_max_size=history_max_size,
+                )
+            except (OSError, ValueError) as e:
+                logger.warning(f"Can not create history file for {key} in {self.path} ({e})")
+        return GlancesAttribute(key, description=description, history_max_size=history_max_size)
 
     def add(self, key, value, description='', history_max_size=None):
         """Add an new item (key, value) to the current history."""
         if key not in self.stats_history:
-            self.stats_history[key] = GlancesAttribute(key, description=description, history_max_size=history_max_size)
+            self.stats_history[key] = self._new_attribute(key, value, description, history_max_size)
+            self._init_tiers(key)
+        elif key in self._loaded:
+            # History file loaded at startup: attach it again with the description and the history size
+            self._loaded.discard(key)
+            self.stats_history[key].close()
+            self.stats_history[key] = self._new_attribute(key, value, description, history_max_size)
         self.stats_history[key].value = value
+        if history_max_size:
+            for tier in self.stats_tiers[key].values():
+                tier.add(self.stats_history[key].timestamp, value)
 
     def reset(self):
         """Reset all the stats history"""
         for a in self.stats_history:
             self.stats_history[a].history_reset()
+            for tier in self.stats_tiers[a].values():
+                tier.reset()
 
-    def get(self, nb=0):
+    def close(self):
+        """Close the persistent history files"""
+        for a in self.stats_history.values():
+            if isinstance(a, GlancesMmapAttribute):
+                a.close()
+
+    def get(self, nb=0, resolution='raw', consolidation='avg', since=None):
         """Get the history as a dict of list"""
-        return {i: self.stats_history[i].history_raw(nb=nb) for i in self.stats_history}
+        return {
+            i: self.get_item(i, nb=nb, resolution=resolution, consolidation=consolidation, since=since)
+            for i in self.stats_history
+        }
+
+    def get_item(self, key, nb=0, resolution='raw', consolidation='avg', since=None):
+        """Get the history of the given key as a list (None if the key is not in the history)
+
+        :resolution: 'raw' or a consolidated resolution (see tiers)
+        :consolidation: 'avg', 'min' or 'max' (only for consolidated resolution)
+        :since: only return the values since the given number of seconds
+        """
+        if key not in self.stats_history:
+            return None
+        if resolution != 'raw' and resolution not in self.tiers:
+            raise ValueError(f"Unknown history resolution {resolution} (available: {['raw'] + list(self.tiers)})")
+        if consolidation not in HISTORY_CONSOLIDATIONS:
+            raise ValueError(f"Unknown history consolidation {consolidation} (available: {HISTORY_CONSOLIDATIONS})")
+        start = time.time() - since if since else None
+        if resolution == 'raw':
+            return self.stats_history[key].history_raw(nb=nb, since=start)
+        return [
+            (GlancesAttribute.to_datetime(t), v)
+            for t, v in self.stats_tiers[key][resolution].get(nb=nb, consolidation=consolidation, since=start)
+        ]
+
+    def get_values(self, key, nb=0):
+        """Get the history values (without the dates) of the given key as a list"""
+        if key not in self.stats_history:
+            return None
+        return self.stats_history[key].history_values(nb=nb)
 
-    def get_json(self, nb=0):
+    def get_json(self, nb=0, resolution='raw', consolidation='avg', since=None):
         """Get the history as a dict of list (with list JSON compliant)"""
-        return {i: self.stats_history[i].history_json(nb=nb) for i in self.stats_history}
+        return {
+            k: [(d.isoformat(), v) for d, v in h]
+            for k, h in self.get(nb=nb, resolution=resolution, consolidation=consolidation, since=since).items()
+        }
@@ -126,6 +126,7 @@ class _GlancesCurses:
         'raid',
         'smart',
         'sensors',
+        'selfmon',
         'now',
     ]
     _left_sidebar_min_width = 23
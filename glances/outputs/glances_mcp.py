@@ -34,6 +34,8 @@ class GlancesMcpServer:
         glances://stats                     - All plugins' current statistics
         glances://stats/{plugin}            - Current statistics for one plugin
         glances://stats/{plugin}/history    - Historical time-series for one plugin
+        glances://stats/{plugin}/history/{resolution}
+                                            - Consolidated time-series for one plugin (raw, 1m, 15m)
         glances://limits                    - Alert thresholds for all plugins
         glances://limits/{plugin}           - Alert thresholds for one plugin
 
@@ -254,6 +256,25 @@ class GlancesMcpServer:
             # nb=0 → return all available history points
             return server._serialize(plugin_obj.get_raw_history(item=None, nb=0))
 
+        @mcp.resource(
+            "glances://stats/{plugin}/history/{resolution}",
+            name="plugin_history_resolution",
+            description=(
+                "Consolidated historical time-series data for a specific monitoring plugin. "
+                "Resolution is 'raw' (refresh rate), '1m' (last day) or '15m' (last week) by default "
+                "(see the history_tiers option); "
+                "consolidated values are the average on each period. "
+                "Returns a dict of field→list pairs, most-recent value last."
+            ),
+            mime_type="application/json",
+        )
+        def plugin_history_resolution(plugin: str, resolution: str) -> str:
+            stats = server._get_stats()
+            plugin_obj = stats.get_plugin(plugin)
+            if plugin_obj is None:
+                raise ValueError(f"Plugin '{plugin}' not found")
+            return server._serialize(plugin_obj.get_raw_history(item=None, nb=0, resolution=resolution))
+
         # ---- all limits --------------------------------------------------
 
         @mcp.resource(
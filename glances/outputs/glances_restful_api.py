@@ -17,10 +17,12 @@ from typing import Annotated, Any
 from urllib.parse import urljoin
 
 from glances import __apiversion__, __version__
+from glances.cache import GlancesStatsCache
 from glances.events_list import glances_events
 from glances.globals import json_dumps
 from glances.logger import logger
 from glances.password import GlancesPassword
+from glances.perf import glances_perf
 
 # JWT import with fallback
 try:
@@ -245,7 +247,7 @@ class GlancesRestfulApi:
         # cached_time is the minimum time interval between stats updates
         # i.e. HTTP/RESTful calls will not retrieve updated info until the time
         # since last update is passed (will retrieve old cached info instead)
-        self.timer = Timer(0)
+        self.cache = GlancesStatsCache(ttl=self.args.cached_time)
 
         # Load configuration file
         self.load_config(config)
@@ -416,18 +418,19 @@ class GlancesRestfulApi:
         return self.ssl_keyfile is not None and self.ssl_certfile is not None
 
     def __update_stats(self, plugins_list_to_update=None):
-        # Never update more than 1 time per cached_time
-        # Also update if specific plugins are requested
-        # In  this case, lru_cache will handle the stat's update frequency
-        if self.timer.finished() or plugins_list_to_update:
+        # If specific plugins are requested, the stats cache handles the update frequency of each plugin
+        if plugins_list_to_update:
             self.stats.update(plugins_list_to_update=plugins_list_to_update)
-            self.timer = Timer(self.args.cached_time)
+        # Never update all the plugins more than 1 time per cached_time
+        elif not self.cache.get('all'):
+            self.stats.update()
+            self.cache.set('all')
 
     def __update_servers_list(self):
         # Never update more than 1 time per cached_time
-        if self.timer.finished() and self.servers_list is not None:
+        if self.servers_list is not None and not self.cache.get('serverslist'):
             self.servers_list.update_servers_stats()
-            self.timer = Timer(self.args.cached_time)
+            self.cache.set('serverslist')
 
     def authentication(
         self,
@@ -545,6 +548,8 @@ class GlancesRestfulApi:
             f'{base_path}/all/views': self._api_all_views,
             f'{base_path}/pluginslist': self._api_plugins,
             f'{base_path}/serverslist': self._api_servers_list,
+            f'{base_path}/internal/cache': self._api_internal_cache,
+            f'{base_path}/internal/perf': self._api_internal_perf,
             f'{base_path}/processes/extended': self._api_get_extended_processes,
             f'{base_path}/processes/{{pid}}': self._api_get_processes,
             f'{plugin_path}': self._api,
@@ -902,6 +907,26 @@ class GlancesRestfulApi:
 
         return GlancesJSONResponse(plist)
 
+    def _api_internal_cache(self):
+        """Glances API RESTful implementation.
+
+        Return the JSON representation of the stats cache counters:
+        - plugins: plugins update cache (one key per plugin)
+        - restful: RESTful API cache (full stats and servers list updates)
+        HTTP/200 if OK
+        """
+        return GlancesJSONResponse({'plugins': self.stats.get_cache_stats(), 'restful': self.cache.get_stats()})
+
+    def _api_internal_perf(self):
+        """Glances API RESTful implementation.
+
+        Return the JSON representation of the self-monitoring stats:
+        durations (last, mean, p99 in seconds) of the plugins (update, views, history)
+        and exporters (export), plugins cache hit ratio and memory (in bytes)
+        HTTP/200 if OK
+        """
+        return GlancesJSONResponse(glances_perf.get_stats())
+
     @staticmethod
     def _sanitize_server(server):
         """Return a copy of the server dict without credential-bearing fields."""
@@ -1022,22 +1047,25 @@ class GlancesRestfulApi:
 
         try:
             # Get the RAW value of the stat ID
-            statval = self.stats.get_plugin(plugin).get_api()
+            statval = self.stats.get_plugin(plugin).get_api_top(nb)
         except Exception as e:
             raise HTTPException(status.HTTP_404_NOT_FOUND, f"Cannot get plugin {plugin} ({str(e)})")
 
-        if isinstance(statval, list):
-            statval = statval[:nb]
-
         return GlancesJSONResponse(statval)
 
-    def _api_history(self, plugin: str, nb: int = 0):
+    def _api_history(
+        self, plugin: str, nb: int = 0, resolution: str = 'raw', consolidation: str = 'avg', since: int = 0
+    ):
         """Glances API RESTful implementation.
 
         Return the JSON representation of a given plugin history
         Limit to the last nb items (all if nb=0)
+        Optional query parameters:
+        - resolution: raw (default), 1m or 15m (consolidated history, see the history_tiers option)
+        - consolidation: avg (default), min or max (only for consolidated history)
+        - since: only return the last since seconds (all if since=0)
         HTTP/200 if OK
-        HTTP/400 if plugin is not found
+        HTTP/400 if plugin is not found or if a parameter is not valid
         HTTP/404 if others error
         """
         self._check_if_plugin_available(plugin)
@@ -1047,7 +1075,11 @@ class GlancesRestfulApi:
 
         try:
             # Get the RAW value of the stat ID
-            statval = self.stats.get_plugin(plugin).get_raw_history(nb=int(nb))
+            statval = self.stats.get_plugin(plugin).get_raw_history(
+                nb=int(nb), resolution=resolution, consolidation=consolidation, since=since
+            )
+        except ValueError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
         except Exception as e:
             raise HTTPException(status.HTTP_404_NOT_FOUND, f"Cannot get plugin history {plugin} ({str(e)})")
 
@@ -1190,12 +1222,21 @@ class GlancesRestfulApi:
 
         return GlancesJSONResponse(ret)
 
-    def _api_item_history(self, plugin: str, item: str, nb: int = 0):
+    def _api_item_history(
+        self,
+        plugin: str,
+        item: str,
+        nb: int = 0,
+        resolution: str = 'raw',
+        consolidation: str = 'avg',
+        since: int = 0,
+    ):
         """Glances API RESTful implementation.
 
         Return the JSON representation of the couple plugin/history of item
+        Optional query parameters: resolution, consolidation and since (see _api_history)
         HTTP/200 if OK
-        HTTP/400 if plugin is not found
+        HTTP/400 if plugin is not found or if a parameter is not valid
         HTTP/404 if others error
 
         """
@@ -1206,7 +1247,11 @@ class GlancesRestfulApi:
 
         try:
             # Get the RAW value of the stat history
-            ret = self.stats.get_plugin(plugin).get_raw_history(item, nb=nb)
+            ret = self.stats.get_plugin(plugin).get_raw_history(
+                item, nb=nb, resolution=resolution, consolidation=consolidation, since=since
+            )
+        except ValueError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
         except Exception as e:
             raise HTTPException(status.HTTP_404_NOT_FOUND, f"Cannot get history for plugin {plugin} ({str(e)})")
         else:
@@ -1415,6 +1460,8 @@ class GlancesRestfulApi:
             raise HTTPException(status.HTTP_404_NOT_FOUND, f"Unknown PID process {pid}")
 
         glances_processes.extended_process = process_stats
+        # Extended stats are grabbed in background (available for the next updates)
+        glances_processes.extended_stats_worker.request(process_stats['pid'])
 
         return GlancesJSONResponse(True)
 
@@ -1427,6 +1474,7 @@ class GlancesRestfulApi:
         HTTP/404 if others error
         """
         glances_processes.extended_process = None
+        glances_processes.extended_stats_worker.cancel()
 
         return GlancesJSONResponse(True)
 
@@ -510,6 +510,18 @@ def print_history(stats):
     print(f'    # curl {API_URL}/cpu/system/history')
     print(indent_stat(json.loads(stats.get_plugin('cpu').get_stats_history('system', nb=2))))
     print('')
+    print('Consolidated history (resolution: 1m or 15m by default, consolidation: avg, min or max)')
+    print('for a specific field, limited to the last hour (since=3600 seconds)::')
+    print('')
+    print(f'    # curl "{API_URL}/cpu/system/history?resolution=1m&consolidation=max&since=3600"')
+    print(
+        indent_stat(
+            json.loads(
+                stats.get_plugin('cpu').get_stats_history('system', resolution='1m', consolidation='max', since=3600)
+            )
+        )
+    )
+    print('')
 
 
 def print_limits(stats):
@@ -0,0 +1,162 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Self-monitoring: measure the Glances internal operations."""
+
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def get_size(obj):
+    """Return the (approximate) memory size in bytes of obj and all the objects it references."""
+    size = 0
+    seen = set()
+    todo = [obj]
+    while todo:
+        o = todo.pop()
+        if id(o) in seen or isinstance(o, (type, threading.Thread)) or callable(o):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o, 0)
+        if isinstance(o, dict):
+            todo.extend(o.keys())
+            todo.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            todo.extend(o)
+        elif hasattr(o, '__dict__'):
+            todo.append(o.__dict__)
+        elif hasattr(o, '__slots__'):
+            todo.extend(getattr(o, s) for s in o.__slots__ if hasattr(o, s))
+    return size
+
+
+class GlancesPerf:
+    """This class records the durations of the Glances internal operations.
+
+    A duration is recorded for an operation (ex: update, views, history, export)
+    of a module (ex: the cpu plugin or the csv exporter). Only the last window
+    durations are kept in order to compute the mean and the 99th percentile.
+
+    Memory is only computed on demand and at most every memory_ttl seconds.
+    """
+
+    def __init__(self, window=300, memory_ttl=60):
+        """Init the self-monitoring.
+
+        :window: number of durations kept for each operation
+        :memory_ttl: minimum time (in seconds) between two memory computations
+        """
+        self.window = window
+        self.memory_ttl = memory_ttl
+        # Durations: key = (category, name), value = dict of operation: deque of durations (in seconds)
+        self._durations = {}
+        # Function returning the object to measure: key = (category, name)
+        self._memory_fct = {}
+        # Last memory computation: (monotonic time, dict of key: size in bytes)
+        self._memory = (None, {})
+        # Function returning the queue stats (dict) of a module: key = (category, name)
+        self._queue_fct = {}
+        # Caches (GlancesStatsCache) with the module name as key: key = category
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, operation, duration, category='plugin'):
+        """Add the duration (in seconds) of the operation for the given module name."""
+        with self._lock:
+            operations = self._durations.setdefault((category, name), {})
+            if operation not in operations:
+                operations[operation] = deque(maxlen=self.window)
+            operations[operation].append(duration)
+
+    @contextmanager
+    def measure(self, name, operation, category='plugin'):
+        """Context manager recording the duration of the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, operation, time.perf_counter() - start, category=category)
+
+    def watch_memory(self, name, fct, category='plugin'):
+        """Watch the memory of a module: fct returns the object(s) to measure."""
+        self._memory_fct[(category, name)] = fct
+
+    def watch_queue(self, name, fct, category='export'):
+        """Watch the queue of a module: fct returns the queue stats (dict)."""
+        self._queue_fct[(category, name)] = fct
+
+    def watch_cache(self, cache, category='plugin'):
+        """Watch a cache (GlancesStatsCache) with the module names as keys."""
+        self._caches[category] = cache
+
+    @staticmethod
+    def _summary(durations):
+        """Return the last, mean and p99 of a list of durations."""
+        durations = list(durations)
+        if not durations:
+            return {'last': None, 'mean': None, 'p99': None, 'count': 0}
+        ordered = sorted(durations)
+        return {
+            'last': durations[-1],
+            'mean': sum(durations) / len(durations),
+            'p99': ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+            'count': len(durations),
+        }
+
+    def get_memory(self):
+        """Return the memory size (in bytes) of the watched modules: key = (category, name)."""
+        last, memory = self._memory
+        if last is None or time.monotonic() - last >= self.memory_ttl:
+            memory = {}
+            for key, fct in list(self._memory_fct.items()):
+                try:
+                    memory[key] = get_size(fct())
+                except Exception:
+                    memory[key] = None
+            self._memory = (time.monotonic(), memory)
+        return memory
+
+    def get(self, name, operation, category='plugin'):
+        """Return the summary (last, mean, p99, count) of the operation for the given module name."""
+        with self._lock:
+            durations = list(self._durations.get((category, name), {}).get(operation, []))
+        return self._summary(durations)
+
+    def get_stats(self, memory=True):
+        """Return the self-monitoring stats as a dict.
+
+        {category: {name: {'durations': {operation: summary}, 'cache_hit_ratio': ..., 'memory': ..., 'queue': ...}}}
+        """
+        with self._lock:
+            durations = {k: {op: list(d) for op, d in v.items()} for k, v in self._durations.items()}
+        memory = self.get_memory() if memory else {}
+        caches = {t: c.get_stats()['keys'] for t, c in self._caches.items()}
+        ret = {}
+        for key in sorted(set(durations) | set(self._memory_fct) | set(self._queue_fct)):
+            category, name = key
+            counters = caches.get(category, {}).get(name)
+            lookups = sum(counters.values()) if counters else 0
+            ret.setdefault(category, {})[name] = {
+                'durations': {op: self._summary(d) for op, d in durations.get(key, {}).items()},
+                'cache_hit_ratio': round(counters['hit'] / lookups, 3) if lookups else None,
+                'memory': memory.get(key),
+                'queue': self._queue_fct[key]() if key in self._queue_fct else None,
+            }
+        return ret
+
+    def reset(self):
+        """Reset the recorded durations (the watched modules are kept)."""
+        with self._lock:
+            self._durations.clear()
+        self._memory = (None, {})
+
+
+glances_perf = GlancesPerf()
@@ -8,7 +8,8 @@
 
 # Glances DAG (direct acyclic graph) for plugins dependencies.
 # It allows to define DAG dependencies between plugins
-# For the moment, it will be used only for Restful API interface
+# It is used by the Restful API interface (update a plugin and its dependencies)
+# and by the stats update scheduler (update plugins in parallel, see scheduler.py)
 
 _plugins_graph = {
     '*': ['alert'],  # All plugins depend on alert plugin
@@ -56,6 +57,23 @@ def get_plugin_dependencies(plugin_name, _graph=_plugins_graph):
     return [plugin_name] + result
 
 
+def get_plugins_graph(plugins_list, _graph=_plugins_graph):
+    """Return the direct dependencies (dict of set) of each plugin in plugins_list.
+
+    Only dependencies available in plugins_list are kept.
+    Global ("*") plugins are built from the others ones, so they depend on all
+    the other plugins of the list (ex: alert is updated at the end of the cycle).
+    """
+    global_plugins = [p for p in _graph.get('*', []) if p in plugins_list]
+    ret = {}
+    for plugin in plugins_list:
+        if plugin in global_plugins:
+            ret[plugin] = {p for p in plugins_list if p not in global_plugins}
+        else:
+            ret[plugin] = {p for p in _graph.get(plugin, []) if p in plugins_list and p not in global_plugins}
+    return ret
+
+
 def _dfs_order(plugin, graph, seen):
     """Helper to preserve depth-first order."""
     if plugin in seen:
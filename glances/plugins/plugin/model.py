@@ -13,11 +13,14 @@ I am your father...
 """
 
 import copy
+import functools
+import os
 import re
 from datetime import datetime
 
 from glances.actions import GlancesActions
 from glances.events_list import glances_events
+from glances.filter import GlancesRegexList
 from glances.globals import (
     auto_unit,
     dictlist,
@@ -29,7 +32,7 @@ from glances.globals import (
     nativestr,
     split_esc,
 )
-from glances.history import GlancesHistory
+from glances.history import GlancesHistory, parse_history_tiers
 from glances.logger import logger
 from glances.outputs.glances_unicode import unicode_message
 from glances.thresholds import glances_thresholds
@@ -101,10 +104,14 @@ class GlancesPluginModel:
 
         # Init the history list
         self.items_history_list = items_history_list
-        self.stats_history = self.init_stats_history()
+        self.stats_history = self.init_stats_history(config)
 
         # Init the limits (configuration keys) dictionary
         self._limits = {}
+        # Init the thresholds table (limits resolved for each stat name, see get_limits_entry)
+        self._limits_table = {}
+        # Init the show/hide regex lists (see get_conf_regex)
+        self._regex_lists = {}
         if config is not None:
             logger.debug(f'Load section {self.plugin_name} in Glances configuration file')
             self.load_limits(config=config)
@@ -117,6 +124,11 @@ class GlancesPluginModel:
 
         # Init the views
         self.views = {}
+        # Views kept across the updates (see update_views)
+        # key: item key (None for the stats stored in a dict), value: dict of fields views
+        self._views_cache = {}
+        # Quiet bands (decoration will not change) of the decorated fields (see _get_field_alert)
+        self._views_bands = {}
 
         # Hide stats if all the hide_zero_fields has never been != 0
         # Default is False, always display stats
@@ -135,11 +147,14 @@ class GlancesPluginModel:
         # Init MMM (Min/Max/Mean) tracking for fields with mmm=True
         self._mmm_fields = self._init_mmm_fields()
 
+        # Init the rate fields (fields with rate=True) and their previous gauges
+        self._rate_fields = self._init_rate_fields()
+        self._previous_gauges = None
+
         # Init the stats
         self.stats_init_value = stats_init_value
         self.time_since_last_update = None
         self.stats = None
-        self.stats_previous = None
         self.reset()
 
     def __str__(self):
@@ -183,6 +198,12 @@ class GlancesPluginModel:
         """Return a copy of the init value."""
         return copy.copy(self.stats_init_value)
 
+    def _init_rate_fields(self):
+        """Return the list of the fields with rate=True in fields_description."""
+        if self.fields_description is None:
+            return []
+        return [field for field, info in self.fields_description.items() if info.get('rate', False)]
+
     def _init_mmm_fields(self):
         """Initialize MMM (Min/Max/Mean) field tracking.
 
@@ -328,12 +349,27 @@ class GlancesPluginModel:
     def history_enable(self):
         return self.args is not None and not self.args.disable_history and self.get_items_history_list() is not None
 
-    def init_stats_history(self):
-        """Init the stats history (dict of GlancesAttribute)."""
+    def init_stats_history(self, config=None):
+        """Init the stats history (dict of GlancesAttribute).
+
+        If history_path is set in the [global] section, the history is persistent.
+        The consolidated history tiers are set by the history_tiers option of the [global] section.
+        """
+        path = None
+        tiers = None
         if self.history_enable():
             init_list = [a['name'] for a in self.get_items_history_list()]
             logger.debug(f"Stats history activated for plugin {self.plugin_name} (items: {init_list})")
-        return GlancesHistory()
+            if hasattr(config, 'get_value') and config.get_value('global', 'history_path', default=None):
+                path = os.path.join(os.path.expanduser(config.get_value('global', 'history_path')), self.plugin_name)
+                logger.debug(f"Persistent stats history for plugin {self.plugin_name} in {path}")
+            if hasattr(config, 'get_value'):
+                tiers = parse_history_tiers(config.get_value('global', 'history_tiers', default=None))
+        return GlancesHistory(path=path, tiers=tiers)
+
+    def close_stats_history(self):
+        """Close the stats history (flush the persistent history files)."""
+        self.stats_history.close()
 
     def reset_stats_history(self):
         """Reset the stats history (dict of GlancesAttribute)."""
@@ -379,27 +415,28 @@ class GlancesPluginModel:
         """Return the items history list."""
         return self.items_history_list
 
-    def get_raw_history(self, item=None, nb=0):
+    def get_raw_history(self, item=None, nb=0, resolution='raw', consolidation='avg', since=None):
         """Return the history (RAW format).
 
         - the stats history (dict of list) if item is None
         - the stats history for the given item (list) instead
         - None if item did not exist in the history
+
+        resolution is 'raw' (refresh rate) or a consolidated one ('1m', '15m' by default, see history_tiers).
+        For consolidated resolution, consolidation is 'avg', 'min' or 'max'.
+        If since is set, only return the values of the last since seconds.
         """
-        s = self.stats_history.get(nb=nb)
         if item is None:
-            return s
-        if item in s:
-            return s[item]
-        return None
+            return self.stats_history.get(nb=nb, resolution=resolution, consolidation=consolidation, since=since)
+        return self.stats_history.get_item(item, nb=nb, resolution=resolution, consolidation=consolidation, since=since)
 
     def get_export_history(self, item=None):
         """Return the stats history object to export."""
         return self.get_raw_history(item=item)
 
-    def get_stats_history(self, item=None, nb=0):
+    def get_stats_history(self, item=None, nb=0, resolution='raw', consolidation='avg', since=None):
         """Return the stats history (JSON format)."""
-        s = self.stats_history.get_json(nb=nb)
+        s = self.stats_history.get_json(nb=nb, resolution=resolution, consolidation=consolidation, since=since)
 
         if item is None:
             return json_dumps(s)
@@ -412,10 +449,9 @@ class GlancesPluginModel:
         The trend is the diffirence between the mean of the last 0 to nb / 2
         and nb / 2 to nb values.
         """
-        raw_history = self.get_raw_history(item=item, nb=nb)
-        if raw_history is None or len(raw_history) < nb:
+        last_nb = self.stats_history.get_values(item, nb=nb)
+        if last_nb is None or len(last_nb) < nb:
             return None
-        last_nb = [v[1] for v in raw_history]
         return mean(last_nb[nb // 2 :]) - mean(last_nb[: nb // 2])
 
     @property
@@ -534,6 +570,12 @@ class GlancesPluginModel:
         By default, return the raw stats."""
         return self.get_raw()
 
+    def get_api_top(self, nb):
+        """Return the stats object for the API limited to the top nb items (if stats is a list).
+        By default, return the first nb items of the API stats."""
+        ret = self.get_api()
+        return ret[:nb] if isinstance(ret, list) else ret
+
     def get_export(self):
         """Return the stats object to export.
         By default, return the raw stats.
@@ -617,11 +659,36 @@ class GlancesPluginModel:
             ):
                 return 'DEFAULT'
             if self.fields_description[field].get('log') is True:
-                return self.get_alert_log(self.stats[field], header=field)
+                return self._get_field_alert(field, log=True)
             if self.fields_description[field].get('alert') is True:
-                return self.get_alert(self.stats[field], header=field)
+                return self._get_field_alert(field)
         return 'DEFAULT'
 
+    def _get_field_alert(self, field, log=False):
+        """Return the alert (or alert log) decoration of a field.
+
+        If the previous decoration is a quiet one (DEFAULT or OK without action)
+        and the value is still in the same band (between 0 and the lowest threshold),
+        then the previous decoration is returned without calling get_alert.
+        """
+        value = self.stats[field]
+        band = self._views_bands.get(field)
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if band is not None and is_number and band[0] is self._limits_table.get(band[1]) and 0 <= value < band[2]:
+            return band[3]
+
+        ret = self.get_alert_log(value, header=field) if log else self.get_alert(value, header=field)
+
+        # Memorize the band if the decoration is a quiet one
+        self._views_bands.pop(field, None)
+        stat_name = self.get_stat_name(header=field).lower()
+        trigger = ret.replace('_LOG', '').lower()
+        if is_number and trigger in ('default', 'ok') and self.get_limit_action(trigger, stat_name) == (None, None):
+            limits = self.get_limits_entry(stat_name)
+            upper = min((limits[c] for c in ('careful', 'warning', 'critical') if limits[c]), default=float('inf'))
+            self._views_bands[field] = (limits, stat_name, upper, ret)
+        return ret
+
     def _build_field_optional(self, field):
         """Return true if the field is optional."""
         if self.fields_description and field in self.fields_description:
@@ -655,6 +722,39 @@ class GlancesPluginModel:
 
         return view
 
+    def _update_view_for_field(self, view, key, field, value):
+        """Update (in place) the existing view of a field.
+
+        Only the decoration and the hidden flag could change between two updates.
+        """
+        # The decoration is computed again (static fields are always DEFAULT)
+        # It also reset the decoration set by the plugin (see the plugins update_views)
+        view['decoration'] = self._build_field_decoration(field)
+
+        # Manage the hidden feature (see _build_view_for_field)
+        if not self.hide_zero:
+            view['hidden'] = False
+        elif not key:
+            view['hidden'] = field in self.hide_zero_fields
+        elif view['hidden'] and field in self.hide_zero_fields and value >= self.hide_threshold_bytes:
+            view['hidden'] = False
+
+    def _update_item_views(self, item_views, stats, key=None):
+        """Update the views of all the fields of the stats dict.
+
+        The item_views dict (previous views) is reused if the fields are the same.
+        """
+        if item_views is None or item_views.keys() != stats.keys():
+            # Fields list changed: new dict (but the views of the existing fields are kept)
+            previous = item_views or {}
+            item_views = {field: previous.get(field) for field in stats}
+        for field, view in item_views.items():
+            if view is None:
+                item_views[field] = self._build_view_for_field(key=key, field=field)
+            else:
+                self._update_view_for_field(view, key, field, stats[field])
+        return item_views
+
     def update_views(self):
         """Update the stats views.
 
@@ -666,21 +766,29 @@ class GlancesPluginModel:
                 'additional': False,      >>> Is the stat provide additional information
                 'splittable': False,      >>> Is the stat can be cut (like process lon name)
                 'hidden': False}          >>> Is the stats should be hidden in the UI
+
+        Views are incremental: the views of the fields are kept between two updates
+        and only the decoration and the hidden flag are updated.
         """
-        ret = {}
+        stats = self.get_raw()
+        views_cache = {}
 
-        if self.get_raw() is not None and isinstance(self.get_raw(), list) and self.get_key() is not None:
+        if isinstance(stats, list) and self.get_key() is not None:
             # Stats are stored in a list of dict (ex: DISKIO, NETWORK, FS...)
-            for i in self.get_raw():
-                key = i[self.get_key()]
-                ret[key] = {}
-                for field in listkeys(i):
-                    ret[key][field] = self._build_view_for_field(key=key, field=field)
-        elif isinstance(self.get_raw(), dict) and self.get_raw() is not None:
+            key_name = self.get_key()
+            for i in stats:
+                key = i[key_name]
+                views_cache[key] = self._update_item_views(self._views_cache.get(key), i, key=key)
+            ret = dict(views_cache)
+        elif isinstance(stats, dict):
             # Stats are stored in a dict (ex: CPU, LOAD...)
-            for field in listkeys(self.get_raw()):
-                ret[field] = self._build_view_for_field(key=None, field=field)
+            views_cache[None] = self._update_item_views(self._views_cache.get(None), stats)
+            ret = dict(views_cache[None])
+        else:
+            ret = {}
 
+        # The plugins could add or replace items in self.views (not in the cache)
+        self._views_cache = views_cache
         self.views = ret
 
         return self.views
@@ -692,6 +800,7 @@ class GlancesPluginModel:
     def reset_views(self):
         """Reset the views to input_views."""
         self.views = {}
+        self._views_cache = {}
 
     def get_views(self, item=None, key=None, option=None):
         """Return the views object.
@@ -745,6 +854,10 @@ class GlancesPluginModel:
                     self._limits[limit] = config.get_value(self.plugin_name, level).split(",")
                 logger.debug(f"Load limit: {limit} = {self._limits[limit]}")
 
+        # Limits changed: the thresholds table and the regex lists will be built again
+        self._limits_table = {}
+        self._regex_lists = {}
+
         return True
 
     @property
@@ -756,6 +869,8 @@ class GlancesPluginModel:
     def limits(self, input_limits):
         """Set the limits to input_limits."""
         self._limits = input_limits
+        self._limits_table = {}
+        self._regex_lists = {}
 
     def set_refresh(self, value):
         """Set the plugin refresh rate"""
@@ -772,9 +887,19 @@ class GlancesPluginModel:
         """Return the plugin refresh time"""
         return self.get_refresh()
 
+    def force_refresh(self):
+        """Force the stats refresh on the next update (finish the refresh timer)"""
+        self.refresh_timer.reset(duration=-1)
+
+    def get_update_timeout(self):
+        """Return the plugin update deadline (None if not defined in the plugin section)"""
+        return self.get_limits(item='update_timeout')
+
     def set_limits(self, item, value):
         """Set the limits object."""
         self._limits[f'{self.plugin_name}_{item}'] = value
+        self._limits_table = {}
+        self._regex_lists = {}
 
     def get_limits(self, item=None):
         """Return the limits object."""
@@ -851,10 +976,11 @@ class GlancesPluginModel:
         # If is_max is set then default style is set to MAX else default is set to OK
         ret = 'MAX' if is_max else 'OK'
 
-        # Iter through limits
-        critical = self.get_limit('critical', stat_name=stat_name)
-        warning = self.get_limit('warning', stat_name=stat_name)
-        careful = self.get_limit('careful', stat_name=stat_name)
+        # Get the limits (thresholds table)
+        limits = self.get_limits_entry(stat_name)
+        critical = limits['critical']
+        warning = limits['warning']
+        careful = limits['careful']
         if critical and value >= critical:
             ret = 'CRITICAL'
         elif warning and value >= warning:
@@ -871,7 +997,7 @@ class GlancesPluginModel:
 
         # Manage log
         log_str = ""
-        if self.get_limit_log(stat_name=stat_name, default_action=log) and ret != 'DEFAULT':
+        if (log if limits['log'] is None else limits['log']) and ret != 'DEFAULT':
             # Add _LOG to the return string
             # So stats will be highlighted with a specific color
             log_str = "_LOG"
@@ -913,34 +1039,36 @@ class GlancesPluginModel:
             # If not define, then it sets to header
             if action_key is None:
                 action_key = header
-
             # A command line is available for the current alert
-            # 1) Build the {{mustache}} dictionary
-            stats_action = copy.deepcopy(self.get_stats_action())
-            if isinstance(stats_action, list):
-                # If the stats are stored in a list of dict (fs plugin for example)
-                mustache_dict = {}
-                for item in stats_action:
-                    # Add the limit to the mustache dict
-                    item['critical'] = self.get_limit('critical', stat_name=stat_name)
-                    item['warning'] = self.get_limit('warning', stat_name=stat_name)
-                    item['careful'] = self.get_limit('careful', stat_name=stat_name)
-                    # Add the current time (now)
-                    item['time'] = datetime.now().isoformat()
-                    if item[self.get_key()] == action_key:
-                        mustache_dict = item
-                        break
-            else:
-                # Use the stats dict
-                # Add the limit to the mustache dict
-                stats_action['critical'] = self.get_limit('critical', stat_name=stat_name)
-                stats_action['warning'] = self.get_limit('warning', stat_name=stat_name)
-                stats_action['careful'] = self.get_limit('careful', stat_name=stat_name)
-                # Add the current time (now)
-                stats_action['time'] = datetime.now().isoformat()
-                mustache_dict = stats_action
-            # 2) Run the action
-            self.actions.run(stat_name, trigger, command, repeat, mustache_dict=mustache_dict)
+            # The {{mustache}} dictionary is only built if the action is ran
+            self.actions.run(
+                stat_name,
+                trigger,
+                command,
+                repeat,
+                mustache_dict=functools.partial(self.get_mustache_dict, stat_name, action_key),
+            )
+
+    def get_mustache_dict(self, stat_name, action_key):
+        """Return the {{mustache}} dictionary for an action: the stats with the limits and the current time."""
+        stats_action = self.get_stats_action()
+        if isinstance(stats_action, list):
+            # If the stats are stored in a list of dict (fs plugin for example)
+            # only the item with the action_key is used
+            item = next((i for i in stats_action if i[self.get_key()] == action_key), None)
+            if item is None:
+                return {}
+            mustache_dict = dict(item)
+        else:
+            # Use the stats dict
+            mustache_dict = dict(stats_action)
+        # Add the limits to the mustache dict
+        limits = self.get_limits_entry(stat_name)
+        for criticality in ('critical', 'warning', 'careful'):
+            mustache_dict[criticality] = limits[criticality]
+        # Add the current time (now)
+        mustache_dict['time'] = datetime.now().isoformat()
+        return mustache_dict
 
     def get_alert_log(self, current=0, minimum=0, maximum=100, header="", action_key=None):
         """Get the alert log."""
@@ -952,6 +1080,38 @@ class GlancesPluginModel:
         """Return true if the criticality limit exist for the given stat_name"""
         return self.get_stat_name(stat_name).lower() + '_' + criticality in self._limits
 
+    def get_limits_entry(self, stat_name):
+        """Return the thresholds table entry for the given stat_name.
+
+        The entry is built from the limits on the first call (then cached until the limits change):
+        - careful, warning, critical: limit for the stat (lower case) or the plugin, else None
+        - log: log tag for the stat (or the plugin) or None if not defined
+        - actions: (action, repeat) for each criticality (resolved on demand)
+
+        Example for the network_wlan0_rx stat_name:
+        network_wlan0_rx_careful if defined else network_careful...
+        """
+        try:
+            return self._limits_table[stat_name]
+        except KeyError:
+            pass
+        entry = {}
+        for criticality in ('careful', 'warning', 'critical'):
+            for key in (stat_name.lower() + '_' + criticality, self.plugin_name + '_' + criticality):
+                if key in self._limits:
+                    entry[criticality] = self._limits[key]
+                    break
+            else:
+                entry[criticality] = None
+        entry['log'] = None
+        for key in (stat_name + '_log', self.plugin_name + '_log'):
+            if key in self._limits:
+                entry['log'] = self._limits[key][0].lower() == 'true'
+                break
+        entry['actions'] = {}
+        self._limits_table[stat_name] = entry
+        return entry
+
     def get_limit(self, criticality=None, stat_name=""):
         """Return the limit value for the given criticality.
         If criticality is None, return the dict of all the limits."""
@@ -960,13 +1120,7 @@ class GlancesPluginModel:
 
         # Get the limit for stat + header
         # Example: network_wlan0_rx_careful
-        stat_name = stat_name.lower()
-        if stat_name + '_' + criticality in self._limits:
-            return self._limits[stat_name + '_' + criticality]
-        if self.plugin_name + '_' + criticality in self._limits:
-            return self._limits[self.plugin_name + '_' + criticality]
-
-        return None
+        return self.get_limits_entry(stat_name).get(criticality)
 
     def get_limit_action(self, criticality, stat_name=""):
         """Return the tuple (action, repeat) for the alert.
@@ -974,6 +1128,10 @@ class GlancesPluginModel:
         - action is a command line
         - repeat is a bool
         """
+        actions = self.get_limits_entry(stat_name)['actions']
+        if criticality in actions:
+            return actions[criticality]
+
         # Get the action for stat + header
         # Example: network_wlan0_rx_careful_action
         # Action key available ?
@@ -983,22 +1141,16 @@ class GlancesPluginModel:
             (self.plugin_name + '_' + criticality + '_action', False),
             (self.plugin_name + '_' + criticality + '_action_repeat', True),
         ]
-        for r in ret:
-            if r[0] in self._limits:
-                return self._limits[r[0]], r[1]
-
         # No key found, return None
-        return None, None
+        actions[criticality] = next(((self._limits[r[0]], r[1]) for r in ret if r[0] in self._limits), (None, None))
+        return actions[criticality]
 
     def get_limit_log(self, stat_name, default_action=False):
         """Return the log tag for the alert."""
         # Get the log tag for stat + header
         # Example: network_wlan0_rx_log
-        if stat_name + '_log' in self._limits:
-            return self._limits[stat_name + '_log'][0].lower() == 'true'
-        if self.plugin_name + '_log' in self._limits:
-            return self._limits[self.plugin_name + '_log'][0].lower() == 'true'
-        return default_action
+        log = self.get_limits_entry(stat_name)['log']
+        return default_action if log is None else log
 
     def get_conf_value(self, value, header="", plugin_name=None, convert_bool=False, default=[]):
         """Return the configuration (header_) value for the current plugin.
@@ -1019,6 +1171,17 @@ class GlancesPluginModel:
         except KeyError:
             return default
 
+    def get_conf_regex(self, value, header=""):
+        """Return the regex list (GlancesRegexList) of the configuration (header_) value.
+
+        The regex are compiled once and the matching result is memoised per value.
+        """
+        patterns = tuple(self.get_conf_value(value, header=header))
+        ret = self._regex_lists.get((value, header))
+        if ret is None or ret.patterns != patterns:
+            ret = self._regex_lists[(value, header)] = GlancesRegexList(patterns)
+        return ret
+
     def is_show(self, value, header=""):
         """Return True if the value is in the show configuration list.
 
@@ -1030,11 +1193,8 @@ class GlancesPluginModel:
         Example for diskio:
         show=sda.*
         """
-        return any(
-            re.fullmatch(i, value, re.I)
-            or (self.has_alias(value) is not None and re.fullmatch(i, self.has_alias(value), re.I))
-            for i in self.get_conf_value('show', header=header)
-        )
+        regex = self.get_conf_regex('show', header=header)
+        return regex.match(value) or ((alias := self.has_alias(value)) is not None and regex.match(alias))
 
     def is_hide(self, value, header=""):
         """Return True if the value is in the hide configuration list.
@@ -1045,11 +1205,8 @@ class GlancesPluginModel:
         Example for diskio:
         hide=sda2,sda5,loop.*
         """
-        return any(
-            re.fullmatch(i, value, re.I)
-            or (self.has_alias(value) is not None and re.fullmatch(i, self.has_alias(value), re.I))
-            for i in self.get_conf_value('hide', header=header)
-        )
+        regex = self.get_conf_regex('hide', header=header)
+        return regex.match(value) or ((alias := self.has_alias(value)) is not None and regex.match(alias))
 
     def is_display(self, value, header=""):
         """Return True if the value should be displayed in the UI"""
@@ -1306,49 +1463,48 @@ class GlancesPluginModel:
     def _manage_rate(fct):
         """Manage rate decorator for update method."""
 
-        def compute_rate(self, stat, stat_previous):
-            if stat_previous is None:
-                return stat
+        def compute_rate(self, stat, previous_gauges):
+            """Compute the rate fields of stat and return its gauges (dict: field -> gauge).
 
-            # 1) set _gauge for all the rate fields
-            # 2) compute the _rate_per_sec
-            # 3) set the original field to the delta between the current and the previous value
-            for field in self.fields_description:
+            previous_gauges is the dict of the gauges of the previous update (None to not compute the rate).
+            """
+            gauges = {}
+            for field in self._rate_fields:
                 # Check if the field exist (avoid error on some OS where some fields are not available)
                 if field not in stat:
                     continue
-                # For all the field with the rate=True flag
-                # if 'rate' in self.fields_description[field] and self.fields_description[field]['rate'] is True:
-                if self.fields_description[field].get('rate', False):
-                    # Create a new metadata with the gauge
-                    stat['time_since_update'] = self.time_since_last_update
-                    stat[field + '_gauge'] = stat[field]
-                    if field + '_gauge' in stat_previous and stat[field] and stat_previous[field + '_gauge']:
-                        # The stat becomes the delta between the current and the previous value
-                        stat[field] = stat[field] - stat_previous[field + '_gauge']
-                        # Compute the rate
-                        if self.time_since_last_update > 0:
-                            stat[field + '_rate_per_sec'] = stat[field] // self.time_since_last_update
-                        else:
-                            stat[field] = 0
-                            stat[field + '_rate_per_sec'] = 0
+                gauges[field] = stat[field]
+                if previous_gauges is None:
+                    continue
+                # 1) set _gauge for all the rate fields
+                # 2) compute the _rate_per_sec
+                # 3) set the original field to the delta between the current and the previous value
+                stat['time_since_update'] = self.time_since_last_update
+                stat[field + '_gauge'] = stat[field]
+                if stat[field] and previous_gauges.get(field):
+                    # The stat becomes the delta between the current and the previous value
+                    stat[field] = stat[field] - previous_gauges[field]
+                    # Compute the rate
+                    if self.time_since_last_update > 0:
+                        stat[field + '_rate_per_sec'] = stat[field] // self.time_since_last_update
                     else:
-                        # Avoid strange rate at the first run
                         stat[field] = 0
                         stat[field + '_rate_per_sec'] = 0
-            return stat
-
-        def compute_rate_on_list(self, stats, stats_previous):
-            if stats_previous is None:
-                return stats
-
+                else:
+                    # Avoid strange rate at the first run
+                    stat[field] = 0
+                    stat[field + '_rate_per_sec'] = 0
+            return gauges
+
+        def compute_rate_on_list(self, stats, previous_gauges):
+            """Compute the rate fields of each stat and return the gauges (dict: item key -> gauges)."""
             key = self.get_key()
-            previous_by_key = {s[key]: s for s in stats_previous}
+            gauges = {}
             for stat in stats:
-                old = previous_by_key.get(stat[key])
-                if old is not None:
-                    compute_rate(self, stat, old)
-            return stats
+                # New items (not in the previous update) only memorize their gauges
+                previous = None if previous_gauges is None else previous_gauges.get(stat[key])
+                gauges[stat[key]] = compute_rate(self, stat, previous)
+            return gauges
 
         def wrapper(self, *args, **kw):
             # Call the father method
@@ -1357,16 +1513,15 @@ class GlancesPluginModel:
             # Get the time since the last update
             self.time_since_last_update = getTimeSinceLastUpdate(self.plugin_name)
 
-            # Compute the rate
+            # Compute the rate and memorize the current gauges (only) for next run
             if isinstance(stats, dict):
                 # Stats is a dict
-                compute_rate(self, stats, self.stats_previous)
+                self._previous_gauges = compute_rate(self, stats, self._previous_gauges)
             elif isinstance(stats, list):
                 # Stats is a list
-                compute_rate_on_list(self, stats, self.stats_previous)
-
-            # Memorized the current stats for next run
-            self.stats_previous = copy.deepcopy(stats)
+                self._previous_gauges = compute_rate_on_list(self, stats, self._previous_gauges)
+            else:
+                self._previous_gauges = None
 
             return stats
 
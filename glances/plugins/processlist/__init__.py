@@ -17,7 +17,7 @@ from glances.logger import logger
 from glances.outputs.glances_unicode import unicode_message
 from glances.plugins.core import CorePlugin
 from glances.plugins.plugin.model import GlancesPluginModel
-from glances.processes import glances_processes, sort_stats
+from glances.processes import glances_processes
 
 # Fields description
 # description: human readable description
@@ -218,6 +218,19 @@ class ProcesslistPlugin(GlancesPluginModel):
                 'Configuration overwrites processes sort key by {}'.format(config.as_dict()['processlist']['sort_key'])
             )
             glances_processes.set_sort_key(config.as_dict()['processlist']['sort_key'], False)
+        if 'backend' in config.as_dict()['processlist']:
+            glances_processes.set_backend(
+                config.as_dict()['processlist']['backend'],
+                workers=int(config.as_dict()['processlist'].get('workers', 1)),
+            )
+            if config.as_dict()['processlist'].get('proc_connector', 'False').lower() == 'true':
+                glances_processes.enable_proc_connector()
+        if 'full_stats_top' in config.as_dict()['processlist']:
+            glances_processes.full_stats_top = int(config.as_dict()['processlist']['full_stats_top'])
+        if 'extended_refresh' in config.as_dict()['processlist']:
+            glances_processes.extended_stats_worker.refresh = float(config.as_dict()['processlist']['extended_refresh'])
+        if config.as_dict()['processlist'].get('background', 'False').lower() == 'true':
+            glances_processes.start_collector(float(self.get_refresh()))
         if 'export' in config.as_dict()['processlist']:
             glances_processes.export_process_filter = config.as_dict()['processlist']['export']
             if args and args.export:
@@ -235,6 +248,13 @@ class ProcesslistPlugin(GlancesPluginModel):
             )
             glances_processes.disable_stats = config.as_dict()['processlist']['disable_stats'].split(',')
 
+    def exit(self):
+        """Stop the processes background threads and scan workers (if any)."""
+        glances_processes.stop_collector()
+        glances_processes.close_backend()
+        glances_processes.extended_stats_worker.stop()
+        super().exit()
+
     def get_key(self):
         """Return the key of the list."""
         return 'pid'
@@ -263,6 +283,10 @@ class ProcesslistPlugin(GlancesPluginModel):
         """Return the sorted processes list for the API."""
         return glances_processes.get_list(sorted=True)
 
+    def get_api_top(self, nb):
+        """Return the top nb sorted processes for the API (partial selection)."""
+        return glances_processes.get_list(sorted=True, limit=nb)
+
     def get_export(self):
         """Return the processes list to export.
         Not all the processeses are exported.
@@ -562,10 +586,9 @@ class ProcesslistPlugin(GlancesPluginModel):
         if not self.stats or args.disable_process:
             return ret
 
-        # Sort the processes list
-        processes_list_sorted = sort_stats(
-            self.stats, glances_processes.sort_key, reverse=glances_processes.sort_reverse
-        )
+        # Sort the processes list (only the displayed ones)
+        # The ordering is the one computed by the processes update (same cursor position, see issue #3400)
+        processes_list_sorted = glances_processes.sort_list(self.stats, limit=glances_processes.max_processes)
 
         # Display extended stats for selected process
         #############################################
@@ -0,0 +1,142 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Selfmon plugin.
+
+Self-monitoring: cost of the Glances plugins and exporters."""
+
+from glances.perf import glances_perf
+from glances.plugins.plugin.model import GlancesPluginModel
+
+# Measured operations
+# - update, views and history for the plugins
+# - export for the exporters
+operations = ['update', 'views', 'history', 'export']
+# Others measured durations (not in the cost of a cycle)
+# - latency for the exporters (time between the end of the cycle and the end of its export)
+measures = operations + ['latency']
+
+# Fields description
+# description: human readable description
+# short_name: shortname to use un UI
+# unit: unit type
+# rate: is it a rate ? If yes, // by time_since_update when displayed,
+# min_symbol: Auto unit should be used if value > than 1 'X' (K, M, G)...
+fields_description = {
+    'name': {
+        'description': 'Plugin or exporter name.',
+    },
+    'category': {
+        'description': 'Category (plugin or export).',
+    },
+    'cache_hit_ratio': {
+        'description': 'Ratio of the updates served by the cache (plugin only).',
+        'unit': 'float',
+    },
+    'memory': {
+        'description': 'Memory used by the stats, views and history (plugin only).',
+        'unit': 'byte',
+    },
+    'queue_depth': {
+        'description': 'Number of cycles waiting to be exported (exporter only).',
+        'unit': 'number',
+    },
+    'dropped': {
+        'description': 'Number of cycles dropped because the export queue was full (exporter only).',
+        'unit': 'number',
+    },
+}
+for op in measures:
+    for summary, description in (('last', 'Last'), ('mean', 'Mean'), ('p99', '99th percentile of the')):
+        fields_description[f'{op}_{summary}'] = {
+            'description': f'{description} {op} duration.',
+            'unit': 'millisecond',
+        }
+
+
+class SelfmonPlugin(GlancesPluginModel):
+    """Glances self-monitoring plugin.
+
+    stats is a list of dict (one dict per plugin or exporter)
+    """
+
+    def __init__(self, args=None, config=None):
+        """Init the plugin."""
+        super().__init__(args=args, config=config, stats_init_value=[], fields_description=fields_description)
+
+        # We want to display the stat in the curse interface
+        self.display_curse = True
+
+    def get_key(self):
+        """Return the key of the list."""
+        return 'name'
+
+    @GlancesPluginModel._check_decorator
+    @GlancesPluginModel._log_result_decorator
+    def update(self):
+        """Update the self-monitoring stats."""
+        # Init new stats
+        stats = self.get_init_value()
+
+        if self.input_method == 'local':
+            for category, modules in glances_perf.get_stats().items():
+                for name, perf in modules.items():
+                    item = {
+                        'key': self.get_key(),
+                        'name': name,
+                        'category': category,
+                        'cache_hit_ratio': perf['cache_hit_ratio'],
+                        'memory': perf['memory'],
+                        'queue_depth': perf['queue']['queue_depth'] if perf['queue'] else None,
+                        'dropped': perf['queue']['dropped'] if perf['queue'] else None,
+                    }
+                    for op in measures:
+                        summary = perf['durations'].get(op, {})
+                        for s in ('last', 'mean', 'p99'):
+                            value = summary.get(s)
+                            item[f'{op}_{s}'] = round(value * 1000, 3) if value is not None else None
+                    stats.append(item)
+
+        # Update the stats
+        self.stats = stats
+
+        return self.stats
+
+    def get_cost(self, item):
+        """Return the mean duration (in ms) of a cycle for the given plugin or exporter."""
+        return sum(item[f'{op}_mean'] or 0 for op in operations)
+
+    def msg_curse(self, args=None, max_width=None):
+        """Return the dict to display in the curse interface."""
+        # Init the return message
+        ret = []
+
+        # Only process if stats exist and display plugin enable...
+        if not self.stats or self.is_disabled() or not max_width:
+            return ret
+
+        # Max size for the name
+        name_max_width = max_width - 14
+
+        # Build the string message
+        # Header
+        msg = '{:{width}}'.format('SELFMON', width=name_max_width)
+        ret.append(self.curse_add_line(msg, "TITLE"))
+        msg = '{:>7}{:>7}'.format('ms', 'p99')
+        ret.append(self.curse_add_line(msg))
+
+        # Top 5 plugins/exporters (by mean duration)
+        for i in sorted(self.stats, key=self.get_cost, reverse=True)[:5]:
+            ret.append(self.curse_new_line())
+            msg = '{:{width}}'.format(i['name'][:name_max_width], width=name_max_width)
+            ret.append(self.curse_add_line(msg))
+            p99 = i['export_p99'] if i['category'] == 'export' else i['update_p99']
+            msg = '{:>7.1f}{:>7}'.format(self.get_cost(i), '-' if p99 is None else f'{p99:.1f}')
+            ret.append(self.curse_add_line(msg))
+
+        return ret
@@ -0,0 +1,205 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Linux processes lifecycle events (kernel proc connector)."""
+
+import os
+import socket
+import struct
+import threading
+
+from glances.logger import logger
+
+# Netlink connector (see linux/connector.h and linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+
+# Events
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_COMM = 0x00000200
+PROC_EVENT_EXIT = 0x80000000
+
+# struct nlmsghdr: len, type, flags, seq, pid
+nlmsghdr = struct.Struct('=IHHII')
+# struct cn_msg: idx, val, seq, ack, len, flags
+cn_msg = struct.Struct('=IIIIHH')
+# struct proc_event header: what, cpu, timestamp_ns
+proc_event = struct.Struct('=IIQ')
+# Events data (only the first fields are used)
+proc_event_data = {
+    PROC_EVENT_FORK: struct.Struct('=iiii'),  # parent_pid, parent_tgid, child_pid, child_tgid
+    PROC_EVENT_EXEC: struct.Struct('=ii'),  # process_pid, process_tgid
+    PROC_EVENT_COMM: struct.Struct('=ii'),  # process_pid, process_tgid (followed by the comm)
+    PROC_EVENT_EXIT: struct.Struct('=ii'),  # process_pid, process_tgid (followed by the exit code...)
+}
+
+
+def pack_message(payload):
+    """Return a netlink connector message (bytes) with the given payload."""
+    msg = cn_msg.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+    return nlmsghdr.pack(nlmsghdr.size + len(msg), NLMSG_DONE, 0, 0, os.getpid()) + msg
+
+
+def pack_proc_event(what, *data):
+    """Return a netlink message (bytes) for the given proc event (used to inject synthetic events)."""
+    payload = proc_event.pack(what, 0, 0)
+    if what in proc_event_data:
+        payload += proc_event_data[what].pack(*data)
+    return pack_message(payload)
+
+
+class GlancesProcConnector:
+    """This class maintains the set of the running pids from the kernel proc connector events.
+
+    Instead of listing /proc on every update, the pids set is built once
+    and then updated with the fork and exit events (threads are ignored).
+    The exec (and comm) events mark the processes whose command line has
+    changed.
+
+    The listener needs the CAP_NET_ADMIN capability. If it is not
+    available (or if events are lost), the pids are listed from /proc.
+    """
+
+    def __init__(self, procfs_path='/proc'):
+        self.procfs_path = procfs_path
+        self._pids = set()
+        self._exec = set()
+        self._lock = threading.Lock()
+        # True if the pids set should be rebuilt from /proc (first time or events lost)
+        self._resync = True
+        # Events received while /proc is listed (replayed on the new pids set)
+        self._pending = None
+        self._socket = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        """Return True if the listener is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start listening to the proc connector events. Return False if not available."""
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+            sock.bind((0, CN_IDX_PROC))
+            sock.send(pack_message(struct.pack('=I', PROC_CN_MCAST_LISTEN)))
+            sock.settimeout(1)
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Can not listen to the proc connector events ({e}), processes are scanned")
+            return False
+        self._socket = sock
+        self._stop.clear()
+        self._resync = True
+        self._thread = threading.Thread(target=self._listen, name='glances-proc-connector', daemon=True)
+        self._thread.start()
+        logger.info("Processes lifecycle is tracked with the proc connector events")
+        return True
+
+    def stop(self):
+        """Stop listening to the proc connector events."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._socket.send(pack_message(struct.pack('=I', PROC_CN_MCAST_IGNORE)))
+        except OSError:
+            pass
+        self._socket.close()
+        self._socket = None
+
+    def _listen(self):
+        """Listener loop."""
+        while not self._stop.is_set():
+            try:
+                data = self._socket.recv(65536)
+            except TimeoutError:
+                continue
+            except OSError as e:
+                # ENOBUFS: events have been lost
+                logger.debug(f"Proc connector events lost ({e}), pids will be listed from /proc")
+                self._resync = True
+                continue
+            try:
+                self.handle_message(data)
+            except struct.error as e:
+                logger.debug(f"Can not parse the proc connector message ({e})")
+
+    def handle_message(self, data):
+        """Handle a netlink message (one or more proc events)."""
+        offset = 0
+        while offset + nlmsghdr.size <= len(data):
+            length = nlmsghdr.unpack_from(data, offset)[0]
+            if length < nlmsghdr.size:
+                break
+            start = offset + nlmsghdr.size + cn_msg.size
+            if start + proc_event.size <= offset + length:
+                what = proc_event.unpack_from(data, start)[0]
+                if what in proc_event_data:
+                    self.handle_event(what, *proc_event_data[what].unpack_from(data, start + proc_event.size))
+            # Messages are aligned on 4 bytes
+            offset += (length + 3) & ~3
+
+    def handle_event(self, what, *data):
+        """Update the pids set with the given proc event."""
+        with self._lock:
+            self._apply(self._pids, what, data)
+            if self._pending is not None:
+                self._pending.append((what, data))
+
+    def _apply(self, pids, what, data):
+        """Apply the proc event to the given pids set."""
+        if what == PROC_EVENT_FORK:
+            _, _, pid, tgid = data
+            if pid == tgid:
+                pids.add(pid)
+        elif what == PROC_EVENT_EXIT:
+            pid, tgid = data
+            if pid == tgid:
+                pids.discard(pid)
+                self._exec.discard(pid)
+        elif what in (PROC_EVENT_EXEC, PROC_EVENT_COMM):
+            self._exec.add(data[1])
+
+    def inject(self, what, *data):
+        """Inject a synthetic proc event (as if it was sent by the kernel)."""
+        self.handle_message(pack_proc_event(what, *data))
+
+    def get_pids(self):
+        """Return the list of the running pids."""
+        if self._resync:
+            # The events received while /proc is listed are replayed, so none is missed
+            self._resync = False
+            with self._lock:
+                self._pending = []
+            pids = {int(e) for e in os.listdir(self.procfs_path) if e.isdigit()}
+            with self._lock:
+                for what, data in self._pending:
+                    self._apply(pids, what, data)
+                self._pids = pids
+                self._pending = None
+        with self._lock:
+            return list(self._pids)
+
+    def discard(self, pid):
+        """Remove a pid which is not running (its exit event has been lost)."""
+        with self._lock:
+            self._pids.discard(pid)
+
+    def pop_exec(self):
+        """Return (and forget) the pids which have executed a new program since the last call."""
+        with self._lock:
+            ret, self._exec = self._exec, set()
+        return ret
@@ -6,22 +6,28 @@
 # SPDX-License-Identifier: LGPL-3.0-only
 #
 
+import heapq
 import os
+import re
+import threading
+import time
+from collections import namedtuple
 
 import psutil
 
-from glances.filter import GlancesFilter, GlancesFilterList
+from glances.filter import GlancesFilter, GlancesFilterEngine, GlancesFilterList
 from glances.globals import (
     BSD,
     LINUX,
     MACOS,
     WINDOWS,
     dictlist_first_key_value,
-    list_of_namedtuple_to_list_of_dict,
     namedtuple_to_dict,
 )
 from glances.logger import logger
-from glances.programs import processes_to_programs
+from glances.proc_connector import GlancesProcConnector
+from glances.procfs import GlancesProcfs
+from glances.programs import GlancesPrograms
 from glances.timer import Timer, getTimeSinceLastUpdate
 
 psutil_version_info = tuple([int(num) for num in psutil.__version__.split('.')])
@@ -33,6 +39,11 @@ mandatory_processes_stats_list = ['pid', 'name']
 sort_processes_stats_list = ['cpu_percent', 'memory_percent', 'username']
 sort_processes_stats_list += ['cpu_times', 'io_counters', 'name', 'cpu_num']
 
+# Available processes scan backends
+# - psutil: psutil.process_iter (default, all OS)
+# - procfs: direct /proc reading (Linux only, faster on hosts with a lot of processes)
+processes_backends = ['psutil', 'procfs']
+
 # Sort dictionary for human
 sort_for_human = {
     'io_counters': 'disk IO',
@@ -46,11 +57,164 @@ sort_for_human = {
 }
 
 
+class GlancesProcessRecord:
+    """A process in the processes table (see GlancesProcesses.update_table).
+
+    Only the data kept between two updates are stored:
+    - cached: the cached stats (see GlancesProcesses.get_cached_attrs)
+    - io_old: the IO counters of the previous update (to compute the IO rate)
+    """
+
+    __slots__ = ('pid', 'create_time', 'cached', 'io_old')
+
+    def __init__(self, pid, create_time):
+        self.pid = pid
+        self.create_time = create_time
+        self.cached = None
+        self.io_old = None
+
+
+# Result of a processes scan (published by the background collector, see GlancesProcesses.start_collector)
+# It should not be modified once published
+GlancesProcessesSnapshot = namedtuple(
+    'GlancesProcessesSnapshot',
+    ['processlist', 'processlist_export', 'processcount', 'max_values', 'nb_sorted', 'sorted_by', 'sort_reverse'],
+)
+
+
+class GlancesSortCache:
+    """Cache the ordering of a stats list (see sort_stats).
+
+    The ordered list is kept with the number of its first items which are
+    in order (all of them after a full sort or only the top N after a
+    partial selection). It is reused while the same list is sorted with
+    the same parameters.
+    """
+
+    def __init__(self):
+        self._stats = None
+        self._ordered = None
+        self._nb = 0
+        self._params = None
+
+    def set(self, stats, nb, sorted_by='cpu_percent', sorted_by_secondary='memory_percent', reverse=True):
+        """Set the stats list (already in order for its first nb items)."""
+        self._stats = self._ordered = stats
+        self._nb = len(stats) if nb is None else min(nb, len(stats))
+        self._params = (sorted_by, sorted_by_secondary, reverse)
+
+    def order(self, stats, sorted_by='cpu_percent', sorted_by_secondary='memory_percent', reverse=True, nb=None):
+        """Return all the stats with (at least) the first nb items in order (all the items if nb is None)."""
+        params = (sorted_by, sorted_by_secondary, reverse)
+        if (
+            (stats is self._stats or stats is self._ordered)
+            and params == self._params
+            and (self._nb == len(self._ordered) or (nb is not None and nb <= self._nb))
+        ):
+            return self._ordered
+        top = sort_stats(stats, sorted_by=sorted_by, sorted_by_secondary=sorted_by_secondary, reverse=reverse, limit=nb)
+        if len(top) == len(stats):
+            ordered = top
+        else:
+            # Others items are kept (in the original order) after the top ones
+            top_ids = {id(i) for i in top}
+            ordered = top + [i for i in stats if id(i) not in top_ids]
+        self._stats = stats
+        self._ordered = ordered
+        self._nb = len(top)
+        self._params = params
+        return ordered
+
+    def sort(self, stats, sorted_by='cpu_percent', sorted_by_secondary='memory_percent', reverse=True, limit=None):
+        """Return the stats sorted by sorted_by (only the first limit items if limit is set)."""
+        ordered = self.order(
+            stats, sorted_by=sorted_by, sorted_by_secondary=sorted_by_secondary, reverse=reverse, nb=limit
+        )
+        return ordered if limit is None else ordered[:limit]
+
+
+class GlancesExtendedStatsWorker:
+    """Grab the extended stats of the selected process in a background thread.
+
+    The stats are only grabbed for the last requested pid, every refresh seconds.
+    The get method never waits for the thread: it returns the last grabbed stats.
+    """
+
+    def __init__(self, grab, refresh=2):
+        """Init the worker.
+
+        :grab: function returning the extended stats (dict) of the given pid
+        :refresh: minimum time (in seconds) between two grabs
+        """
+        self._grab = grab
+        self.refresh = refresh
+        # Requested pid (None if no process is selected)
+        self._pid = None
+        # Last grabbed stats: (pid, stats) with stats = False if the process has gone
+        self._last = (None, None)
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def request(self, pid):
+        """Request the extended stats of the given pid (grabbed as soon as possible if it is a new one)."""
+        if pid != self._pid:
+            self._pid = pid
+            self._wakeup.set()
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='glances-extended-stats', daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        """Stop grabbing the extended stats (no process selected)."""
+        self._pid = None
+        self._last = (None, None)
+
+    def get(self, pid):
+        """Return the last extended stats of the given pid (None if not grabbed yet, False if gone)."""
+        last_pid, stats = self._last
+        return stats if last_pid == pid else None
+
+    def stop(self):
+        """Stop the thread."""
+        if self._thread is None:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """Worker loop."""
+        while not self._stopped:
+            pid = self._pid
+            if pid is not None:
+                try:
+                    stats = self._grab(pid)
+                except (psutil.NoSuchProcess, ValueError, AttributeError) as e:
+                    logger.error(f'Can not grab extended stats ({e})')
+                    stats = False
+                except Exception as e:
+                    # Unexpected error (ex: the process exits while its memory maps are read): retry later
+                    logger.error(f'Can not grab extended stats of the process {pid} ({e})')
+                    stats = self.get(pid)
+                if pid == self._pid:
+                    self._last = (pid, stats)
+            # Wait the refresh time (or a new request)
+            self._wakeup.wait(None if pid is None else self.refresh)
+            self._wakeup.clear()
+
+
 class GlancesProcesses:
     """Get processed stats using the psutil library."""
 
     def __init__(self, cache_timeout=60):
         """Init the class to collect stats about processes."""
+        # Lock of the scan state (processes table, cache timer, backend, filters and sort key)
+        # A scan (maybe done by the background collector) and a change of this state are not concurrent
+        self._scan_lock = threading.RLock()
+
         # Init the args, coming from the classes derived from GlancesMode
         # Should be set by the set_args method
         self.args = None
@@ -60,10 +224,10 @@ class GlancesProcesses:
         # First iteration, no cache
         self.cache_timer = Timer(0)
 
-        # Init the io_old dict used to compute the IO bitrate
-        # key = pid
-        # value = [ read_bytes_old, write_bytes_old ]
-        self.io_old = {}
+        # Processes table
+        # key = (pid, create_time) (a pid could be reused by a new process)
+        # value = GlancesProcessRecord (cached stats and previous IO counters)
+        self.processes_table = {}
 
         # Init stats
         self.auto_sort = None
@@ -74,9 +238,6 @@ class GlancesProcesses:
         self.processlist = []
         self.reset_processcount()
 
-        # Cache is a dict with key=pid and value = dict of cached value
-        self.processlist_cache = {}
-
         # List of processes to focus on
         self._filter_focus = GlancesFilterList()
 
@@ -92,6 +253,12 @@ class GlancesProcesses:
         # Extended stats for top process is enable by default
         self.disable_extended_tag = False
         self.extended_process = None
+        # The extended stats are grabbed in background (the update never waits for them)
+        self.extended_stats_worker = GlancesExtendedStatsWorker(self.grab_extended_stats)
+
+        # Processes scan backend (see processes_backends)
+        self.backend = 'psutil'
+        self._procfs = None
 
         # Tests (and disable if not available) optionals features
         self._test_grab()
@@ -99,9 +266,35 @@ class GlancesProcesses:
         # Maximum number of processes showed in the UI (None if no limit)
         self._max_processes = None
 
+        # Number of processes (top of the sorted list) with the full stats (None if no limit)
+        # Others processes only have the stats needed to sort and filter (see get_details_attrs)
+        self._full_stats_top = None
+
+        # Processes always with the full stats (list of compiled regex, see AMPs)
+        self._watched_re = []
+
+        # psutil.Process objects of the last scan (psutil backend), key = pid
+        self._psutil_processes = {}
+
+        # Ordering of the processes list (only the top processes are in order when possible)
+        self.sort_cache = GlancesSortCache()
+
+        # Programs list, updated from the processes list changes (see get_list)
+        self.programs = GlancesPrograms()
+        self.programs_sort_cache = GlancesSortCache()
+
+        # Background collector (None if the processes are scanned in the update method)
+        self._collector = None
+        self._collector_stop = threading.Event()
+        # Last snapshot published by the background collector
+        self._snapshot = None
+
         # Process filter
         self._filter = GlancesFilter()
 
+        # All the filters (display, focus, export and watched) are applied in a single pass
+        self._filter_engine = GlancesFilterEngine()
+
         # Whether or not to hide kernel threads
         self.no_kernel_threads = False
 
@@ -150,6 +343,51 @@ class GlancesProcesses:
             logger.debug('PsUtil can grab process cpu_num')
             self.disable_cpu_num = False
 
+    def set_backend(self, backend, workers=1):
+        """Set the processes scan backend (psutil or procfs).
+
+        :workers: number of worker processes for the procfs scan (the pids are split in shards)
+        """
+        if backend not in processes_backends:
+            logger.warning(f"Unknown processes backend {backend} (available: {processes_backends}), use psutil")
+            backend = 'psutil'
+        if backend == 'procfs':
+            if not LINUX or not os.path.isdir('/proc'):
+                logger.warning("The procfs processes backend is only available on Linux, use psutil")
+                backend = 'psutil'
+        with self._scan_lock:
+            self.close_backend()
+            self._procfs = GlancesProcfs(workers=workers) if backend == 'procfs' else None
+            self._psutil_processes = {}
+            self.backend = backend
+        logger.debug(f"Processes scan backend is {backend}")
+
+    def close_backend(self):
+        """Stop the procfs scan workers and the proc connector listener (if any)."""
+        with self._scan_lock:
+            if self._procfs is not None:
+                self._procfs.close()
+                if self._procfs.proc_connector is not None:
+                    self._procfs.proc_connector.stop()
+                    self._procfs.proc_connector = None
+
+    def enable_proc_connector(self, proc_connector=None):
+        """Track the running processes with the kernel proc connector events (procfs backend only).
+
+        Instead of listing /proc on every update, the pids are updated with the fork and exit events.
+        Return False (processes are scanned) if the proc connector is not available.
+        """
+        if self._procfs is None:
+            logger.warning("The proc connector is only available with the procfs processes backend")
+            return False
+        if proc_connector is None:
+            proc_connector = GlancesProcConnector(procfs_path=self._procfs.procfs_path)
+            if not proc_connector.start():
+                return False
+        with self._scan_lock:
+            self._procfs.proc_connector = proc_connector
+        return True
+
     def set_args(self, args):
         """Set args."""
         self.args = args
@@ -160,8 +398,10 @@ class GlancesProcesses:
 
     def reset_internal_cache(self):
         """Reset the internal cache."""
-        self.cache_timer = Timer(0)
-        self.processlist_cache = {}
+        with self._scan_lock:
+            self.cache_timer = Timer(0)
+            for record in self.processes_table.values():
+                record.cached = None
         if hasattr(psutil.process_iter, 'cache_clear'):
             # Cache clear only available in PsUtil 6 or higher
             psutil.process_iter.cache_clear()
@@ -172,19 +412,25 @@ class GlancesProcesses:
 
     def update_processcount(self, plist):
         """Update the global process count from the current processes list"""
+        self.processcount = self.get_processcount(plist)
+
+    def get_processcount(self, plist):
+        """Return the process count (dict) of the given processes list"""
+        processcount = dict.fromkeys(self.processcount)
         # Update the maximum process ID (pid) number
-        self.processcount['pid_max'] = self.pid_max
+        processcount['pid_max'] = self.pid_max
         # For each key in the processcount dict
         # count the number of processes with the same status
-        for k in list(self.processcount.keys()):
-            self.processcount[k] = len(list(filter(lambda v: v.get('status', '?') is k, plist)))
+        for k in list(processcount.keys()):
+            processcount[k] = len(list(filter(lambda v: v.get('status', '?') is k, plist)))
         # Compute thread
         try:
-            self.processcount['thread'] = sum(i['num_threads'] for i in plist if i['num_threads'] is not None)
+            processcount['thread'] = sum(i['num_threads'] for i in plist if i['num_threads'] is not None)
         except KeyError:
-            self.processcount['thread'] = None
+            processcount['thread'] = None
         # Compute total
-        self.processcount['total'] = len(plist)
+        processcount['total'] = len(plist)
+        return processcount
 
     def enable(self):
         """Enable process stats."""
@@ -252,6 +498,53 @@ class GlancesProcesses:
         """Set the maximum number of processes showed in the UI."""
         self._max_processes = value
 
+    @property
+    def full_stats_top(self):
+        """Get the number of processes with the full stats (None if all processes)."""
+        return self._full_stats_top
+
+    @full_stats_top.setter
+    def full_stats_top(self, value):
+        """Set the number of processes with the full stats (None if all processes)."""
+        with self._scan_lock:
+            self._full_stats_top = value
+
+    def set_watched_regex(self, regex_list):
+        """Set the regular expressions (name or cmdline) of the processes always with the full stats."""
+        watched_re = []
+        for r in regex_list:
+            try:
+                watched_re.append(re.compile(r))
+            except re.error as e:
+                logger.warning(f"Can not compile the watched process regex {r} ({e})")
+        with self._scan_lock:
+            self._watched_re = watched_re
+
+    def get_filters(self):
+        """Return the active filters (list of (name, key, source, match)) for the filter engine."""
+        ret = []
+        if self._filter.filter is not None:
+            ret.append(('display', self._filter.filter_key, self._filter.filter_input, self._filter.is_filtered))
+        for f in self._filter_focus.filter:
+            ret.append(('focus', f.filter_key, f.filter_input, f.is_filtered))
+        for f in self._filter_export.filter:
+            ret.append(('export', f.filter_key, f.filter_input, f.is_filtered))
+        if self._watched_re:
+            ret.append(('watched', None, tuple(r.pattern for r in self._watched_re), self.is_watched))
+        return ret
+
+    def match_filters(self, processlist):
+        """Return a dict with, for each active filter (display, focus, export, watched), the matching pids."""
+        self._filter_engine.set_filters(self.get_filters())
+        return self._filter_engine.match(processlist)
+
+    def is_watched(self, proc):
+        """Return True if the process matches one of the watched regex."""
+        for r in self._watched_re:
+            if r.search(proc['name'] or '') or ((cmdline := proc.get('cmdline')) and r.search(' '.join(cmdline))):
+                return True
+        return False
+
     @property
     def disable_stats(self):
         """Set disable_stats list"""
@@ -260,7 +553,8 @@ class GlancesProcesses:
     @disable_stats.setter
     def disable_stats(self, stats_list):
         """Set disable_stats list"""
-        self._disable_stats = [i for i in stats_list if i not in mandatory_processes_stats_list]
+        with self._scan_lock:
+            self._disable_stats = [i for i in stats_list if i not in mandatory_processes_stats_list]
 
     @property
     def process_filter_input(self):
@@ -275,7 +569,8 @@ class GlancesProcesses:
     @process_filter.setter
     def process_filter(self, value):
         """Set the process filter."""
-        self._filter.filter = value
+        with self._scan_lock:
+            self._filter.filter = value
 
     @property
     def process_filter_key(self):
@@ -298,7 +593,8 @@ class GlancesProcesses:
     @process_focus.setter
     def process_focus(self, value):
         """Set the focus process filter list."""
-        self._filter_focus.filter = value
+        with self._scan_lock:
+            self._filter_focus.filter = value
 
     # Export filter
     # List of Glances filter
@@ -311,13 +607,15 @@ class GlancesProcesses:
     @export_process_filter.setter
     def export_process_filter(self, value):
         """Set the export process filter list."""
-        self._filter_export.filter = value
+        with self._scan_lock:
+            self._filter_export.filter = value
 
     # Kernel threads
 
     def disable_kernel_threads(self):
         """Ignore kernel threads in process list."""
-        self.no_kernel_threads = True
+        with self._scan_lock:
+            self.no_kernel_threads = True
 
     @property
     def sort_reverse(self):
@@ -343,7 +641,31 @@ class GlancesProcesses:
             self._max_values[k] = 0.0
 
     def set_extended_stats(self, proc):
-        """Set the extended stats for the given PID."""
+        """Set the extended stats for the given PID.
+
+        The extended stats are grabbed by the extended stats worker: the
+        last grabbed ones are used (none for the first update after the
+        selection).
+        """
+        ret = {}
+        self.extended_stats_worker.request(proc['pid'])
+        stats = self.extended_stats_worker.get(proc['pid'])
+        if stats is False:
+            # Process has gone
+            self.extended_process = None
+            ret['extended_stats'] = False
+        else:
+            if stats:
+                ret.update(stats)
+            # Compute CPU and MEM min/max/mean
+            # Merge the returned dict with the current on
+            ret.update(self.__get_min_max_mean(proc))
+            self.extended_process = ret
+            ret['extended_stats'] = True
+        return namedtuple_to_dict(ret)
+
+    def grab_extended_stats(self, pid):
+        """Grab the extended stats for the given PID (called by the extended stats worker)."""
         # - cpu_affinity (Linux, Windows, FreeBSD)
         # - ionice (Linux and Windows > Vista)
         # - num_ctx_switches (not available on Illumos/Solaris)
@@ -352,7 +674,6 @@ class GlancesProcesses:
         # - memory_maps (only swap, Linux)
         #   https://www.cyberciti.biz/faq/linux-which-process-is-using-swap/
         # - connections (TCP and UDP)
-        # - CPU min/max/mean
 
         # Set the extended stats list (OS dependent)
         extended_stats = ['cpu_affinity', 'ionice', 'num_ctx_switches']
@@ -362,32 +683,21 @@ class GlancesProcesses:
         if WINDOWS:
             extended_stats += ['num_handles']
 
-        ret = {}
-        try:
-            logger.debug('Grab extended stats for process {}'.format(proc['pid']))
+        logger.debug(f'Grab extended stats for process {pid}')
 
-            # Get PID of the selected process
-            selected_process = psutil.Process(proc['pid'])
+        # Get PID of the selected process
+        selected_process = psutil.Process(pid)
 
-            # Get the extended stats for the selected process
-            ret = selected_process.as_dict(attrs=extended_stats, ad_value=None)
+        # Get the extended stats for the selected process
+        ret = selected_process.as_dict(attrs=extended_stats, ad_value=None)
 
-            # Get memory swap for the selected process (Linux Only)
-            ret['memory_swap'] = self.__get_extended_memory_swap(selected_process)
+        # Get memory swap for the selected process (Linux Only)
+        ret['memory_swap'] = self.__get_extended_memory_swap(selected_process)
 
-            # Get number of TCP and UDP network connections for the selected process
-            ret['tcp'], ret['udp'] = self.__get_extended_connections(selected_process)
-        except (psutil.NoSuchProcess, ValueError, AttributeError) as e:
-            logger.error(f'Can not grab extended stats ({e})')
-            self.extended_process = None
-            ret['extended_stats'] = False
-        else:
-            # Compute CPU and MEM min/max/mean
-            # Merge the returned dict with the current on
-            ret.update(self.__get_min_max_mean(proc))
-            self.extended_process = ret
-            ret['extended_stats'] = True
-        return namedtuple_to_dict(ret)
+        # Get number of TCP and UDP network connections for the selected process
+        ret['tcp'], ret['udp'] = self.__get_extended_connections(selected_process)
+
+        return ret
 
     def get_extended_stats(self):
         """Return the extended stats.
@@ -474,6 +784,14 @@ class GlancesProcesses:
         )
 
     def build_process_list(self, sorted_attrs):
+        if self._procfs is not None:
+            # Direct /proc reading (procfs backend)
+            return [
+                p
+                for p in self._procfs.scan(sorted_attrs)
+                if not (self.no_kernel_threads and p.get('gids') and p['gids']['real'] == 0)
+            ]
+
         # Build the processes stats list (it is why we need psutil>=5.3.0) (see issue #2755)
         processlist = list(
             filter(
@@ -490,10 +808,13 @@ class GlancesProcesses:
         # Only get the info key
         # PsUtil 6+ no longer check PID reused #2755 so use is_running in the loop
         # Note: not sure it is realy needed but CPU consumption look the same with or without it
-        return [p.info for p in processlist if p.is_running()]
+        processlist = [p for p in processlist if p.is_running()]
+        # Keep the psutil.Process objects to grab the full stats of the top processes
+        self._psutil_processes = {p.pid: p for p in processlist}
+        return [p.info for p in processlist]
 
     def get_sorted_attrs(self):
-        defaults = ['cpu_percent', 'cpu_times', 'memory_percent', 'name', 'status', 'num_threads']
+        defaults = ['cpu_percent', 'cpu_times', 'memory_percent', 'name', 'status', 'num_threads', 'create_time']
         optional = ['io_counters'] if not self.disable_io_counters else []
 
         return defaults + optional
@@ -511,10 +832,31 @@ class GlancesProcesses:
     def get_cached_attrs(self):
         return ['cmdline', 'username']
 
+    def get_details_attrs(self):
+        """Return the list of stats only grabbed for the top processes (empty list if all processes are grabbed).
+
+        The sort key and the filters keys are always grabbed for all the processes.
+        All the stats are grabbed if the programs list is displayed or if the programlist plugin is enabled.
+        """
+        if self.full_stats_top is None or (
+            self.args is not None
+            and (getattr(self.args, 'programs', False) or not getattr(self.args, 'disable_programlist', True))
+        ):
+            # Programs are the aggregation of all the processes
+            return []
+        ret = [i for i in self.get_displayed_attr() if i != 'pid']
+        if not self.disable_io_counters:
+            ret.append('io_counters')
+        keys = [self.sort_key]
+        for f in [self._filter] + self._filter_focus.filter + self._filter_export.filter:
+            keys.append(f.filter_key)
+        if self.no_kernel_threads:
+            keys.append('gids')
+        return [i for i in ret if i not in keys]
+
     def maybe_add_cached_attrs(self, sorted_attrs, cached_attrs):
         # Some stats are not sort key
-        # An optimisation can be done be only grabbed displayed_attr
-        # for displayed processes (but only in standalone mode...)
+        # They are only grabbed for the top processes if full_stats_top is set (see get_details_attrs)
         sorted_attrs.extend(self.get_displayed_attr())
         # Some stats are cached (not necessary to be refreshed every time)
         if self.cache_timer.finished():
@@ -527,19 +869,13 @@ class GlancesProcesses:
 
         return is_cached, sorted_attrs
 
-    def get_pid_time_and_status(self, time_since_update, proc):
-        # PID is the key
-        proc['key'] = 'pid'
-
-        # Time since last update (for disk_io rate computation)
-        proc['time_since_update'] = time_since_update
-
+    def get_status(self, proc):
         # Process status (only keep the first char)
         proc['status'] = str(proc.get('status', '?'))[:1].upper()
 
         return proc
 
-    def get_io_counters(self, proc):
+    def get_io_counters(self, proc, record):
         # procstat['io_counters'] is a list:
         # [read_bytes, write_bytes, read_bytes_old, write_bytes_old, io_tag]
         # If io_tag = 0 > Access denied or first time (display "?")
@@ -548,48 +884,144 @@ class GlancesProcesses:
             io_new = [proc['io_counters'][2], proc['io_counters'][3]]
             # For IO rate computation
             # Append saved IO r/w bytes
-            try:
-                proc['io_counters'] = io_new + self.io_old[proc['pid']]
+            if record.io_old is not None:
+                proc['io_counters'] = io_new + record.io_old
                 io_tag = 1
-            except KeyError:
+            else:
                 proc['io_counters'] = io_new + [0, 0]
                 io_tag = 0
             # then save the IO r/w bytes
-            self.io_old[proc['pid']] = io_new
+            record.io_old = io_new
         else:
             proc['io_counters'] = [0, 0] + [0, 0]
             io_tag = 0
+            # No previous IO counters for the next update
+            record.io_old = None
         # Append the IO tag (for display)
         proc['io_counters'] += [io_tag]
 
         return proc
 
-    def maybe_add_cached_stats(self, is_cached, cached_attrs, proc):
+    def get_cached_stats(self, pid, cached_attrs):
+        """Grab the cached stats for the given pid (None if the process has gone)."""
+        if self._procfs is not None:
+            ret = self._procfs.scan(cached_attrs, pids=[pid])
+            if not ret:
+                return None
+            ret[0].pop('pid', None)
+            return ret[0]
+        try:
+            return psutil.Process(pid=pid).as_dict(attrs=cached_attrs, ad_value=None)
+        except psutil.NoSuchProcess:
+            return None
+
+    def maybe_add_cached_stats(self, is_cached, cached_attrs, proc, record):
         if is_cached:
             # Grab cached values (in case of a new incoming process)
-            if proc['pid'] not in self.processlist_cache:
-                try:
-                    self.processlist_cache[proc['pid']] = psutil.Process(pid=proc['pid']).as_dict(
-                        attrs=cached_attrs, ad_value=None
-                    )
-                except psutil.NoSuchProcess:
-                    pass
+            if record.cached is None:
+                record.cached = self.get_cached_stats(proc['pid'], cached_attrs)
             # Add cached value to current stat
-            try:
-                proc.update(self.processlist_cache[proc['pid']])
-            except KeyError:
-                pass
+            if record.cached:
+                proc.update(record.cached)
         else:
             # Save values to cache
-            try:
-                self.processlist_cache[proc['pid']] = {cached: proc[cached] for cached in cached_attrs}
-            except KeyError:
-                pass
+            record.cached = {cached: proc[cached] for cached in cached_attrs if cached in proc}
 
         return proc
 
+    def update_table(self, processlist, time_since_update, is_cached, cached_attrs, details_attrs=()):
+        """Update the processes table with the current processes list.
+
+        - running processes: the IO counters and the cached stats are taken from their record
+        - new processes: a record is added to the table
+        - dead processes (not in the current list): their record is removed from the table
+
+        Return the processes list (list of dict) with the metadata, IO counters and cached stats.
+        """
+        table = {}
+        ret = []
+        # Processes which have executed a new program (their cached stats are outdated)
+        if self._procfs is not None and self._procfs.proc_connector is not None:
+            exec_pids = self._procfs.proc_connector.pop_exec()
+        else:
+            exec_pids = ()
+        for proc in processlist:
+            key = (proc['pid'], proc.get('create_time'))
+            record = self.processes_table.get(key)
+            if record is None:
+                record = GlancesProcessRecord(*key)
+            elif proc['pid'] in exec_pids:
+                record.cached = None
+            table[key] = record
+
+            # Meta data
+            ###########
+            # PID is the key
+            proc['key'] = 'pid'
+            # Time since last update (for disk_io rate computation)
+            proc['time_since_update'] = time_since_update
+
+            # Process IO (if not only grabbed for the top processes)
+            if 'io_counters' not in details_attrs:
+                proc = self.get_io_counters(proc, record)
+
+            # Manage cached information
+            proc = self.maybe_add_cached_stats(is_cached, cached_attrs, proc, record)
+
+            # PsUtil stats are namedtuples
+            ret.append(proc if self._procfs is not None else namedtuple_to_dict(proc))
+
+        # Records of the non running processes are removed (avoid issue #2976)
+        self.processes_table = table
+
+        return ret
+
+    def get_details_stats(self, pids, details_attrs):
+        """Grab the details stats for the given pids (dict with pid as key)."""
+        if self._procfs is not None:
+            return {p.pop('pid'): p for p in self._procfs.scan(details_attrs, pids=pids)}
+        ret = {}
+        for pid in pids:
+            try:
+                ret[pid] = self._psutil_processes[pid].as_dict(attrs=details_attrs, ad_value=None)
+            except (KeyError, psutil.NoSuchProcess):
+                continue
+        return ret
+
+    def add_details_stats(self, processlist, details_attrs, matched=None):
+        """Add the details stats (second tier) to the sorted processes list.
+
+        Details are only grabbed for:
+        - the top full_stats_top processes (after the filters)
+        - the processes matching the export filter
+        - the watched processes (AMPs) and the selected one (extended stats)
+        The others get None values.
+        """
+        if matched is None:
+            matched = self.match_filters(processlist)
+        pids = {p['pid'] for p in self.update_list(processlist, matched)[: self.full_stats_top]}
+        pids |= matched.get('export', set()) | matched.get('watched', set())
+        if self.extended_process is not None:
+            pids.add(self.extended_process['pid'])
+        details = self.get_details_stats(sorted(pids), details_attrs) if pids else {}
+
+        for proc in processlist:
+            stats = details.get(proc['pid'], {})
+            if 'io_counters' in details_attrs:
+                proc['io_counters'] = stats.pop('io_counters', None)
+                proc = self.get_io_counters(proc, self.processes_table[(proc['pid'], proc.get('create_time'))])
+            for attr in details_attrs:
+                proc.setdefault(attr, None)
+            proc.update(stats if self._procfs is not None else namedtuple_to_dict(stats))
+
+        return processlist
+
     def update(self):
-        """Update the processes stats."""
+        """Update the processes stats.
+
+        The processes are scanned in this method or, if it is running, by the
+        background collector (the last published snapshot is used).
+        """
         # Init new processes stats
         processlist = []
 
@@ -597,6 +1029,27 @@ class GlancesProcesses:
         if self.disable_tag:
             return processlist
 
+        if self._collector is not None:
+            snapshot = self._snapshot
+        else:
+            snapshot = self.scan(self.sort_cache)
+
+        return self.set_snapshot(snapshot)
+
+    def scan(self, sort_cache):
+        """Scan the processes and return a GlancesProcessesSnapshot.
+
+        The scan updates its own state (processes table, cache timer, backend CPU times
+        and disk IO timer) but not the current stats: the snapshot is published by set_snapshot.
+        The scan could be done by the background collector, so it holds the scan lock:
+        a reset of the cache, a change of the backend, of the filters or of the sort key
+        waits for the end of the running scan.
+        """
+        with self._scan_lock:
+            return self._scan(sort_cache)
+
+    def _scan(self, sort_cache):
+        """Scan the processes (the scan lock is held)."""
         # Time since last update (for disk_io rate computation)
         time_since_update = getTimeSinceLastUpdate('process_disk')
 
@@ -613,104 +1066,203 @@ class GlancesProcesses:
         # Remove attributes set by the user in the config file (see #1524)
         sorted_attrs = [i for i in sorted_attrs if i not in self.disable_stats]
 
+        # Some stats are only grabbed for the top processes (second tier)
+        details_attrs = [i for i in self.get_details_attrs() if i in sorted_attrs]
+        sorted_attrs = [i for i in sorted_attrs if i not in details_attrs]
+
         # Build the process list
         processlist = self.build_process_list(sorted_attrs)
 
+        # Update the processes table (and add the metadata, IO counters and cached stats)
+        processlist = self.update_table(processlist, time_since_update, is_cached, cached_attrs, details_attrs)
+
         # Sort the processes list by the current sort_key
         # This is needed so that cursor_position matches the displayed order (see issue #3400)
-        processlist = sort_stats(processlist, sorted_by=self.sort_key, reverse=self.sort_reverse)
-
-        # Update the processcount
-        self.update_processcount(processlist)
+        # Only the top processes are sorted (partial selection) if no filter is set
+        nb_sorted = self.get_nb_sorted()
+        sorted_by, sort_reverse = self.sort_key, self.sort_reverse
+        processlist = sort_cache.order(processlist, sorted_by=sorted_by, reverse=sort_reverse, nb=nb_sorted)
 
-        # Loop over processes and :
-        # - add extended stats for selected process
-        # - add metadata
-        for position, proc in enumerate(processlist):
-            # Extended stats
-            ################
+        # Compute the processcount
+        processcount = self.get_processcount(processlist)
 
-            # Get the selected process when the 'e' key is pressed
-            if self.is_selected_extended_process(position):
-                self.extended_process = proc
+        # Apply all the filters (in a single pass)
+        matched = self.match_filters(processlist)
 
-            # Grab extended stats only for the selected process (see issue #2225)
-            if self.extended_process is not None and proc['pid'] == self.extended_process['pid']:
-                proc.update(self.set_extended_stats(self.extended_process))
-                self.extended_process = namedtuple_to_dict(proc)
+        # Grab the details stats for the top processes
+        if details_attrs:
+            processlist = self.add_details_stats(processlist, details_attrs, matched)
 
-            # Meta data
-            ###########
-            proc = self.get_pid_time_and_status(time_since_update, proc)
-
-            # Process IO
-            proc = self.get_io_counters(proc)
-
-            # Manage cached information
-            proc = self.maybe_add_cached_stats(is_cached, cached_attrs, proc)
-
-        # Remove non running process from the cache (avoid issue #2976)
-        self.remove_non_running_procs(processlist)
+        # Process status
+        for proc in processlist:
+            self.get_status(proc)
 
         # Filter and transform process export list
-        self.processlist_export = self.update_export_list(processlist)
+        processlist_export = self.update_export_list(processlist, matched)
 
         # Filter and transform process list
-        processlist = self.update_list(processlist)
+        processlist = self.update_list(processlist, matched)
 
         # Compute the maximum value for keys in self._max_values_list: CPU, MEM
         # Useful to highlight the processes with maximum values
-        self.compute_max_value(processlist)
+        max_values = self.compute_max_value(processlist)
+
+        return GlancesProcessesSnapshot(
+            processlist, processlist_export, processcount, max_values, nb_sorted, sorted_by, sort_reverse
+        )
+
+    def set_snapshot(self, snapshot):
+        """Set the current processes stats from the given snapshot.
+
+        The cursor selection and the extended stats are applied here
+        (the snapshot itself is not modified).
+        """
+        if snapshot is None:
+            # No scan done yet
+            return self.processlist
+
+        processlist = snapshot.processlist
+        processlist_export = snapshot.processlist_export
+
+        # Get the selected process when the 'e' key is pressed
+        position = getattr(self.args, 'cursor_position', None)
+        if position is not None and position < len(processlist) and self.is_selected_extended_process(position):
+            self.extended_process = processlist[position]
+
+        # Grab extended stats only for the selected process (see issue #2225)
+        if self.extended_process is None:
+            self.extended_stats_worker.cancel()
+        else:
+            pid = self.extended_process['pid']
+            selected = next((p for p in processlist if p['pid'] == pid), None)
+            if selected is not None:
+                selected = dict(selected)
+                selected.update(self.set_extended_stats(selected))
+                self.extended_process = selected if selected['extended_stats'] else None
+                processlist = [selected if p['pid'] == pid else p for p in processlist]
+                processlist_export = [selected if p['pid'] == pid else p for p in processlist_export]
 
         # Update the stats
+        self.processcount = snapshot.processcount
+        for k, v in snapshot.max_values.items():
+            self.set_max_values(k, v)
+        self.processlist_export = processlist_export
         self.processlist = processlist
+        self.sort_cache.set(
+            processlist, snapshot.nb_sorted, sorted_by=snapshot.sorted_by, reverse=snapshot.sort_reverse
+        )
 
         return self.processlist
 
+    def start_collector(self, refresh):
+        """Scan the processes in a background thread every refresh seconds.
+
+        The update method then only uses the last published snapshot (it does not wait for a scan).
+        """
+        if self._collector is not None:
+            return
+        sort_cache = GlancesSortCache()
+        # First scan (so a snapshot is available for the first update)
+        self._snapshot = self.scan(sort_cache)
+        self._collector_stop.clear()
+        self._collector = threading.Thread(
+            target=self._collect, args=(refresh, sort_cache), name='glances-processes', daemon=True
+        )
+        self._collector.start()
+        logger.info(f"Processes are scanned in background every {refresh} seconds")
+
+    def stop_collector(self):
+        """Stop the background collector (the processes are then scanned in the update method)."""
+        if self._collector is None:
+            return
+        self._collector_stop.set()
+        self._collector.join()
+        self._collector = None
+        self._snapshot = None
+
+    def _collect(self, refresh, sort_cache):
+        """Background collector loop."""
+        while not self._collector_stop.wait(refresh):
+            if self.disable_tag:
+                continue
+            start = time.perf_counter()
+            try:
+                self._snapshot = self.scan(sort_cache)
+            except Exception as e:
+                logger.error(f"Can not scan the processes ({e})")
+            logger.debug(f"Processes scanned in background in {time.perf_counter() - start:.3f} seconds")
+
+    def get_nb_sorted(self):
+        """Return the number of processes (top of the list) to sort or None to sort all the processes.
+
+        Only the displayed processes (and the ones with the full stats) need to be sorted.
+        All the processes are sorted if a filter is set (the displayed processes are filtered after the sort).
+        """
+        if (
+            self.max_processes is None
+            or (self._filter_focus.filter is not None and self._filter_focus.filter != [])
+            or self._filter.filter is not None
+        ):
+            return None
+        return max(self.max_processes, self.full_stats_top or 0)
+
     def compute_max_value(self, processlist):
+        """Return the maximum values (dict) of the given processes list."""
+        ret = {}
         for k in [i for i in self._max_values_list if i not in self.disable_stats]:
             values_list = [i[k] for i in processlist if i[k] is not None]
             if values_list:
-                self.set_max_values(k, max(values_list))
-
-    def remove_non_running_procs(self, processlist):
-        pids_running = [p['pid'] for p in processlist]
-        pids_cached = list(self.processlist_cache.keys()).copy()
-        for pid in pids_cached:
-            if pid not in pids_running:
-                self.processlist_cache.pop(pid, None)
-
-    def update_list(self, processlist):
-        """Return the process list after filtering and transformation (namedtuple to dict)."""
-        if self._filter_focus.filter is not None and self._filter_focus.filter != []:
-            ret = list(filter(lambda p: self._filter_focus.is_filtered(p), processlist))
-            return list_of_namedtuple_to_list_of_dict(ret)
-        if self._filter.filter is None:
-            return list_of_namedtuple_to_list_of_dict(processlist)
-        ret = list(filter(lambda p: self._filter.is_filtered(p), processlist))
-        return list_of_namedtuple_to_list_of_dict(ret)
-
-    def update_export_list(self, processlist):
-        """Return the process export list after filtering and transformation (namedtuple to dict)."""
+                ret[k] = max(values_list)
+        return ret
+
+    def update_list(self, processlist, matched=None):
+        """Return the process list after filtering (stats are already converted to dict, see update_table).
+
+        matched is the result of match_filters (computed if not given).
+        """
+        if self._filter_focus.filter == [] and self._filter.filter is None:
+            return processlist
+        if matched is None:
+            matched = self.match_filters(processlist)
+        pids = matched.get('focus' if self._filter_focus.filter != [] else 'display', set())
+        return [p for p in processlist if p['pid'] in pids]
+
+    def update_export_list(self, processlist, matched=None):
+        """Return the process export list after filtering (stats are already converted to dict)."""
         if self._filter_export.filter == []:
             return []
-        ret = list(filter(lambda p: self._filter_export.is_filtered(p), processlist))
-        return list_of_namedtuple_to_list_of_dict(ret)
+        if matched is None:
+            matched = self.match_filters(processlist)
+        return [p for p in processlist if p['pid'] in matched.get('export', set())]
 
     def get_count(self):
         """Get the number of processes."""
         return self.processcount
 
-    def get_list(self, sorted=False, as_programs=False):
+    def get_list(self, sorted=False, as_programs=False, limit=None):
         """Get the processlist (sorted or not).
         By default, return the list of threads.
-        If as_programs is True, return the list of programs."""
-        if sorted:
-            self.processlist = sort_stats(self.processlist, sorted_by=self.sort_key, reverse=self.sort_reverse)
+        If as_programs is True, return the list of programs (sorted by the programs stats).
+        If limit is set (and sorted is True), only return the top limit processes (or programs)."""
         if as_programs:
-            return processes_to_programs(self.processlist)
+            programlist = self.programs.update(self.processlist)
+            if sorted:
+                return self.programs_sort_cache.sort(
+                    programlist, sorted_by=self.sort_key, reverse=self.sort_reverse, limit=limit
+                )
+            return programlist
+        if sorted:
+            return self.sort_list(self.processlist, limit=limit)
         return self.processlist
 
+    def sort_list(self, processlist, limit=None):
+        """Return the given processes list sorted by the current sort key (only the top limit if set).
+
+        The ordering is cached: the list built by the last update is already in order.
+        """
+        sort_cache = self.programs_sort_cache if processlist is self.programs.programlist else self.sort_cache
+        return sort_cache.sort(processlist, sorted_by=self.sort_key, reverse=self.sort_reverse, limit=limit)
+
     def get_export(self):
         """Return the processlist for export."""
         return self.processlist_export
@@ -726,12 +1278,13 @@ class GlancesProcesses:
 
     def set_sort_key(self, key, auto=True):
         """Set the current sort key."""
-        if key == 'auto':
-            self.auto_sort = True
-            self._sort_key = 'cpu_percent'
-        else:
-            self.auto_sort = auto
-            self._sort_key = key
+        with self._scan_lock:
+            if key == 'auto':
+                self.auto_sort = True
+                self._sort_key = 'cpu_percent'
+            else:
+                self.auto_sort = auto
+                self._sort_key = key
 
     def nice_decrease(self, pid):
         """Decrease nice level
@@ -797,15 +1350,27 @@ def _sort_lambda(sorted_by='cpu_percent', sorted_by_secondary='memory_percent'):
     return {'io_counters': _sort_io_counters, 'cpu_times': _sort_cpu_times}.get(sorted_by, None)
 
 
-def sort_stats(stats, sorted_by='cpu_percent', sorted_by_secondary='memory_percent', reverse=True):
+def _select(stats, key, reverse=True, limit=None):
+    """Return the stats sorted by key.
+
+    If limit is set, only the first limit items are selected (using a heap)
+    instead of sorting the whole list. As sorted(), the selection is stable.
+    """
+    if limit is None or limit >= len(stats):
+        return sorted(stats, key=key, reverse=reverse)
+    return (heapq.nlargest if reverse else heapq.nsmallest)(limit, stats, key=key)
+
+
+def sort_stats(stats, sorted_by='cpu_percent', sorted_by_secondary='memory_percent', reverse=True, limit=None):
     """Return the stats (dict) sorted by (sorted_by).
     A secondary sort key should be specified.
 
     Reverse the sort if reverse is True.
+    Only return the first limit items if limit is set (partial selection, faster than a full sort).
     """
     if sorted_by is None and sorted_by_secondary is None:
         # No need to sort...
-        return stats
+        return stats if limit is None else stats[:limit]
 
     # Check if a specific sort should be done
     sort_lambda = _sort_lambda(sorted_by=sorted_by, sorted_by_secondary=sorted_by_secondary)
@@ -813,19 +1378,21 @@ def sort_stats(stats, sorted_by='cpu_percent', sorted_by_secondary='memory_perce
     if sort_lambda is not None:
         # Specific sort
         try:
-            stats = sorted(stats, key=sort_lambda, reverse=reverse)
+            stats = _select(stats, sort_lambda, reverse=reverse, limit=limit)
         except Exception as e:
             # If an error is detected, fallback to cpu_percent
             logger.debug(f'Error while sorting by {sorted_by}, fallback to cpu_percent ({e})')
-            stats = sorted(stats, key=sort_by_these_keys('cpu_percent', sorted_by_secondary), reverse=reverse)
+            stats = _select(stats, sort_by_these_keys('cpu_percent', sorted_by_secondary), reverse=reverse, limit=limit)
     else:
         # Standard sort
         try:
-            stats = sorted(stats, key=sort_by_these_keys(sorted_by, sorted_by_secondary), reverse=reverse)
+            stats = _select(stats, sort_by_these_keys(sorted_by, sorted_by_secondary), reverse=reverse, limit=limit)
         except (KeyError, TypeError) as e:
             # Fallback to name
             logger.debug(f'Error while sorting by {sorted_by}, fallback to name ({e})')
             stats.sort(key=lambda process: process['name'] if process['name'] is not None else '~', reverse=False)
+            if limit is not None:
+                stats = stats[:limit]
 
     return stats
 
@@ -0,0 +1,436 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Linux processes scanner (direct /proc reading, without PsUtil)."""
+
+import multiprocessing
+import os
+import pwd
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import psutil
+
+from glances.logger import logger
+
+# Process status (first char of the stat file state field)
+# Same values than the PsUtil STATUS_* constants
+procfs_status = {
+    'R': psutil.STATUS_RUNNING,
+    'S': psutil.STATUS_SLEEPING,
+    'D': psutil.STATUS_DISK_SLEEP,
+    'T': psutil.STATUS_STOPPED,
+    't': psutil.STATUS_TRACING_STOP,
+    'Z': psutil.STATUS_ZOMBIE,
+    'X': psutil.STATUS_DEAD,
+    'x': psutil.STATUS_DEAD,
+    'K': 'wake-kill',
+    'W': psutil.STATUS_WAKING,
+    'I': psutil.STATUS_IDLE,
+    'P': 'parked',
+}
+
+
+# Status (stat file state field) of the PsUtil status
+procfs_status_code = {v: k for k, v in procfs_status.items()}
+
+# Packed record of a process (sharded scan, see GlancesProcfs.scan_shard)
+# Not available values are set to -1 (0 for the status and procfs_no_id for the gids)
+# The name, the user name and the command line are stored in a separate strings buffer
+procfs_record = struct.Struct(
+    '='
+    'i'  # pid
+    'd'  # create_time
+    'ddddd'  # cpu_times: user, system, children_user, children_system, iowait
+    'B'  # status (first char of the stat file state field)
+    'iii'  # num_threads, nice, cpu_num
+    'qqqqq'  # memory_info: rss, vms, shared, text, data
+    'III'  # gids: real, effective, saved (unsigned, as gid_t)
+    'qqqq'  # io_counters: read_count, write_count, read_bytes, write_bytes
+    'iii'  # name, username and cmdline lengths in the strings buffer (-1 if not available)
+    'Q'  # start time (clock ticks, key of the previous CPU times with the pid)
+)
+
+# Not available gids ((gid_t) -1 is not a valid id)
+procfs_no_id = 0xFFFFFFFF
+
+# Sharded scan worker (one scanner per worker process)
+_worker_procfs = None
+
+
+def _init_worker(procfs_path):
+    """Init a sharded scan worker."""
+    global _worker_procfs
+    _worker_procfs = GlancesProcfs(procfs_path=procfs_path)
+
+
+def _scan_shard(pids, attrs):
+    """Scan the given pids in a worker and return the packed records (see GlancesProcfs.scan_shard)."""
+    return _worker_procfs.scan_shard(pids, attrs)
+
+
+def read_file(path):
+    """Return the content (bytes) of the given /proc file (with the minimum of syscalls)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, 8192)
+        if len(data) < 8192:
+            return data
+        chunks = [data]
+        while data:
+            data = os.read(fd, 65536)
+            chunks.append(data)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+class GlancesProcfs:
+    """This class scans the processes by reading the /proc files.
+
+    It is a (Linux only) faster alternative to psutil.process_iter:
+    no psutil.Process object is created and only the needed files are
+    read (stat, statm and only if needed status, io and cmdline).
+
+    The scan returns a list of dict with the same shape than the
+    psutil.process_iter info dicts (nested stats are dicts).
+    """
+
+    def __init__(self, procfs_path='/proc', workers=1):
+        self.procfs_path = procfs_path
+        # Number of worker processes (the pids are split in workers shards, 1 to scan in the current process)
+        self.workers = workers
+        self._pool = None
+        # Running pids tracked with the proc connector events (None to list /proc on every scan)
+        self.proc_connector = None
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.total_memory = psutil.virtual_memory().total
+        self.boot_time = psutil.boot_time()
+        # Previous CPU times (for the cpu_percent): key = (pid, start time), value = (monotonic time, cpu time)
+        self._cpu_times = {}
+        # User names: key = uid, value = user name
+        self._users = {}
+
+    def get_pids(self):
+        """Return the list of the current pids."""
+        if self.proc_connector is not None:
+            return self.proc_connector.get_pids()
+        return [int(e) for e in os.listdir(self.procfs_path) if e.isdigit()]
+
+    def get_username(self, uid):
+        """Return the user name of the given uid (cached)."""
+        try:
+            return self._users[uid]
+        except KeyError:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+            return name
+
+    def scan(self, attrs, pids=None):
+        """Scan the processes (all the pids or the given ones) and return a list of info dict.
+
+        :attrs: list of the stats to grab (see psutil.Process.as_dict)
+        """
+        attrs = set(attrs) | {'pid'}
+        if pids is None and self.workers > 1:
+            try:
+                return self.scan_sharded(attrs)
+            except Exception as e:
+                logger.warning(f"Can not scan the processes with {self.workers} workers ({e}), use the main process")
+                self.close()
+                self.workers = 1
+        now = time.monotonic()
+        # For a full scan, only keep the CPU times of the running processes
+        cpu_times = {} if pids is None else None
+        ret = []
+        for pid in self.get_pids() if pids is None else pids:
+            try:
+                info = self.scan_pid(pid, attrs, now, cpu_times)
+            except (FileNotFoundError, ProcessLookupError, ValueError, IndexError):
+                # Process has gone (or its stat file is not readable)
+                if self.proc_connector is not None:
+                    self.proc_connector.discard(pid)
+                continue
+            ret.append(info)
+        if cpu_times is not None and 'cpu_percent' in attrs:
+            self._cpu_times = cpu_times
+        return ret
+
+    def scan_sharded(self, attrs):
+        """Scan all the processes in self.workers worker processes.
+
+        Each worker scans a shard of the pids and returns packed records
+        (see procfs_record). The CPU percent is computed in the current process.
+        """
+        if self._pool is None:
+            # Fork is not safe in a multithreaded process (Glances is), so use a fork server
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+                initializer=_init_worker,
+                initargs=(self.procfs_path,),
+            )
+        pids = self.get_pids()
+        shard_attrs = attrs - {'cpu_percent'} | {'create_time', 'cpu_times', 'start_time'}
+        if 'memory_percent' in attrs:
+            # The memory percent is computed from the packed rss
+            shard_attrs.add('memory_info')
+        shard_attrs = sorted(shard_attrs)
+        futures = [self._pool.submit(_scan_shard, pids[i :: self.workers], shard_attrs) for i in range(self.workers)]
+        now = time.monotonic()
+        cpu_times = {}
+        ret = []
+        for future in futures:
+            for info in self.unpack(*future.result(), attrs):
+                # Same key than the scan in the current process (see scan_pid)
+                start_time = info.pop('start_time')
+                if 'cpu_percent' in attrs:
+                    cpu_time = info['cpu_times']['user'] + info['cpu_times']['system']
+                    info['cpu_percent'] = self._cpu_percent((info['pid'], start_time), cpu_time, now, cpu_times)
+                if 'cpu_times' not in attrs:
+                    del info['cpu_times']
+                if 'create_time' not in attrs:
+                    del info['create_time']
+                ret.append(info)
+        if 'cpu_percent' in attrs:
+            self._cpu_times = cpu_times
+        if self.proc_connector is not None:
+            # Processes gone (their stat file is not readable)
+            for pid in set(pids).difference(i['pid'] for i in ret):
+                self.proc_connector.discard(pid)
+        return ret
+
+    def scan_shard(self, pids, attrs):
+        """Scan the given pids and return the packed records (records buffer, strings buffer)."""
+        records = bytearray()
+        strings = bytearray()
+        for pid in pids:
+            try:
+                info = self.scan_pid(pid, attrs)
+                record, texts = self.pack(info)
+            except (FileNotFoundError, ProcessLookupError, ValueError, IndexError, struct.error):
+                continue
+            records += record
+            strings += b''.join(t for t in texts if t is not None)
+        return bytes(records), bytes(strings)
+
+    def pack(self, info):
+        """Return the packed record (see procfs_record) and the encoded texts of the given info dict."""
+        cpu_times = info['cpu_times']
+        memory_info = info.get('memory_info') or {}
+        gids = info.get('gids') or {}
+        texts = [info.get('name'), info.get('username')]
+        texts.append(None if info.get('cmdline') is None else '\x00'.join(info['cmdline']))
+        texts = [None if t is None else t.encode('utf-8', 'surrogateescape') for t in texts]
+        return (
+            procfs_record.pack(
+                info['pid'],
+                info['create_time'],
+                *(cpu_times[k] for k in ('user', 'system', 'children_user', 'children_system', 'iowait')),
+                ord(procfs_status_code.get(info.get('status'), '\x00')),
+                info.get('num_threads', -1),
+                info.get('nice', -1),
+                -1 if info.get('cpu_num') is None else info['cpu_num'],
+                *(memory_info.get(k, -1) for k in ('rss', 'vms', 'shared', 'text', 'data')),
+                *(gids.get(k, procfs_no_id) for k in ('real', 'effective', 'saved')),
+                *(info.get('io_counters') or (-1, -1, -1, -1)),
+                *(-1 if t is None else len(t) for t in texts),
+                info.get('start_time', 0),
+            ),
+            texts,
+        )
+
+    def unpack(self, records, strings, attrs):
+        """Return the list of info dict of the packed records (see scan_shard)."""
+        ret = []
+        offset = 0
+        for r in procfs_record.iter_unpack(records):
+            texts = []
+            for length in r[23:26]:
+                if length < 0:
+                    texts.append(None)
+                    continue
+                texts.append(strings[offset : offset + length].decode('utf-8', 'replace'))
+                offset += length
+            info = {
+                'pid': r[0],
+                'create_time': r[1],
+                'cpu_times': dict(zip(('user', 'system', 'children_user', 'children_system', 'iowait'), r[2:7])),
+                'start_time': r[26],
+            }
+            if 'name' in attrs:
+                info['name'] = texts[0]
+            if 'status' in attrs:
+                info['status'] = procfs_status.get(chr(r[7]), '?')
+            if 'num_threads' in attrs:
+                info['num_threads'] = r[8]
+            if 'nice' in attrs:
+                info['nice'] = r[9]
+            if 'cpu_num' in attrs:
+                info['cpu_num'] = None if r[10] == -1 else r[10]
+            if 'memory_info' in attrs:
+                info['memory_info'] = dict(
+                    zip(('rss', 'vms', 'shared', 'text', 'lib', 'data', 'dirty'), r[11:15] + (0, r[15], 0))
+                )
+            if 'memory_percent' in attrs:
+                info['memory_percent'] = r[11] / self.total_memory * 100
+            if 'gids' in attrs:
+                info['gids'] = None if r[16] == procfs_no_id else dict(zip(('real', 'effective', 'saved'), r[16:19]))
+            if 'io_counters' in attrs:
+                info['io_counters'] = None if r[19] == -1 else r[19:23]
+            if 'username' in attrs:
+                info['username'] = texts[1]
+            if 'cmdline' in attrs:
+                info['cmdline'] = None if texts[2] is None else (texts[2].split('\x00') if texts[2] else [])
+            ret.append(info)
+        return ret
+
+    def close(self):
+        """Stop the sharded scan workers (if any)."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def scan_pid(self, pid, attrs, now=None, cpu_times=None):
+        """Return the info dict for the given pid."""
+        path = f'{self.procfs_path}/{pid}/'
+
+        # /proc/<pid>/stat (always read)
+        data = read_file(path + 'stat')
+        rpar = data.rfind(b')')
+        name = data[data.find(b'(') + 1 : rpar].decode('utf-8', 'replace')
+        stat = data[rpar + 2 :].split()
+        utime = int(stat[11]) / self.clock_ticks
+        stime = int(stat[12]) / self.clock_ticks
+        start_time = int(stat[19])
+
+        info = {'pid': pid}
+        if 'start_time' in attrs:
+            # Not a PsUtil stat: process start time in clock ticks (used by the sharded scan)
+            info['start_time'] = start_time
+        if 'create_time' in attrs:
+            info['create_time'] = self.boot_time + start_time / self.clock_ticks
+        if 'cpu_percent' in attrs:
+            info['cpu_percent'] = self._cpu_percent((pid, start_time), utime + stime, now, cpu_times)
+        if 'cpu_times' in attrs:
+            info['cpu_times'] = {
+                'user': utime,
+                'system': stime,
+                'children_user': int(stat[13]) / self.clock_ticks,
+                'children_system': int(stat[14]) / self.clock_ticks,
+                'iowait': int(stat[39]) / self.clock_ticks if len(stat) > 39 else 0.0,
+            }
+        if 'status' in attrs:
+            info['status'] = procfs_status.get(stat[0].decode(), '?')
+        if 'num_threads' in attrs:
+            info['num_threads'] = int(stat[17])
+        if 'nice' in attrs:
+            info['nice'] = int(stat[16])
+        if 'cpu_num' in attrs:
+            info['cpu_num'] = int(stat[36]) if len(stat) > 36 else None
+
+        # /proc/<pid>/statm (memory)
+        if 'memory_info' in attrs or 'memory_percent' in attrs:
+            statm = [int(i) * self.page_size for i in read_file(path + 'statm').split()[:6]]
+            if 'memory_info' in attrs:
+                info['memory_info'] = {
+                    'rss': statm[1],
+                    'vms': statm[0],
+                    'shared': statm[2],
+                    'text': statm[3],
+                    'lib': 0,
+                    'data': statm[5],
+                    'dirty': 0,
+                }
+            if 'memory_percent' in attrs:
+                info['memory_percent'] = statm[1] / self.total_memory * 100
+
+        # /proc/<pid>/status (uids and gids)
+        if 'gids' in attrs or 'username' in attrs:
+            uids, gids = self._read_ids(path)
+            if 'gids' in attrs:
+                info['gids'] = gids
+            if 'username' in attrs:
+                info['username'] = self.get_username(uids[0]) if uids else None
+
+        # /proc/<pid>/io (only readable for the processes of the current user, else None)
+        if 'io_counters' in attrs:
+            info['io_counters'] = self._read_io(path)
+
+        # /proc/<pid>/cmdline (also used for the name if the process name is truncated)
+        if 'cmdline' in attrs or ('name' in attrs and len(name) >= 15):
+            cmdline = self._read_cmdline(path)
+            if 'cmdline' in attrs:
+                info['cmdline'] = cmdline
+            if len(name) >= 15 and cmdline:
+                extended_name = os.path.basename(cmdline[0])
+                if extended_name.startswith(name):
+                    name = extended_name
+        if 'name' in attrs:
+            info['name'] = name
+
+        return info
+
+    def _cpu_percent(self, key, cpu_time, now=None, cpu_times=None):
+        """Return the CPU percent since the previous scan and save the current CPU time.
+
+        :cpu_times: dict where the CPU time is saved (None to save it in the scanner one)
+        """
+        now = time.monotonic() if now is None else now
+        previous = self._cpu_times.get(key)
+        (self._cpu_times if cpu_times is None else cpu_times)[key] = (now, cpu_time)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        return round((cpu_time - previous[1]) / (now - previous[0]) * 100, 1)
+
+    def _read_ids(self, path):
+        """Return the real/effective/saved uids and gids dict."""
+        uids = gids = None
+        for line in read_file(path + 'status').splitlines():
+            if line.startswith(b'Uid:'):
+                uids = [int(i) for i in line.split()[1:4]]
+            elif line.startswith(b'Gid:'):
+                gids = [int(i) for i in line.split()[1:4]]
+                break
+        return uids, dict(zip(('real', 'effective', 'saved'), gids)) if gids else None
+
+    def _read_io(self, path):
+        """Return the IO counters as a tuple (read_count, write_count, read_bytes, write_bytes) or None."""
+        try:
+            data = read_file(path + 'io')
+        except PermissionError:
+            return None
+        io = {}
+        for line in data.splitlines():
+            k, _, v = line.partition(b':')
+            io[k] = int(v)
+        try:
+            return (io[b'syscr'], io[b'syscw'], io[b'read_bytes'], io[b'write_bytes'])
+        except KeyError:
+            return None
+
+    def _read_cmdline(self, path):
+        """Return the command line as a list."""
+        try:
+            data = read_file(path + 'cmdline')
+        except PermissionError:
+            return None
+        if not data:
+            return []
+        data = data.decode('utf-8', 'replace')
+        if data.endswith('\x00'):
+            data = data[:-1]
+        elif '\x00' not in data:
+            # Some processes change their cmdline (separated by space)
+            return data.split(' ')
+        return data.split('\x00')
@@ -6,6 +6,7 @@
 # SPDX-License-Identifier: LGPL-3.0-only
 #
 
+import threading
 from collections import Counter
 
 # from glances.logger import logger
@@ -14,46 +15,6 @@ from collections import Counter
 sort_programs_key_list = ['cpu_percent', 'memory_percent', 'cpu_times', 'io_counters', 'name']
 
 
-def create_program_dict(p):
-    """Create a new entry in the dict (new program)"""
-    return {
-        'time_since_update': p['time_since_update'],
-        # some values can be None, e.g. macOS system processes
-        'num_threads': p['num_threads'] or 0,
-        'cpu_percent': p['cpu_percent'] or 0,
-        'memory_percent': p['memory_percent'] or 0,
-        'cpu_times': p['cpu_times'] or {},
-        'memory_info': p['memory_info'] or {},
-        'io_counters': p['io_counters'] or {},
-        'childrens': [p['pid']],
-        # Others keys are not used
-        # but should be set to be compliant with the existing process_list
-        'name': p['name'],
-        'cmdline': [p['name']],
-        'pid': '_',
-        'username': p.get('username', '_'),
-        'nice': p['nice'],
-        'status': p['status'],
-    }
-
-
-def update_program_dict(program, p):
-    """Update an existing entry in the dict (existing program)"""
-    # some values can be None, e.g. macOS system processes
-    program['num_threads'] += p['num_threads'] or 0
-    program['cpu_percent'] += p['cpu_percent'] or 0
-    program['memory_percent'] += p['memory_percent'] or 0
-    program['cpu_times'] = dict(Counter(program['cpu_times'] or {}) + Counter(p['cpu_times'] or {}))
-    program['memory_info'] = dict(Counter(program['memory_info'] or {}) + Counter(p['memory_info'] or {}))
-
-    program['io_counters'] += p['io_counters']
-    program['childrens'].append(p['pid'])
-    # If all the subprocess has the same value, display it
-    program['username'] = p.get('username', '_') if p.get('username') == program['username'] else '_'
-    program['nice'] = p['nice'] if p['nice'] == program['nice'] else '_'
-    program['status'] = p['status'] if p['status'] == program['status'] else '_'
-
-
 def compute_nprocs(p):
     p['nprocs'] = len(p['childrens'])
     return p
@@ -61,14 +22,148 @@ def compute_nprocs(p):
 
 def processes_to_programs(processes):
     """Convert a list of processes to a list of programs."""
-    # Start to build a dict of programs (key is program name)
-    programs_dict = {}
-    key = 'name'
-    for p in processes:
-        if p[key] not in programs_dict:
-            programs_dict[p[key]] = create_program_dict(p)
+    return GlancesPrograms().update(processes)
+
+
+class GlancesPrograms:
+    """Programs list (processes aggregated by name) maintained from the processes list changes.
+
+    Each program keeps the running sums of the stats of its processes. On update, only the
+    processes which have appeared, changed or exited since the last update are added to
+    (or removed from) the sums of their program, and only the changed programs are rebuilt.
+    The programs list is not updated again while the processes list is the same.
+    """
+
+    # Stats which should be the same for all the processes of a program (else '_' is displayed)
+    common_keys = ('username', 'nice', 'status')
+
+    def __init__(self):
+        # Contributions of the processes, key = (pid, create_time) / value = (name, contribution)
+        self._processes = {}
+        # Running sums of the programs, key = program name
+        self._programs = {}
+        # Programs list (same format as the processes list), key = program name
+        self._views = {}
+        self._processlist = None
+        self.programlist = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def contribution(p):
+        """Return the stats (tuple) of the process which are aggregated in its program."""
+        # some values can be None, e.g. macOS system processes
+        io = p.get('io_counters')
+        return (
+            p['num_threads'] or 0,
+            p['cpu_percent'] or 0,
+            p['memory_percent'] or 0,
+            tuple((p['cpu_times'] or {}).items()),
+            tuple((p['memory_info'] or {}).items()),
+            # IO rate is only available for the processes with an io_tag (see get_io_counters)
+            tuple(io[:4]) if io and io[4] == 1 else None,
+            p.get('username', '_'),
+            p['nice'],
+            p['status'],
+        )
+
+    def _aggregate(self, name, key, pid, contribution, sign):
+        """Add (sign=1) or remove (sign=-1) the contribution of a process to its program."""
+        program = self._programs.get(name)
+        if program is None:
+            program = self._programs[name] = {
+                'num_threads': 0,
+                'cpu_percent': 0,
+                'memory_percent': 0,
+                'cpu_times': {},
+                'memory_info': {},
+                'io_counters': [0, 0, 0, 0],
+                'io_tag': 0,
+                'childrens': {},
+                'common': {k: Counter() for k in self.common_keys},
+            }
+        num_threads, cpu_percent, memory_percent, cpu_times, memory_info, io, *common = contribution
+        program['num_threads'] += sign * num_threads
+        program['cpu_percent'] += sign * cpu_percent
+        program['memory_percent'] += sign * memory_percent
+        for field, values in (('cpu_times', cpu_times), ('memory_info', memory_info)):
+            for k, v in values:
+                program[field][k] = program[field].get(k, 0) + sign * v
+        if io is not None:
+            program['io_counters'] = [i + sign * j for i, j in zip(program['io_counters'], io)]
+            program['io_tag'] += sign
+        for k, v in zip(self.common_keys, common):
+            program['common'][k][v] += sign
+            if program['common'][k][v] == 0:
+                del program['common'][k][v]
+        if sign > 0:
+            program['childrens'][key] = pid
         else:
-            update_program_dict(programs_dict[p[key]], p)
+            del program['childrens'][key]
+            if not program['childrens']:
+                del self._programs[name]
+
+    def _view(self, name, time_since_update):
+        """Return the program dict (same format as a process dict) of the given program."""
+        program = self._programs[name]
+        ret = {
+            'time_since_update': time_since_update,
+            # Sums are kept positive (rounding errors of the running sums)
+            'num_threads': program['num_threads'],
+            'cpu_percent': max(program['cpu_percent'], 0),
+            'memory_percent': max(program['memory_percent'], 0),
+            'cpu_times': {k: max(v, 0) for k, v in program['cpu_times'].items()},
+            'memory_info': dict(program['memory_info']),
+            'io_counters': program['io_counters'] + [1 if program['io_tag'] else 0],
+            'childrens': list(program['childrens'].values()),
+            # Others keys are not used
+            # but should be set to be compliant with the existing process_list
+            'name': name,
+            'cmdline': [name],
+            'pid': '_',
+        }
+        # If all the subprocess has the same value, display it
+        for k, values in program['common'].items():
+            ret[k] = next(iter(values)) if len(values) == 1 else '_'
+        return compute_nprocs(ret)
+
+    def update(self, processes):
+        """Update the programs with the given processes list and return the programs list."""
+        with self._lock:
+            if processes is not self._processlist:
+                self._update(processes)
+                self._processlist = processes
+            return self.programlist
+
+    def _update(self, processes):
+        """Apply the changes of the processes list to the programs."""
+
+        changed = set()
+        seen = set()
+        time_since_update = None
+        for p in processes:
+            key = (p['pid'], p.get('create_time'))
+            seen.add(key)
+            time_since_update = p['time_since_update']
+            new = (p['name'], self.contribution(p))
+            old = self._processes.get(key)
+            if new == old:
+                continue
+            if old is not None:
+                self._aggregate(old[0], key, p['pid'], old[1], -1)
+                changed.add(old[0])
+            self._aggregate(new[0], key, p['pid'], new[1], 1)
+            changed.add(new[0])
+            self._processes[key] = new
+        # Exited processes
+        for key in [k for k in self._processes if k not in seen]:
+            name, contribution = self._processes.pop(key)
+            self._aggregate(name, key, key[0], contribution, -1)
+            changed.add(name)
 
-    # Convert the dict to a list of programs
-    return [compute_nprocs(p) for p in programs_dict.values()]
+        if changed:
+            for name in changed:
+                if name in self._programs:
+                    self._views[name] = self._view(name, time_since_update)
+                else:
+                    self._views.pop(name, None)
+            self.programlist = list(self._views.values())
@@ -0,0 +1,181 @@
+#
+# This file is part of Glances.
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Manage the plugins update scheduling."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from glances.logger import logger
+from glances.plugins.plugin.dag import get_plugins_graph
+
+
+class GlancesUpdateScheduler:
+    """This class runs the plugins update in a bounded pool of workers.
+
+    The plugins DAG (see plugins/plugin/dag.py) is used to start a plugin
+    as soon as all its dependencies are updated. Others plugins are updated
+    concurrently.
+
+    Each plugin has a deadline. If it is not updated before the deadline,
+    the cycle continues without it: the last stats are kept and the plugin
+    is not submitted again until the pending update is finished.
+    """
+
+    def __init__(self, update_fct, workers=0):
+        """Init the scheduler.
+
+        :update_fct: function called with the plugin name to update it
+        :workers: maximum number of workers (0 or 1 to update the plugins sequentially)
+        """
+        self.update_fct = update_fct
+        self.workers = workers
+        self._executor = None
+        # Late plugins (deadline missed): key = plugin name, value = pending future
+        self._late = {}
+
+    @property
+    def executor(self):
+        """Return the pool of workers (created on the first call)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='glances_update')
+        return self._executor
+
+    def is_parallel(self):
+        """Return True if the plugins are updated in parallel."""
+        return self.workers > 1
+
+    def update(self, plugins_list, get_deadline=None):
+        """Update all the plugins of plugins_list.
+
+        :plugins_list: list of plugin names to update
+        :get_deadline: function returning the deadline (in seconds) of a plugin name (None or 0 for no deadline)
+        """
+        if not self.is_parallel():
+            for p in plugins_list:
+                self.update_fct(p)
+            return
+
+        graph = get_plugins_graph(plugins_list)
+        done = set()
+        running = {}
+        deadlines = {}
+        while graph or running:
+            # Submit all the plugins with all their dependencies done
+            for p in [p for p, deps in graph.items() if deps <= done]:
+                del graph[p]
+                if p in self._late and not self._late[p].done():
+                    logger.debug(f"Plugin {p} is still updating (deadline missed), keep its last stats")
+                    done.add(p)
+                    continue
+                self._late.pop(p, None)
+                running[self.executor.submit(self._update, p)] = p
+                deadline = get_deadline(p) if get_deadline else None
+                deadlines[p] = time.monotonic() + deadline if deadline else None
+
+            if not running:
+                if graph:
+                    # Should never happen (DAG with a cycle): release remaining plugins
+                    logger.error(f"Cycle detected in the plugins dependencies: {list(graph)}")
+                    done.update(graph)
+                continue
+
+            # Wait for the first finished plugin or the next deadline
+            next_deadline = [deadlines[p] for p in running.values() if deadlines[p] is not None]
+            timeout = max(0, min(next_deadline) - time.monotonic()) if next_deadline else None
+            finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for f in finished:
+                done.add(running.pop(f))
+
+            # Release the plugins which missed their deadline
+            now = time.monotonic()
+            for f, p in list(running.items()):
+                if deadlines[p] is not None and now >= deadlines[p]:
+                    logger.warning(f"Plugin {p} missed its update deadline, keep its last stats")
+                    del running[f]
+                    self._late[p] = f
+                    done.add(p)
+
+    def _update(self, plugin):
+        """Update the given plugin (run in a worker)."""
+        try:
+            self.update_fct(plugin)
+        except Exception as e:
+            logger.error(f"Error while updating the {plugin} plugin ({e})")
+
+    def end(self):
+        """Stop the pool of workers (do not wait for the late plugins)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class GlancesTimingWheel:
+    """This class schedules the plugins refresh using a (hashed) timing wheel.
+
+    The wheel is a circular list of slots, one slot per tick (in seconds).
+    An item (plugin name) is stored in the slot of its expiry tick. Adding an
+    item is O(1) and advancing the wheel only visits the slots between two
+    calls, whatever the number of scheduled items.
+
+    An item never scheduled (or removed) is always due.
+    """
+
+    def __init__(self, tick=0.5, size=512):
+        self.tick = tick
+        self.size = size
+        # Each slot is a dict: key = item, value = expiry tick
+        self._slots = [{} for _ in range(size)]
+        # Slot index of the scheduled items
+        self._scheduled = {}
+        # Current tick of the wheel (None before the first advance)
+        self._current = None
+
+    def _get_tick(self):
+        """Return the tick of the current time."""
+        return round(time.monotonic() / self.tick)
+
+    def add(self, item, delay):
+        """Schedule the item in delay seconds (from the current wheel position)."""
+        self.remove(item)
+        if self._current is None:
+            self._current = self._get_tick()
+        expiry = self._current + max(1, round(delay / self.tick))
+        slot = expiry % self.size
+        self._slots[slot][item] = expiry
+        self._scheduled[item] = slot
+
+    def remove(self, item):
+        """Remove the item from the wheel."""
+        slot = self._scheduled.pop(item, None)
+        if slot is not None:
+            self._slots[slot].pop(item, None)
+
+    def advance(self):
+        """Move the wheel to the current time and return the list of expired items."""
+        now = self._get_tick()
+        if self._current is None:
+            self._current = now
+        ret = []
+        # Visit the slots between the previous and the current position (at most one wheel round)
+        for t in range(max(self._current + 1, now - self.size + 1), now + 1):
+            slot = self._slots[t % self.size]
+            for item in [i for i, expiry in slot.items() if expiry <= now]:
+                del slot[item]
+                del self._scheduled[item]
+                ret.append(item)
+        self._current = max(self._current, now)
+        return ret
+
+    def pop_due(self, items):
+        """Return the items (from the given list) which should be refreshed now.
+
+        The returned items are removed from the wheel and should be scheduled again with add().
+        """
+        self.advance()
+        return [i for i in items if i not in self._scheduled]
@@ -108,6 +108,10 @@ class GlancesStandalone:
             # Init screen in default mode (curses) aka TUI mode
             self.screen = GlancesCursesStandalone(config=config, args=args)
 
+            # Only the displayed processes need the full stats (if not set in the configuration file)
+            if glances_processes.full_stats_top is None:
+                glances_processes.full_stats_top = glances_processes.max_processes
+
             # If an error occur during the screen init, continue if export option is set
             # It is done in the screen.init function
             self._quiet = args.quiet
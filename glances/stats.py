@@ -13,15 +13,84 @@ import collections
 import os
 import sys
 import threading
+import time
 import traceback
 from importlib import import_module
 from pathlib import Path
 
-from glances.globals import exports_path, plugins_path, sys_path, weak_lru_cache
+from glances.cache import GlancesStatsCache
+from glances.exports.export import build_export_columns
+from glances.exports.worker import GlancesExportWorker, exit_timeout
+from glances.globals import exports_path, plugins_path, sys_path
 from glances.logger import logger
+from glances.perf import glances_perf
+from glances.scheduler import GlancesTimingWheel, GlancesUpdateScheduler
 from glances.timer import Counter
 
 
+def copy_stats(stats):
+    """Return a copy of the stats (dict or list of dict) which can be updated by an exporter."""
+    if isinstance(stats, dict):
+        return dict(stats)
+    if isinstance(stats, list):
+        return [dict(i) if isinstance(i, dict) else i for i in stats]
+    return stats
+
+
+class GlancesStatsSnapshot:
+    """Stats of a cycle, as seen by the exporters.
+
+    The stats to export and the limits of the enabled plugins are grabbed when
+    the snapshot is created: a delayed export sends the stats of its own cycle.
+    Each exporter gets its own copy of the stats (exporters add the limits to
+    the stats). Others attributes are read from the stats manager.
+    """
+
+    def __init__(self, stats):
+        self._stats = stats
+        self._plugins_list = stats.getPluginsList()
+        self._exports = stats.getAllExportsAsDict(plugin_list=self._plugins_list)
+        self._limits = stats.getAllLimitsAsDict(plugin_list=self._plugins_list)
+        # Time (epoch) of the cycle
+        self.timestamp = time.time()
+        # Flattened stats (computed once for all the exporters), key = plugin name
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, item):
+        return getattr(self._stats, item)
+
+    def getPluginsList(self, enable=True):
+        """Return the plugins list (enabled plugins of the cycle by default)."""
+        if enable:
+            return list(self._plugins_list)
+        return self._stats.getPluginsList(enable=False)
+
+    def getAllExportsAsDict(self, plugin_list=None):
+        """Return the stats of the cycle to be exported as a dict."""
+        if plugin_list is None:
+            plugin_list = self._plugins_list
+        # Plugins which are not in the cycle are read from the stats manager
+        ret = self._stats.getAllExportsAsDict(plugin_list=[p for p in plugin_list if p not in self._exports])
+        return {p: copy_stats(self._exports[p]) if p in self._exports else ret[p] for p in plugin_list}
+
+    def getAllLimitsAsDict(self, plugin_list=None):
+        """Return the limits of the cycle (dict)."""
+        if plugin_list is None:
+            plugin_list = self._plugins_list
+        ret = self._stats.getAllLimitsAsDict(plugin_list=[p for p in plugin_list if p not in self._limits])
+        return {p: self._limits[p] if p in self._limits else ret[p] for p in plugin_list}
+
+    def getExportColumns(self, plugin):
+        """Return the flattened stats of the cycle (computed once for all the exporters)."""
+        if plugin not in self._exports:
+            return self._stats.getExportColumns(plugin)
+        with self._lock:
+            if plugin not in self._columns:
+                self._columns[plugin] = build_export_columns(plugin, self._exports[plugin], self._limits[plugin])
+            return self._columns[plugin]
+
+
 class GlancesStats:
     """This class stores, updates and gives stats."""
 
@@ -39,6 +108,9 @@ class GlancesStats:
         self.first_export = True
         self.load_modules(self.args)
 
+        # Init the plugins update scheduler
+        self.load_scheduler()
+
     def __getattr__(self, item):
         """Overwrite the getattr method in case of attribute is not found.
 
@@ -87,6 +159,8 @@ class GlancesStats:
         self._exports = collections.defaultdict(dict)
         # All available exporters dictionary
         self._exports_all = collections.defaultdict(dict)
+        # Export threads (one per active exporter)
+        self._export_workers = {}
         # Load the export modules
         self.load_exports(args=args)
 
@@ -122,6 +196,10 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
             if args is not None:
                 setattr(args, 'disable_' + plugin_path, False)
         else:
+            # Watch the memory used by the plugin (stats, views and history)
+            if plugin_path in self._plugins:
+                plugin = self._plugins[plugin_path]
+                glances_perf.watch_memory(plugin_path, lambda: (plugin.stats, plugin.views, plugin.stats_history))
             # Manage the default status of the plugin (enable or disable)
             if args is not None:
                 # If the all keys are set in the disable_plugin option then look in the enable_plugin option
@@ -272,6 +350,8 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
                     self._exports[exporter_name] = export_module.Export(args=args, config=self.config)
                     # Add the exporter instance to the available exporters dictionary
                     self._exports_all[exporter_name] = self._exports[exporter_name]
+                    # Each exporter has its own export thread
+                    self._export_workers[exporter_name] = self.load_export_worker(exporter_name)
                 else:
                     # Add the exporter name to the available exporters dictionary
                     self._exports_all[exporter_name] = exporter_name
@@ -281,6 +361,52 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
         logger.debug(f"Active exports modules list: {self.getExportsList()}")
         return True
 
+    def load_export_worker(self, exporter_name):
+        """Init the export thread of the given exporter.
+
+        The queue_size and overflow options are read from the exporter section
+        (or from the common [export] section).
+        """
+        queue_size, overflow = 3, 'drop-oldest'
+        if self.config is not None and hasattr(self.config, 'get_int_value'):
+            queue_size = self.config.get_int_value(
+                exporter_name, 'queue_size', default=self.config.get_int_value('export', 'queue_size', default=3)
+            )
+            overflow = self.config.get_value(
+                exporter_name, 'overflow', default=self.config.get_value('export', 'overflow', default='drop-oldest')
+            )
+        return GlancesExportWorker(
+            exporter_name, lambda snapshot: self._export_module(exporter_name, snapshot), queue_size, overflow
+        )
+
+    def load_scheduler(self):
+        """Init the plugins update scheduler.
+
+        By default, plugins are updated sequentially.
+        If update_workers is set in the [global] section, plugins are updated in parallel
+        and each plugin should be updated before its deadline (update_timeout).
+        """
+        workers = 0
+        # Default deadline is the global refresh time
+        self.update_timeout = getattr(self.args, 'time', None)
+        if self.config is not None and hasattr(self.config, 'get_int_value'):
+            workers = self.config.get_int_value('global', 'update_workers', default=0)
+            self.update_timeout = self.config.get_float_value(
+                'global', 'update_timeout', default=self.update_timeout or 0
+            )
+        self._scheduler = GlancesUpdateScheduler(self.update_plugin, workers=workers)
+        # Plugins refresh (each plugin has its own refresh interval)
+        self._refresh_wheel = GlancesTimingWheel()
+        # Plugins update cache (avoid to update a plugin more than 1 time per cached_time)
+        self._cache = GlancesStatsCache(ttl=getattr(self.args, 'cached_time', 1))
+        glances_perf.watch_cache(self._cache)
+        if self._scheduler.is_parallel():
+            logger.info(f"Plugins are updated in parallel ({workers} workers, deadline: {self.update_timeout}s)")
+
+    def get_update_deadline(self, plugin_name):
+        """Return the update deadline (in seconds) for the given plugin name."""
+        return self._plugins[plugin_name].get_update_timeout() or self.update_timeout
+
     def getPluginsList(self, enable=True):
         """Return the plugins list.
 
@@ -311,30 +437,54 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
         for p in self.getPluginsList(enable=False):
             self._plugins[p].load_limits(config)
 
-    # It's a weak cache to avoid updating the same plugin too often
-    # Note: the function always return None
-    @weak_lru_cache(ttl=1)
     def update_plugin(self, p):
-        """Update stats, history and views for the given plugin name p"""
-        self._plugins[p].update()
-        self._plugins[p].update_views()
-        self._plugins[p].update_stats_history()
+        """Update stats, history and views for the given plugin name p.
+
+        The plugin is not updated if it is in the cache (updated less than cached_time ago).
+        """
+        if self._cache.get(p):
+            return
+        with glances_perf.measure(p, 'update'):
+            self._plugins[p].update()
+        with glances_perf.measure(p, 'views'):
+            self._plugins[p].update_views()
+        with glances_perf.measure(p, 'history'):
+            self._plugins[p].update_stats_history()
+        self._cache.set(p)
 
     def update(self, plugins_list_to_update=None):
         """Wrapper method to update stats.
-        If plugins_list_to_update is provided (list), only update the given plugins.
+
+        If plugins_list_to_update is None, update the enabled plugins with an expired refresh interval
+        (others plugins keep their last stats, views and history).
+        If plugins_list_to_update is provided (list), only update the given plugins (if not in the cache).
         """
         if plugins_list_to_update is None:
-            plugins_list_to_update = self.getPluginsList(enable=True)
+            plugins_list_to_update = self._refresh_wheel.pop_due(self.getPluginsList(enable=True))
+            for p in plugins_list_to_update:
+                # The refresh interval is expired, force the update
+                self._plugins[p].force_refresh()
+                self._cache.invalidate(p)
+            self._scheduler.update(plugins_list_to_update, get_deadline=self.get_update_deadline)
+            # Schedule the next refresh of the updated plugins
+            for p in plugins_list_to_update:
+                self._refresh_wheel.add(p, self._plugins[p].get_refresh())
+        else:
+            self._scheduler.update(plugins_list_to_update, get_deadline=self.get_update_deadline)
 
-        # Start update of all enable plugins
-        for p in plugins_list_to_update:
-            self.update_plugin(p)
+    def invalidate_cache(self, plugin_name=None):
+        """Invalidate the cache for the given plugin name (or all the plugins if None)."""
+        self._cache.invalidate(plugin_name)
+
+    def get_cache_stats(self):
+        """Return the plugins update cache counters (dict)."""
+        return self._cache.get_stats()
 
     def export(self, input_stats=None):
         """Export all the stats.
 
-        Each export module is ran in a dedicated thread.
+        The stats of the cycle are put in the queue of each export module,
+        each export module is ran in its own (long-lived) thread.
         """
         if self.first_export:
             # Init fields description
@@ -348,15 +498,25 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
             self.first_export = False
             return False
 
-        input_stats = input_stats or {}
+        if not self.getExportsList():
+            return True
 
+        snapshot = GlancesStatsSnapshot(input_stats) if input_stats is not None else {}
         for e in self.getExportsList():
             logger.debug(f"Export stats using the {e} module")
-            thread = threading.Thread(target=self._exports[e].update, args=(input_stats,))
-            thread.start()
+            self._export_workers[e].put(snapshot)
 
         return True
 
+    def get_export_workers_stats(self):
+        """Return the export queues stats (dict with the exporter name as key)."""
+        return {e: w.get_stats() for e, w in self._export_workers.items()}
+
+    def _export_module(self, e, input_stats):
+        """Export the stats with the given export module (ran in the export thread of the module)."""
+        with glances_perf.measure(e, 'export', category='export'):
+            self._exports[e].update(input_stats)
+
     def getAll(self):
         """Return all the stats (list).
         This method is called byt the XML/RPC API.
@@ -428,6 +588,14 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
             plugin_list = self.getPluginsList()
         return {p: self._plugins[p].limits for p in plugin_list}
 
+    def getExportColumns(self, plugin):
+        """Return the flattened stats to export (with the limits) for the given plugin.
+
+        Return a tuple of 3 tuples (names, keys checked by the exclude_fields option, values)
+        or None if the stats of the plugin can not be exported.
+        """
+        return build_export_columns(plugin, self._plugins[plugin].get_export(), self._plugins[plugin].limits)
+
     def getAllViews(self, plugin_list=None):
         """Return the plugins views.
         This method is called byt the XML/RPC API.
@@ -460,9 +628,21 @@ please rename it to "{plugin_path.capitalize()}Plugin"'
 
     def end(self):
         """End of the Glances stats."""
-        # Close export modules
+        # Stop the plugins update scheduler
+        self._scheduler.end()
+        # Wait for the export threads (the waiting stats are exported), at most exit_timeout seconds
+        deadline = time.monotonic() + exit_timeout
+        drained = {}
+        for e, w in self._export_workers.items():
+            drained[e] = w.stop(timeout=max(0, deadline - time.monotonic()))
+            if not drained[e]:
+                logger.warning(f"Export module {e} is too slow, the waiting stats are not exported")
+        # Close export modules (the waiting batches are exported if the export thread has ended)
         for e in self._exports:
+            if drained.get(e, True):
+                self._exports[e].flush_batch()
             self._exports[e].exit()
         # Close plugins
         for p in self._plugins:
             self._plugins[p].exit()
+            self._plugins[p].close_stats_history()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+#
+# Glances - An eye on your system
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Benchmark the procfs processes scan (not run with the unitary tests).
+
+Usage: python tests/benchmark_procfs.py [number of processes]
+"""
+
+import pathlib
+import sys
+import tempfile
+import time
+
+import psutil
+from test_processes_procfs import make_procfs
+
+from glances.processes import glances_processes
+from glances.procfs import GlancesProcfs
+
+
+def benchmark_backends(nb=5):
+    """Scan the processes of the current host with the psutil and procfs backends.
+
+    Return the best scan duration (in seconds) for each backend.
+    """
+    attrs = glances_processes.get_sorted_attrs() + glances_processes.get_displayed_attr()
+    procfs = GlancesProcfs()
+    ret = {}
+    for backend, scan in (
+        ('psutil', lambda: [p.info for p in psutil.process_iter(attrs=attrs, ad_value=None) if p.is_running()]),
+        ('procfs', lambda: procfs.scan(attrs)),
+    ):
+        scan()
+        ret[backend] = float('inf')
+        for _ in range(nb):
+            start = time.perf_counter()
+            processes = scan()
+            ret[backend] = min(ret[backend], time.perf_counter() - start)
+        print(f"{backend}: {len(processes)} processes scanned in {ret[backend] * 1000:.1f} ms")
+    return ret
+
+
+def benchmark_sharded(nb_processes=2000, nb=3):
+    """Scan a synthetic /proc tree with 1, 2, 4 and 8 workers.
+
+    Return the mean scan duration (in seconds) for each number of workers.
+    """
+    attrs = glances_processes.get_sorted_attrs() + glances_processes.get_displayed_attr() + ['cmdline', 'username']
+    ret = {}
+    with tempfile.TemporaryDirectory() as path:
+        path = str(make_procfs(pathlib.Path(path), nb=nb_processes))
+        for workers in (1, 2, 4, 8):
+            procfs = GlancesProcfs(procfs_path=path, workers=workers)
+            try:
+                # Warm up (start the workers)
+                procfs.scan(attrs)
+                start = time.perf_counter()
+                for _ in range(nb):
+                    processes = procfs.scan(attrs)
+                ret[workers] = (time.perf_counter() - start) / nb
+            finally:
+                procfs.close()
+            print(f"{workers} worker(s): {len(processes)} processes scanned in {ret[workers] * 1000:.1f} ms")
+    return ret
+
+
+if __name__ == '__main__':
+    benchmark_backends()
+    benchmark_sharded(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -88,3 +88,12 @@ def test_glances_api_plugin_process():
 def test_glances_api_limits():
     assert isinstance(gl.cpu.limits, dict)
     assert isinstance(gl.cpu.limits, dict)
+
+
+def test_glances_api_cache():
+    # The plugin stats are updated at most once every ttl seconds
+    gl._cache.invalidate('mem')
+    with patch.object(gl._stats.get_plugin('mem'), 'update') as update:
+        assert gl.mem is not None
+        assert gl.mem is not None
+        assert update.call_count == 1
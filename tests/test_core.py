@@ -12,6 +12,7 @@
 
 import json
 import multiprocessing
+import tempfile
 import time
 import unittest
 from datetime import datetime
@@ -26,8 +27,9 @@ except ImportError:
     UTC = timezone.utc
 
 from glances import __version__
+from glances.cache import GlancesStatsCache
 from glances.events_list import GlancesEventsList
-from glances.filter import GlancesFilter, GlancesFilterList
+from glances.filter import GlancesFilter, GlancesFilterEngine, GlancesFilterList, GlancesRegexList
 from glances.globals import (
     BSD,
     LINUX,
@@ -46,8 +48,9 @@ from glances.outputs.glances_bars import Bar
 from glances.plugins.fs.zfs import zfs_enable, zfs_stats
 from glances.plugins.mpp import MppPlugin
 from glances.plugins.npu import NpuPlugin
-from glances.plugins.plugin.dag import get_plugin_dependencies
+from glances.plugins.plugin.dag import get_plugin_dependencies, get_plugins_graph
 from glances.plugins.plugin.model import GlancesPluginModel
+from glances.scheduler import GlancesTimingWheel, GlancesUpdateScheduler
 from glances.stats import GlancesStats
 from glances.thresholds import (
     GlancesThresholdCareful,
@@ -56,6 +59,7 @@ from glances.thresholds import (
     GlancesThresholds,
     GlancesThresholdWarning,
 )
+from glances.timer import Counter
 
 # Multiprocessing start method (on POSIX system)
 if LINUX or BSD or SUNOS or MACOS:
@@ -759,6 +763,136 @@ class TestGlances(unittest.TestCase):
         self.assertAlmostEqual(by_id['rockchip_jpegd']['load'], 0.0)
         self.assertEqual(by_id['rockchip_jpegd']['sessions'], 0)
 
+    def test_027_plugins_graph(self):
+        """Test Plugins graph used by the update scheduler"""
+        print('INFO: [TEST_027] Plugins graph')
+        graph = get_plugins_graph(['cpu', 'core', 'load', 'quicklook', 'alert', 'mem'])
+        self.assertEqual(graph['cpu'], {'core'})
+        self.assertEqual(graph['core'], set())
+        self.assertEqual(graph['mem'], set())
+        # fs is not in the list, so quicklook only waits for load
+        self.assertEqual(graph['quicklook'], {'load'})
+        # alert is updated at the end of the cycle
+        self.assertEqual(graph['alert'], {'cpu', 'core', 'load', 'quicklook', 'mem'})
+
+    def test_028_update_scheduler(self):
+        """Test the parallel plugins update scheduler"""
+        print('INFO: [TEST_028] Update scheduler')
+        updated = []
+
+        def update_fct(p):
+            if p == 'fs':
+                time.sleep(1)
+            updated.append(p)
+
+        plugins_list = ['alert', 'quicklook', 'fs', 'load', 'core', 'cpu', 'mem']
+        scheduler = GlancesUpdateScheduler(update_fct, workers=4)
+        self.assertTrue(scheduler.is_parallel())
+        # No deadline: wait for all the plugins (and follow the DAG)
+        scheduler.update(plugins_list)
+        self.assertEqual(sorted(updated), sorted(plugins_list))
+        self.assertLess(updated.index('core'), updated.index('cpu'))
+        self.assertLess(updated.index('fs'), updated.index('quicklook'))
+        self.assertEqual(updated[-1], 'alert')
+        # With a deadline: the slow fs plugin does not block the cycle
+        updated.clear()
+        counter = Counter()
+        scheduler.update(plugins_list, get_deadline=lambda p: 0.2)
+        self.assertLess(counter.get(), 1)
+        self.assertNotIn('fs', updated)
+        self.assertIn('quicklook', updated)
+        # The late plugin is not submitted again until its update is finished
+        updated.clear()
+        scheduler.update(plugins_list, get_deadline=lambda p: 0.2)
+        self.assertNotIn('fs', updated)
+        time.sleep(1)
+        self.assertIn('fs', updated)
+        scheduler.end()
+        # Sequential mode
+        updated.clear()
+        scheduler = GlancesUpdateScheduler(update_fct, workers=0)
+        scheduler.update(['mem', 'cpu'])
+        self.assertEqual(updated, ['mem', 'cpu'])
+
+    def test_029_timing_wheel(self):
+        """Test the plugins refresh timing wheel"""
+        print('INFO: [TEST_029] Timing wheel')
+        wheel = GlancesTimingWheel(tick=0.1, size=8)
+        plugins_list = ['cpu', 'mem', 'fs']
+        # Never scheduled plugins are always due
+        self.assertEqual(wheel.pop_due(plugins_list), plugins_list)
+        wheel.add('cpu', 0.2)
+        wheel.add('mem', 0.5)
+        # Refresh interval longer than a wheel round
+        wheel.add('fs', 1.2)
+        self.assertEqual(wheel.pop_due(plugins_list), [])
+        time.sleep(0.3)
+        self.assertEqual(wheel.pop_due(plugins_list), ['cpu'])
+        wheel.add('cpu', 0.2)
+        time.sleep(0.4)
+        self.assertEqual(wheel.pop_due(plugins_list), ['cpu', 'mem'])
+        time.sleep(0.6)
+        self.assertEqual(wheel.pop_due(['fs']), ['fs'])
+        # Removed plugins are due
+        wheel.add('fs', 10)
+        wheel.remove('fs')
+        self.assertEqual(wheel.pop_due(['fs']), ['fs'])
+
+    def test_030_stats_cache(self):
+        """Test the stats cache"""
+        print('INFO: [TEST_030] Stats cache')
+        cache = GlancesStatsCache(ttl=0.2)
+        self.assertFalse(cache.get('cpu'))
+        cache.set('cpu')
+        self.assertTrue(cache.get('cpu'))
+        self.assertTrue(cache.get('cpu'))
+        time.sleep(0.3)
+        self.assertFalse(cache.get('cpu'))
+        cache.set('cpu')
+        cache.invalidate('cpu')
+        self.assertFalse(cache.get('cpu'))
+        cache_stats = cache.get_stats()
+        self.assertEqual(cache_stats['keys']['cpu'], {'hit': 2, 'miss': 2, 'stale': 1})
+        self.assertEqual(cache_stats['hit'], 2)
+        self.assertEqual(cache_stats['hit_ratio'], 0.4)
+        # Two plugin updates in a row: the second one is served by the cache
+        stats.invalidate_cache('mem')
+        stats.update_plugin('mem')
+        stats.update_plugin('mem')
+        self.assertGreater(stats.get_cache_stats()['keys']['mem']['hit'], 0)
+        stats.get_plugin('mem').force_refresh()
+
+    def test_031_persistent_history(self):
+        """Test the persistent (memory-mapped) history"""
+        print('INFO: [TEST_031] Persistent history')
+        from glances.history import GlancesHistory
+
+        with tempfile.TemporaryDirectory() as path:
+            h = GlancesHistory(path=path)
+            for v in [1, 2, 3, 4]:
+                h.add('eth0_bytes', v, history_max_size=3)
+            h.add('load', 0.5, history_max_size=3)
+            h.add('load', None, history_max_size=3)
+            # Not numerical values are not persistent
+            h.add('percpu', [{'total': 10}], history_max_size=3)
+            h.close()
+            # Restart: the history is loaded from the files
+            h = GlancesHistory(path=path)
+            self.assertEqual(h.get_values('eth0_bytes'), [2, 3, 4])
+            self.assertEqual(h.get_values('load'), [0.5, None])
+            # Single values are converted as the history values
+            self.assertEqual(h.get()['eth0_bytes'][-1][1], 4)
+            self.assertEqual(h.stats_history['load'].history_value()[1], None)
+            self.assertIsInstance(h.stats_history['eth0_bytes'].history_value()[1], int)
+            self.assertNotIn('percpu', h.get())
+            self.assertEqual(len(h.get(resolution='1m')['eth0_bytes']), 1)
+            # New history size: the last values are kept
+            h.add('eth0_bytes', 5, history_max_size=5)
+            self.assertEqual(h.get_values('eth0_bytes'), [2, 3, 4, 5])
+            h.reset()
+            self.assertEqual(h.get_values('eth0_bytes'), [])
+            h.close()
+
     def test_093_auto_unit(self):
         """Test auto_unit classe"""
         print('INFO: [TEST_093] Auto unit')
@@ -862,6 +996,36 @@ class TestGlances(unittest.TestCase):
         self.assertEqual(a.history_len(), 3)
         self.assertEqual(a.history_value()[1], 4)
         self.assertEqual(a.history_mean(nb=3), 4.5)
+        # Check the ring buffer order (oldest first)
+        a.value = 5
+        self.assertEqual([v for _, v in a.history_raw()], [3, 4, 5])
+        self.assertEqual(a.history_values(nb=2), [4, 5])
+        self.assertEqual(len(a.history_json(nb=2)), 2)
+        self.assertLessEqual(a.history_raw()[0][0], a.history_raw()[-1][0])
+        # Float and not numerical values
+        a.value = 5.5
+        self.assertEqual(a.history_values(), [4, 5, 5.5])
+        a.value = None
+        self.assertEqual(a.history_values(), [5, 5.5, None])
+        a.history_reset()
+        self.assertEqual(a.history_len(), 0)
+        self.assertEqual(a.history_raw(), [])
+        # Integer too large for the array: timestamps and values are kept aligned
+        a.history_add((1.0, 1))
+        a.history_add((2.0, 2**70))
+        self.assertEqual(a.history_timestamps(), [1.0, 2.0])
+        self.assertEqual(a.history_values(), [1, 2**70])
+        # Last nb values and values since a timestamp in the ring order (wrapped buffer)
+        a = GlancesAttribute('a', history_max_size=5)
+        for i in range(1, 9):
+            a.history_add((float(i), i))
+        self.assertEqual(a.history_timestamps(), [4.0, 5.0, 6.0, 7.0, 8.0])
+        self.assertEqual(a.history_values(nb=3), [6, 7, 8])
+        self.assertEqual(a.history_values(nb=10), [4, 5, 6, 7, 8])
+        self.assertEqual([v for _, v in a.history_raw(since=6.0)], [6, 7, 8])
+        self.assertEqual([v for _, v in a.history_raw(nb=2, since=1.0)], [7, 8])
+        self.assertEqual([v for _, v in a.history_raw(since=4.5)], [5, 6, 7, 8])
+        self.assertEqual(a.history_raw(since=9.0), [])
 
     def test_098_history(self):
         """Test GlancesHistory classes"""
@@ -881,6 +1045,42 @@ class TestGlances(unittest.TestCase):
         h.reset()
         self.assertEqual(len(h.get()), 2)
         self.assertEqual(len(h.get()['a']), 0)
+        # Consolidated history (RRD-style)
+        from glances.history import GlancesHistoryTier
+
+        t = GlancesHistoryTier(60, 2)
+        for timestamp, value in [(0, 1), (30, 3), (60, 10), (120, 5), (150, 7), (180, 0)]:
+            t.add(timestamp, value)
+        # Only 2 closed buckets are kept + the current one
+        self.assertEqual(t.get(), [(60, 10), (120, 6), (180, 0)])
+        self.assertEqual(t.get(consolidation='min'), [(60, 10), (120, 5), (180, 0)])
+        self.assertEqual(t.get(consolidation='max', nb=2), [(120, 7), (180, 0)])
+        self.assertEqual(t.get(since=150), [(120, 6), (180, 0)])
+        h.add('a', 1, history_max_size=100)
+        self.assertEqual(len(h.get(resolution='1m')['a']), 1)
+        self.assertEqual(len(h.get(since=60)['a']), 1)
+        with self.assertRaises(ValueError):
+            h.get(resolution='1y')
+        # Ring buffers of the tier (one timestamp per bucket)
+        for timestamp in range(240, 600, 60):
+            t.add(timestamp, timestamp)
+        self.assertEqual(t.get(), [(420, 420), (480, 480), (540, 540)])
+        self.assertEqual(len(t._timestamps), 2)
+        # Configurable tiers (history_tiers option)
+        from glances.history import HISTORY_TIERS, parse_history_tiers
+
+        self.assertEqual(parse_history_tiers(None), HISTORY_TIERS)
+        self.assertEqual(parse_history_tiers('none'), {})
+        self.assertEqual(parse_history_tiers('10s:60, 1h:24,bad,0m:10'), {'10s': (10, 60), '1h': (3600, 24)})
+        h = GlancesHistory(tiers=parse_history_tiers('1h:24'))
+        h.add('a', 1, history_max_size=100)
+        self.assertEqual(len(h.get(resolution='1h')['a']), 1)
+        with self.assertRaises(ValueError):
+            h.get(resolution='1m')
+        h = GlancesHistory(tiers={})
+        h.add('a', 1, history_max_size=100)
+        self.assertEqual(h.stats_tiers['a'], {})
+        self.assertEqual(len(h.get()['a']), 1)
 
     def test_099_output_bars(self):
         """Test quick look plugin.
@@ -1255,6 +1455,750 @@ class TestGlances(unittest.TestCase):
         self.assertLessEqual(raw_stats['percent_min'], raw_stats['percent_mean'])
         self.assertGreaterEqual(raw_stats['percent_max'], raw_stats['percent_mean'])
 
+    def test_708_manage_rate(self):
+        """Test the rate decorator (only the previous gauges are memorized)."""
+        print('INFO: [TEST_708] Rate decorator')
+
+        test_fields = {
+            'name': {'description': 'Interface name'},
+            'bytes': {'description': 'Bytes', 'unit': 'byte', 'rate': True},
+            'errors': {'description': 'Errors', 'rate': True},
+        }
+
+        class TestRatePlugin(GlancesPluginModel):
+            def __init__(self):
+                super().__init__(args=None, config=None, fields_description=test_fields)
+                self.values = []
+
+            def get_key(self):
+                return 'name'
+
+            @GlancesPluginModel._manage_rate
+            def test_update(self):
+                return [dict(v) for v in self.values]
+
+        plugin = TestRatePlugin()
+        self.assertEqual(plugin._rate_fields, ['bytes', 'errors'])
+
+        # First update: no rate
+        plugin.values = [{'name': 'eth0', 'bytes': 1000, 'errors': 0}]
+        result = plugin.test_update()
+        self.assertNotIn('bytes_gauge', result[0])
+        self.assertEqual(plugin._previous_gauges, {'eth0': {'bytes': 1000, 'errors': 0}})
+
+        # Second update: delta and rate (a new interface only memorizes its gauges)
+        plugin.values = [{'name': 'eth0', 'bytes': 3000, 'errors': 0}, {'name': 'eth1', 'bytes': 10}]
+        result = plugin.test_update()
+        self.assertEqual(result[0]['bytes_gauge'], 3000)
+        self.assertEqual(result[0]['bytes'], 2000)
+        self.assertIn('bytes_rate_per_sec', result[0])
+        self.assertIn('time_since_update', result[0])
+        self.assertEqual(result[0]['errors'], 0)
+        self.assertEqual(result[0]['errors_rate_per_sec'], 0)
+        self.assertEqual(result[1], {'name': 'eth1', 'bytes': 10})
+
+        # Third update: rate for the new interface
+        plugin.values = [{'name': 'eth1', 'bytes': 30}]
+        result = plugin.test_update()
+        self.assertEqual(result[0]['bytes'], 20)
+        self.assertEqual(list(plugin._previous_gauges), ['eth1'])
+
+    def test_709_limits_table(self):
+        """Test the thresholds table (limits resolved once per stat name)."""
+        print('INFO: [TEST_709] Thresholds table')
+
+        class TestLimitsPlugin(GlancesPluginModel):
+            def __init__(self):
+                super().__init__(args=None, config=None, fields_description={'name': {'description': 'Name'}})
+                self.plugin_name = 'testlimits'
+                self.stats = [{'name': 'sda', 'used': 95}]
+
+            def get_key(self):
+                return 'name'
+
+        plugin = TestLimitsPlugin()
+        plugin.limits = {
+            'testlimits_careful': 50,
+            'testlimits_warning': 70,
+            'testlimits_critical': 90,
+            'testlimits_sda_critical': 95,
+            'testlimits_critical_action': 'echo {{used}}',
+            'testlimits_log': ['True'],
+        }
+        entry = plugin.get_limits_entry('testlimits_sda')
+        self.assertEqual((entry['careful'], entry['warning'], entry['critical']), (50, 70, 95))
+        self.assertTrue(entry['log'])
+        self.assertIs(plugin.get_limits_entry('testlimits_sda'), entry)
+        self.assertEqual(plugin.get_limit('critical', stat_name='TESTLIMITS_SDA'), 95)
+        self.assertEqual(plugin.get_limit('critical', stat_name='testlimits'), 90)
+        self.assertEqual(plugin.get_limit_action('critical', stat_name='testlimits_sda'), ('echo {{used}}', False))
+        self.assertEqual(plugin.get_limit_action('warning', stat_name='testlimits_sda'), (None, None))
+        self.assertTrue(plugin.get_limit_log('testlimits_sda'))
+        self.assertEqual(plugin.get_alert(80, header='sda'), 'WARNING_LOG')
+
+        # The mustache dict only contains the item of the action (the stats are not modified)
+        mustache_dict = plugin.get_mustache_dict('testlimits_sda', 'sda')
+        self.assertEqual(mustache_dict['used'], 95)
+        self.assertEqual(mustache_dict['critical'], 95)
+        self.assertIn('time', mustache_dict)
+        self.assertEqual(plugin.stats, [{'name': 'sda', 'used': 95}])
+        self.assertEqual(plugin.get_mustache_dict('testlimits_sdb', 'sdb'), {})
+
+        # The table is built again when the limits change
+        plugin.set_limits('sda_critical', 99)
+        self.assertEqual(plugin.get_limit('critical', stat_name='testlimits_sda'), 99)
+        self.assertEqual(plugin.get_alert(97, header='sda'), 'WARNING_LOG')
+
+    def test_710_incremental_views(self):
+        """Test the incremental views (views kept and only updated between two updates)."""
+        print('INFO: [TEST_710] Incremental views')
+
+        class TestViewsPlugin(GlancesPluginModel):
+            def __init__(self):
+                super().__init__(
+                    args=None,
+                    config=None,
+                    fields_description={
+                        'name': {'description': 'Name'},
+                        'percent': {'description': 'Percent', 'alert': True},
+                        'errors': {'description': 'Errors'},
+                    },
+                )
+                self.plugin_name = 'testviews'
+                self.limits = {'testviews_careful': 50, 'testviews_warning': 70, 'testviews_critical': 90}
+
+        # Stats stored in a dict
+        plugin = TestViewsPlugin()
+        plugin.stats = {'name': 'test', 'percent': 10}
+        views = plugin.update_views()
+        self.assertEqual(views['percent']['decoration'], 'OK')
+        self.assertEqual(views['name']['decoration'], 'DEFAULT')
+        percent_view = views['percent']
+        # Same band: the decoration is not computed again
+        plugin.stats = {'name': 'test', 'percent': 20}
+        self.assertIn('percent', plugin._views_bands)
+        views = plugin.update_views()
+        self.assertIs(views['percent'], percent_view)
+        self.assertEqual(views['percent']['decoration'], 'OK')
+        # Decoration set by the plugin is reset on the next update
+        views['name']['decoration'] = 'CRITICAL'
+        plugin.stats = {'name': 'test', 'percent': 80}
+        views = plugin.update_views()
+        self.assertEqual(views['percent']['decoration'], 'WARNING')
+        self.assertEqual(views['name']['decoration'], 'DEFAULT')
+        self.assertNotIn('percent', plugin._views_bands)
+        # New limits: the band is not used anymore
+        plugin.stats = {'name': 'test', 'percent': 20}
+        plugin.update_views()
+        plugin.set_limits('careful', 10)
+        self.assertEqual(plugin.update_views()['percent']['decoration'], 'CAREFUL')
+
+        # Stats stored in a list of dict (with hidden fields)
+        plugin = TestViewsPlugin()
+        plugin.get_key = lambda: 'name'
+        plugin.hide_zero = True
+        plugin.hide_zero_fields = ['errors']
+        plugin.stats = [{'key': 'name', 'name': 'a', 'errors': 0}, {'key': 'name', 'name': 'b', 'errors': 0}]
+        views = plugin.update_views()
+        self.assertTrue(views['a']['errors']['hidden'])
+        item_views = views['a']
+        plugin.stats = [{'key': 'name', 'name': 'a', 'errors': 3}]
+        views = plugin.update_views()
+        self.assertIs(views['a'], item_views)
+        self.assertFalse(views['a']['errors']['hidden'])
+        self.assertNotIn('b', views)
+        # Once displayed, the field is not hidden anymore
+        plugin.stats = [{'key': 'name', 'name': 'a', 'errors': 0}]
+        self.assertFalse(plugin.update_views()['a']['errors']['hidden'])
+        # New field: new dict but the views of the existing fields are kept
+        plugin.stats = [{'key': 'name', 'name': 'a', 'errors': 0, 'rx': 0}]
+        views = plugin.update_views()
+        self.assertIsNot(views['a'], item_views)
+        self.assertFalse(views['a']['errors']['hidden'])
+        self.assertEqual(views['a']['rx']['decoration'], 'DEFAULT')
+
+    def test_711_selfmon(self):
+        """Test the self-monitoring (durations, cache and memory of the plugins)."""
+        print('INFO: [TEST_711] Self-monitoring')
+        from glances.perf import GlancesPerf, get_size, glances_perf
+
+        perf = GlancesPerf(window=100)
+        for d in range(1, 201):
+            perf.add('cpu', 'update', d / 1000)
+        with perf.measure('csv', 'export', category='export'):
+            pass
+        summary = perf.get('cpu', 'update')
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['last'], 0.2)
+        self.assertAlmostEqual(summary['mean'], 0.1505)
+        self.assertEqual(summary['p99'], 0.2)
+        perf.watch_memory('cpu', lambda: {'total': 10.0})
+        ret = perf.get_stats()
+        self.assertEqual(ret['export']['csv']['durations']['export']['count'], 1)
+        self.assertEqual(ret['plugin']['cpu']['memory'], get_size({'total': 10.0}))
+        self.assertGreater(get_size([{'a': 'x' * 1000}]), 1000)
+
+        # Plugins updated by the stats are measured
+        stats.update(['mem'])
+        self.assertGreater(glances_perf.get('mem', 'update')['count'], 0)
+        self.assertGreater(glances_perf.get('mem', 'views')['count'], 0)
+        selfmon = stats.get_plugin('selfmon')
+        disable_selfmon = selfmon.args.disable_selfmon
+        selfmon.args.disable_selfmon = False
+        selfmon.update()
+        selfmon.args.disable_selfmon = disable_selfmon
+        mem = [i for i in selfmon.get_raw() if i['name'] == 'mem'][0]
+        self.assertEqual(mem['category'], 'plugin')
+        self.assertIsNotNone(mem['update_mean'])
+        self.assertGreater(mem['memory'], 0)
+        self.assertIsInstance(selfmon.msg_curse(max_width=30), list)
+        stats.get_plugin('mem').force_refresh()
+
+    def test_712_processes_partial_sort(self):
+        """Test the partial (top N) sort of the processes list."""
+        print('INFO: [TEST_712] Partial sort of the processes list')
+        from glances.processes import GlancesSortCache, glances_processes, sort_stats
+
+        processes = [
+            {'name': f'p{i}', 'cpu_percent': i % 7, 'memory_percent': i % 3, 'io_counters': [i, 0, 0, 0, 1]}
+            for i in range(200)
+        ]
+        for sorted_by, reverse in (('cpu_percent', True), ('name', False), ('io_counters', True)):
+            full = sort_stats(processes, sorted_by=sorted_by, reverse=reverse)
+            for limit in (0, 1, 10, 199, 200, 300):
+                self.assertEqual(sort_stats(processes, sorted_by=sorted_by, reverse=reverse, limit=limit), full[:limit])
+
+        # Ordering is cached (only the top are in order after a partial sort)
+        cache = GlancesSortCache()
+        ordered = cache.order(processes, nb=10)
+        self.assertEqual(len(ordered), 200)
+        self.assertEqual(ordered[:10], sort_stats(processes)[:10])
+        self.assertIs(cache.order(processes, nb=5), ordered)
+        self.assertIsNot(cache.order(processes, nb=20), ordered)
+        self.assertEqual(cache.sort(processes), sort_stats(processes))
+        self.assertEqual(cache.sort(processes, sorted_by='name', limit=3), sort_stats(processes, 'name', limit=3))
+
+        # Display and API use the order of the update (cursor position, see issue #3400)
+        max_processes = glances_processes.max_processes
+        glances_processes.max_processes = 5
+        try:
+            processlist = glances_processes.update()
+            top = sort_stats(processlist, glances_processes.sort_key, reverse=glances_processes.sort_reverse, limit=5)
+            self.assertEqual([p['pid'] for p in processlist[:5]], [p['pid'] for p in top])
+            self.assertEqual(glances_processes.get_list(sorted=True, limit=5), processlist[:5])
+            self.assertEqual(len(glances_processes.get_list(sorted=True)), len(processlist))
+        finally:
+            glances_processes.max_processes = max_processes
+
+    def test_713_filter_engine(self):
+        """Test the filter engine (single pass and per process cache)."""
+        print('INFO: [TEST_713] Filter engine')
+        from glances.processes import glances_processes
+
+        calls = []
+
+        def make_filter(name, value):
+            f = GlancesFilter()
+            f.filter = value
+
+            def match(process):
+                calls.append(name)
+                return f.is_filtered(process)
+
+            return (name, f.filter_key, f.filter_input, match)
+
+        processes = [
+            {'pid': i, 'create_time': 1.0, 'name': f'proc{i}', 'cmdline': [f'/bin/proc{i}'], 'username': 'nobody'}
+            for i in range(10)
+        ]
+        engine = GlancesFilterEngine()
+        engine.set_filters([make_filter('display', 'proc[0-4]'), make_filter('export', 'username:nobody')])
+        self.assertEqual(engine.match(processes), {'display': {0, 1, 2, 3, 4}, 'export': set(range(10))})
+        self.assertEqual(calls.count('display'), 10)
+        # Only the filters on another key than name/cmdline are applied again
+        calls.clear()
+        self.assertEqual(engine.match(processes)['display'], {0, 1, 2, 3, 4})
+        self.assertEqual(calls, ['export'] * 10)
+        # New program (exec) or new process with a reused pid
+        calls.clear()
+        processes[5]['cmdline'] = ['/bin/sh']
+        processes[6]['create_time'] = 2.0
+        processes[7]['name'] = 'proc3'
+        self.assertEqual(engine.match(processes)['display'], {0, 1, 2, 3, 4, 7})
+        self.assertEqual(calls.count('display'), 3)
+        # Same filters: the cache is kept / New filters: the cache is cleared
+        calls.clear()
+        engine.set_filters([make_filter('display', 'proc[0-4]'), make_filter('export', 'username:nobody')])
+        engine.match(processes)
+        self.assertEqual(calls.count('display'), 0)
+        engine.set_filters([make_filter('display', 'proc[5-9]')])
+        self.assertEqual(engine.match(processes), {'display': {5, 6, 8, 9}})
+        self.assertEqual(calls.count('display'), 10)
+        # Dead processes are removed from the cache
+        engine.match(processes[:2])
+        self.assertEqual(len(engine._cache), 2)
+
+        # Processes list: display, focus, export and watched filters
+        process_filter = glances_processes.process_filter
+        try:
+            glances_processes.process_filter = '.*python.*'
+            glances_processes.set_watched_regex(['python'])
+            processlist = [
+                {'pid': 1, 'name': 'python3', 'cmdline': ['python3', '-m', 'glances']},
+                {'pid': 2, 'name': 'bash', 'cmdline': ['/bin/bash']},
+            ]
+            matched = glances_processes.match_filters(processlist)
+            self.assertEqual(matched, {'display': {1}, 'watched': {1}})
+            self.assertEqual(glances_processes.update_list(processlist, matched), processlist[:1])
+            self.assertEqual(glances_processes.update_export_list(processlist, matched), [])
+        finally:
+            glances_processes.process_filter = process_filter
+            glances_processes.set_watched_regex([])
+
+    def test_714_programs_incremental(self):
+        """Test the programs list updated from the processes list changes."""
+        print('INFO: [TEST_714] Incremental programs list')
+        from glances.programs import GlancesPrograms, processes_to_programs
+
+        def process(pid, name, cpu, io=None, username='root'):
+            return {
+                'pid': pid,
+                'create_time': 1.0,
+                'time_since_update': 2,
+                'name': name,
+                'num_threads': 1,
+                'cpu_percent': cpu,
+                'memory_percent': 1.5,
+                'cpu_times': {'user': 1.0, 'system': 0.5},
+                'memory_info': {'rss': 100, 'vms': 200},
+                'io_counters': io or [0, 0, 0, 0, 0],
+                'username': username,
+                'nice': 0,
+                'status': 'S',
+            }
+
+        def by_name(programlist):
+            return {p['name']: p for p in programlist}
+
+        processes = [process(i, f'prog{i % 3}', i, io=[10 * i, i, 5 * i, 0, 1]) for i in range(10)]
+        programs = GlancesPrograms()
+        programlist = programs.update(processes)
+        self.assertIs(programs.update(processes), programlist)
+        prog0 = by_name(programlist)['prog0']
+        self.assertEqual(prog0['nprocs'], 4)
+        self.assertEqual(prog0['childrens'], [0, 3, 6, 9])
+        self.assertEqual(prog0['cpu_percent'], 18)
+        self.assertEqual(prog0['memory_info'], {'rss': 400, 'vms': 800})
+        self.assertEqual(prog0['cpu_times'], {'user': 4.0, 'system': 2.0})
+        self.assertEqual(prog0['io_counters'], [180, 18, 90, 0, 1])
+        self.assertEqual((prog0['username'], prog0['status'], prog0['pid']), ('root', 'S', '_'))
+        # The processes stats are not modified
+        self.assertEqual(processes[3]['io_counters'], [30, 3, 15, 0, 1])
+
+        # Changes: new stats, new process, exited process, new program (exec)
+        processes = [dict(p) for p in processes]
+        unchanged = by_name(programlist)['prog1']
+        processes[2]['cpu_percent'] = 50
+        processes[5]['username'] = 'nobody'
+        processes[6]['name'] = 'prog3'
+        del processes[9]
+        processes.append(process(10, 'prog2', 1))
+        programlist = programs.update(processes)
+        self.assertIs(by_name(programlist)['prog1'], unchanged)
+        self.assertEqual(len(programlist), 4)
+        for p in processes_to_programs(processes):
+            expected = dict(p, childrens=sorted(p['childrens']))
+            self.assertEqual(dict(by_name(programlist)[p['name']], childrens=sorted(p['childrens'])), expected)
+        self.assertEqual(by_name(programlist)['prog2']['username'], '_')
+        self.assertEqual(by_name(programlist)['prog2']['io_counters'], [150, 15, 75, 0, 1])
+        self.assertEqual(by_name(programlist)['prog0']['nprocs'], 2)
+
+        # All the processes of a program have exited
+        programlist = programs.update([p for p in processes if p['name'] != 'prog3'])
+        self.assertNotIn('prog3', by_name(programlist))
+        self.assertEqual(programs.update([]), [])
+
+    def test_715_export_worker(self):
+        """Test the export threads (bounded queue and overflow policies)."""
+        print('INFO: [TEST_715] Export worker')
+        import threading
+
+        from glances.exports.worker import GlancesExportWorker
+        from glances.perf import glances_perf
+        from glances.stats import GlancesStatsSnapshot
+
+        def slow_worker(overflow):
+            """Return a worker (queue of 2 cycles) blocked on its first export, and the exported list."""
+            exported = []
+            release = threading.Event()
+            started = threading.Event()
+
+            def export(snapshot):
+                started.set()
+                release.wait(5)
+                exported.append(snapshot)
+
+            worker = GlancesExportWorker(f'test_{overflow}', export, queue_size=2, overflow=overflow)
+            worker.put(0)
+            started.wait(5)
+            return worker, exported, release
+
+        # drop-oldest: the last cycles are exported
+        worker, exported, release = slow_worker('drop-oldest')
+        for i in range(1, 5):
+            self.assertTrue(worker.put(i))
+        self.assertEqual(worker.get_stats()['queue_depth'], 2)
+        self.assertEqual(worker.dropped, 2)
+        release.set()
+        worker.stop()
+        self.assertEqual(exported, [0, 3, 4])
+        self.assertFalse(worker.put(5))
+        stats_queue = glances_perf.get_stats(memory=False)['export']['test_drop-oldest']
+        self.assertEqual(stats_queue['queue']['exported'], 3)
+        self.assertEqual(stats_queue['durations']['latency']['count'], 3)
+
+        # drop-newest: the first cycles are exported
+        worker, exported, release = slow_worker('drop-newest')
+        self.assertEqual([worker.put(i) for i in range(1, 5)], [True, True, False, False])
+        release.set()
+        worker.stop()
+        self.assertEqual((exported, worker.dropped), ([0, 1, 2], 2))
+
+        # block: the caller waits for a free slot (nothing is dropped)
+        worker, exported, release = slow_worker('block')
+        worker.put(1)
+        worker.put(2)
+        blocked = threading.Thread(target=worker.put, args=(3,))
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+        release.set()
+        blocked.join(5)
+        worker.stop()
+        self.assertEqual((exported, worker.dropped), ([0, 1, 2, 3], 0))
+
+        # Hung exporter: the stop does not wait more than the timeout
+        worker, exported, release = slow_worker('drop-newest')
+        worker.put(1)
+        self.assertFalse(worker.stop(timeout=0.1))
+        release.set()
+        self.assertTrue(worker.stop(timeout=5))
+        self.assertEqual(exported, [0, 1])
+
+        # Unknown policy
+        self.assertEqual(GlancesExportWorker('test_unknown', print, overflow='unknown').overflow, 'drop-oldest')
+
+        # Each exporter gets its own copy of the cycle stats
+        stats.update(['mem'])
+        snapshot = GlancesStatsSnapshot(stats)
+        mem = snapshot.getAllExportsAsDict(plugin_list=['mem'])['mem']
+        mem['mem_careful'] = 50
+        self.assertNotIn('mem_careful', snapshot.getAllExportsAsDict(plugin_list=['mem'])['mem'])
+        self.assertNotIn('mem_careful', stats.get_plugin('mem').get_export())
+        self.assertEqual(
+            snapshot.getAllLimitsAsDict(plugin_list=['mem']), stats.getAllLimitsAsDict(plugin_list=['mem'])
+        )
+        self.assertIs(snapshot.get_plugin('mem'), stats.get_plugin('mem'))
+
+    def test_716_export_columns(self):
+        """Test the flattened stats shared by all the exporters of a cycle."""
+        print('INFO: [TEST_716] Flattened export stats')
+        import time
+
+        from glances.exports.export import GlancesExport, flatten_stats
+        from glances.stats import GlancesStatsSnapshot
+
+        class TestExport(GlancesExport):
+            def __init__(self):
+                super().__init__()
+                self.export_enable = True
+                self.exclude_fields = ['.*_careful']
+                self.exported = {}
+
+            def export(self, name, columns, points):
+                self.exported[name] = dict(zip(columns, points))
+
+        stats_dict = {'key': 'name', 'name': 'eth0', 'rx': 1, 'up': True, 'addr': ['a', 'b'], 'io': {'r': 2}}
+        self.assertEqual(
+            flatten_stats([stats_dict]),
+            (
+                ('eth0.key', 'eth0.name', 'eth0.rx', 'eth0.up', 'eth0.addr', 'eth0.ior'),
+                ('eth0.key', 'eth0.name', 'eth0.rx', 'eth0.up', 'eth0.addr', 'r'),
+                ('name', 'eth0', 1, 'true', 'a b', 2),
+            ),
+        )
+        exporter = TestExport()
+        self.assertEqual(exporter.build_export({'rx': 1, 'rx_careful': 2}), (['rx'], [1]))
+
+        # Stats are flattened once per cycle (with the limits)
+        stats.update(['mem', 'load'])
+        snapshot = GlancesStatsSnapshot(stats)
+        columns = snapshot.getExportColumns('mem')
+        self.assertIs(snapshot.getExportColumns('mem'), columns)
+        self.assertEqual(columns, stats.getExportColumns('mem'))
+        self.assertIn('mem_careful', columns[0])
+        exporters = [TestExport() for _ in range(3)]
+        for e in exporters:
+            e.update(snapshot)
+        self.assertEqual(exporters[0].exported, exporters[2].exported)
+        self.assertIn('total', exporters[0].exported['mem'])
+        self.assertNotIn('mem_careful', exporters[0].exported['mem'])
+        self.assertNotIn('mem_disable', exporters[0].exported['mem'])
+
+        # Benchmark: flatten for each exporter vs once per cycle
+        nb = 20
+        plugins = [p for p in stats.getPluginsList() if p not in GlancesExport.non_exportable_plugins]
+        for nb_exporters in (1, 4, 8):
+            start = time.perf_counter()
+            for _ in range(nb):
+                for _ in range(nb_exporters):
+                    for p in plugins:
+                        stats.getExportColumns(p)
+            each = (time.perf_counter() - start) / nb
+            start = time.perf_counter()
+            for _ in range(nb):
+                snapshot = GlancesStatsSnapshot(stats)
+                for _ in range(nb_exporters):
+                    for p in plugins:
+                        snapshot.getExportColumns(p)
+            shared = (time.perf_counter() - start) / nb
+            print(f'{nb_exporters} exporter(s): {each * 1000:.2f} ms (each) vs {shared * 1000:.2f} ms (shared)')
+
+    def test_717_regex_list(self):
+        """Test the compiled and memoised regex lists (exclude_fields, show and hide)."""
+        print('INFO: [TEST_717] Regex list')
+        from glances.exports.export import GlancesExport
+
+        regex = GlancesRegexList(['.*_critical', 'SDA.*', '[bad', r'(a)\1'])
+        self.assertEqual(len(regex._re), 3)
+        self.assertTrue(regex.match('mem_critical'))
+        self.assertTrue(regex.match('sda1'))
+        self.assertTrue(regex.match('aa'))
+        self.assertFalse(regex.match('mem_critical2'))
+        self.assertEqual(regex._cache, {'mem_critical': True, 'sda1': True, 'aa': True, 'mem_critical2': False})
+        regex = GlancesRegexList(['.*_critical', 'sda.*'])
+        self.assertEqual(len(regex._re), 1)
+        self.assertEqual([regex.match(i) for i in ('sda', 'cpu_critical', 'cpu')], [True, True, False])
+        self.assertFalse(GlancesRegexList([]).match('cpu'))
+
+        # Exporters: the decision is computed again when the option is loaded again
+        exporter = GlancesExport()
+        self.assertFalse(exporter.is_excluded('mem_careful'))
+        exporter.exclude_fields = ['.*_careful']
+        self.assertEqual(exporter.exclude_fields, ['.*_careful'])
+        self.assertTrue(exporter.is_excluded('mem_careful'))
+        self.assertEqual(exporter.build_export({'total': 1, 'total_careful': 2}), (['total'], [1]))
+
+        # Plugins: show and hide options (with alias)
+        plugin = stats.get_plugin('diskio')
+        limits = dict(plugin.limits)
+        alias = plugin.alias
+        try:
+            plugin.set_limits('hide', ['loop.*', 'sdb'])
+            plugin.alias = {'sdc': 'backup'}
+            self.assertTrue(plugin.is_hide('loop0'))
+            self.assertTrue(plugin.is_hide('SDB'))
+            self.assertFalse(plugin.is_hide('sda'))
+            self.assertTrue(plugin.is_display('sda'))
+            plugin.set_limits('hide', ['sda'])
+            self.assertTrue(plugin.is_hide('sda'))
+            self.assertFalse(plugin.is_hide('loop0'))
+            plugin.set_limits('show', ['back.*'])
+            self.assertTrue(plugin.is_display('sdc'))
+            self.assertFalse(plugin.is_display('sdb'))
+        finally:
+            plugin.limits = limits
+            plugin.alias = alias
+
+    def test_718_export_batch(self):
+        """Test the batch mode of the exporters (bulk export)."""
+        print('INFO: [TEST_718] Export batch mode')
+        from glances.exports.export import GlancesExport
+        from glances.stats import GlancesStatsSnapshot
+
+        class BulkExport(GlancesExport):
+            bulk = True
+
+            def __init__(self, config=None):
+                super().__init__(config=config)
+                self.export_enable = True
+                self.bulks = []
+
+            def export(self, name, columns, points):
+                raise AssertionError('export should not be called in batch mode')
+
+            def export_bulk(self, rows):
+                self.bulks.append(rows)
+
+        self.assertFalse(GlancesExport().is_bulk())
+        exporter = BulkExport(config=test_config)
+        self.assertTrue(exporter.is_bulk())
+        self.assertEqual((exporter.batch_size, exporter.batch_cycles, exporter.batch_timeout), (1000, 1, 0))
+
+        stats.update(['mem', 'load'])
+        snapshot = GlancesStatsSnapshot(stats)
+        nb_plugins = len([p for p in exporter.plugins_to_export(snapshot) if snapshot.getExportColumns(p)])
+
+        # Default: one bulk per cycle
+        exporter.update(snapshot)
+        self.assertEqual(len(exporter.bulks), 1)
+        self.assertEqual(len(exporter.bulks[0]), nb_plugins)
+        self.assertIn('mem', [name for name, _, _, _ in exporter.bulks[0]])
+        # Rows are stamped with the time of their cycle
+        self.assertEqual({timestamp for _, _, _, timestamp in exporter.bulks[0]}, {snapshot.timestamp})
+
+        # Several cycles
+        exporter.bulks = []
+        exporter.batch_cycles = 3
+        for _ in range(5):
+            exporter.update(snapshot)
+        self.assertEqual([len(b) for b in exporter.bulks], [3 * nb_plugins])
+        exporter.flush_batch()
+        self.assertEqual([len(b) for b in exporter.bulks], [3 * nb_plugins, 2 * nb_plugins])
+        exporter.flush_batch()
+        self.assertEqual(len(exporter.bulks), 2)
+
+        # Size and time triggers
+        exporter.bulks = []
+        exporter.batch_size = 2
+        exporter.add_to_batch('a', ['x'], [1], timestamp=1.0)
+        exporter.add_to_batch('b', ['x'], [2], timestamp=2.0)
+        self.assertEqual(exporter.bulks, [[('a', ['x'], [1], 1.0), ('b', ['x'], [2], 2.0)]])
+        exporter.batch_size = 1000
+        exporter.batch_timeout = 10
+        exporter.add_to_batch('c', ['x'], [3], timestamp=3.0)
+        exporter.end_batch_cycle()
+        self.assertEqual(len(exporter.bulks), 1)
+        exporter._batch_start -= 10
+        exporter.end_batch_cycle()
+        self.assertEqual(exporter.bulks[1], [('c', ['x'], [3], 3.0)])
+
+    def test_719_export_spool(self):
+        """Test the spool of the rows which could not be exported (server unreachable)."""
+        print('INFO: [TEST_719] Export spool')
+        import os
+        import socket
+        import threading
+
+        from glances.exports.export import GlancesExport
+        from glances.exports.spool import GlancesExportSpool
+
+        # Local port: connections are refused until the server is started
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        class TCPExport(GlancesExport):
+            bulk = True
+
+            def __init__(self, config=None):
+                super().__init__(config=config)
+                self.export_enable = True
+
+            def export_bulk(self, rows):
+                try:
+                    with socket.create_connection(('127.0.0.1', port), timeout=5) as s:
+                        s.sendall(json.dumps(rows).encode() + b'\n')
+                        # Wait for the server acknowledgement
+                        return s.recv(1) == b'1'
+                except OSError:
+                    return False
+
+        received = []
+
+        def serve(server):
+            while True:
+                conn, _ = server.accept()
+                with conn, conn.makefile('rb') as f:
+                    line = f.readline()
+                    if line == b'stop\n':
+                        return
+                    received.append(json.loads(line))
+                    conn.sendall(b'1')
+
+        with tempfile.TemporaryDirectory() as path:
+            exporter = TCPExport()
+            exporter.spool_path = path
+            exporter.spool_segment_size = 100
+            exporter.spool_replay_rows = 4
+
+            # Server unreachable: the batches are spooled (several segments)
+            for i in range(6):
+                exporter.add_to_batch('cycle', ['n'], [i], timestamp=i)
+                exporter.add_to_batch('cycle', ['n'], [i], timestamp=i)
+                exporter.end_batch_cycle()
+            spool = exporter.get_spool()
+            self.assertEqual(spool.path, os.path.join(path, 'test_core'))
+            self.assertFalse(spool.is_empty())
+            self.assertGreater(len([f for f in os.listdir(spool.path) if f.endswith('.spool')]), 1)
+
+            # Server is back: live export then replay, oldest first and throttled
+            server = socket.create_server(('127.0.0.1', port))
+            thread = threading.Thread(target=serve, args=(server,), daemon=True)
+            thread.start()
+            try:
+                for i in range(6, 10):
+                    exporter.add_to_batch('cycle', ['n'], [i], timestamp=i)
+                    exporter.end_batch_cycle()
+                    # The live batch is exported first, then the oldest spooled rows
+                    self.assertEqual(received[-2], [['cycle', ['n'], [i], i]])
+                with socket.create_connection(('127.0.0.1', port)) as s:
+                    s.sendall(b'stop\n')
+                thread.join(5)
+            finally:
+                server.close()
+            self.assertTrue(all(len(b) <= exporter.spool_replay_rows for b in received))
+            # Replayed rows keep the time of their cycle
+            replayed = [(p, t) for b in received if len(b) > 1 for _, _, p, t in b]
+            self.assertEqual(replayed, [([i], i) for i in range(6) for _ in range(2)])
+            self.assertTrue(spool.is_empty())
+            self.assertEqual([f for f in os.listdir(spool.path) if f.endswith('.spool')], [])
+
+            # The current segment is closed when the exporter exits
+            exporter.add_to_batch('cycle', ['n'], [10], timestamp=10)
+            exporter.end_batch_cycle()
+            self.assertFalse(spool._file.closed)
+            segment = spool._file
+            exporter.exit()
+            self.assertTrue(segment.closed)
+            self.assertIsNone(spool._file)
+
+            # Size cap: the oldest segments are removed
+            spool = GlancesExportSpool(os.path.join(path, 'capped'), segment_size=50, max_size=100)
+            for i in range(20):
+                spool.append([['cycle', ['n'], [i], i]])
+            self.assertLessEqual(len(spool), 100 + 50)
+            self.assertGreater(spool.dropped, 0)
+            rows, _ = spool.read(1000)
+            self.assertEqual(rows[0][2], [spool.dropped])
+
+            # The replay position is kept after a restart
+            first = spool.dropped
+            self.assertEqual(spool.replay(lambda rows: [], 1), 1)
+            spool.close()
+            spool = GlancesExportSpool(os.path.join(path, 'capped'), segment_size=50, max_size=100)
+            rows, _ = spool.read(1)
+            self.assertEqual(rows, [['cycle', ['n'], [first + 1], first + 1]])
+            spool.close()
+
+            # Partial export: only the rows not exported are spooled again (no duplicates)
+            spool = GlancesExportSpool(os.path.join(path, 'partial'))
+            spool.append([['a', ['n'], [1], 1], ['b', ['n'], [1], 1]])
+            self.assertEqual(spool.replay(lambda rows: [r for r in rows if r[0] == 'b'], 10), 1)
+            self.assertEqual(spool.read(10)[0], [['b', ['n'], [1], 1]])
+            self.assertEqual(spool.replay(lambda rows: rows, 10), 0)
+            self.assertEqual(spool.replay(lambda rows: [], 10), 1)
+            self.assertTrue(spool.is_empty())
+            spool.close()
+
+            # Only the bulk exporters have a spool
+            exporter = GlancesExport()
+            exporter.spool_path = os.path.join(path, 'not_bulk')
+            exporter.flush_batch()
+            self.assertIsNone(exporter.get_spool())
+            self.assertFalse(os.path.exists(exporter.spool_path))
+
     # def test_700_secure(self):
     #     """Test secure functions"""
     #     print('INFO: [TEST_700] Secure functions')
@@ -124,6 +124,7 @@ class TestGlancesMcp(unittest.TestCase):
         print(f"Resource templates returned: {templates}")
         self.assertIn('glances://stats/{plugin}', templates)
         self.assertIn('glances://stats/{plugin}/history', templates)
+        self.assertIn('glances://stats/{plugin}/history/{resolution}', templates)
         self.assertIn('glances://limits/{plugin}', templates)
 
     def test_012_read_resource_plugins(self):
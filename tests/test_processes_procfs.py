@@ -0,0 +1,461 @@
+#!/usr/bin/env python
+#
+# Glances - An eye on your system
+#
+# SPDX-FileCopyrightText: 2026 Nicolas Hennion <nicolas@nicolargo.com>
+#
+# SPDX-License-Identifier: LGPL-3.0-only
+#
+
+"""Tests for the procfs processes scan backend."""
+
+import argparse
+import os
+import pwd
+import subprocess
+import threading
+import time
+from unittest.mock import patch
+
+import psutil
+import pytest
+
+from glances.filter import GlancesFilterList
+from glances.globals import LINUX
+from glances.proc_connector import (
+    PROC_EVENT_EXEC,
+    PROC_EVENT_EXIT,
+    PROC_EVENT_FORK,
+    GlancesProcConnector,
+    pack_proc_event,
+)
+from glances.processes import GlancesExtendedStatsWorker, GlancesSortCache, glances_processes
+from glances.procfs import GlancesProcfs
+
+pytestmark = pytest.mark.skipif(not LINUX, reason="procfs backend is only available on Linux")
+
+ATTRS = ['cpu_percent', 'cpu_times', 'memory_percent', 'name', 'status', 'num_threads', 'io_counters']
+ATTRS += ['memory_info', 'nice', 'pid', 'gids', 'cpu_num']
+
+
+def make_procfs(path, nb=100, start=1000):
+    """Create a synthetic /proc tree with nb processes (pid from start)."""
+    for pid in range(start, start + nb):
+        d = path / str(pid)
+        d.mkdir()
+        # pid (comm) state ppid ... utime(14) stime(15) ... nice(19) num_threads(20) ... starttime(22) ...
+        fields = ['S', '1'] + ['0'] * 9 + [str(pid), '50', '2', '1', '20', '0', '3', '0', str(pid * 10)]
+        fields += ['0'] * 16 + ['1'] + ['0'] * 2 + ['7']
+        (d / 'stat').write_text(f"{pid} (proc {pid}) {' '.join(fields)}\n")
+        (d / 'statm').write_text('1000 200 50 10 0 300 0\n')
+        (d / 'status').write_text(f'Name:\tproc\nUid:\t{pid}\t{pid}\t{pid}\t{pid}\nGid:\t0\t0\t0\t0\n')
+        (d / 'io').write_text('rchar: 1\nwchar: 2\nsyscr: 3\nsyscw: 4\nread_bytes: 4096\nwrite_bytes: 8192\n')
+        (d / 'cmdline').write_bytes(b'/usr/bin/proc\x00--pid\x00' + str(pid).encode() + b'\x00')
+    # Not a process
+    (path / 'self').mkdir(exist_ok=True)
+    return path
+
+
+@pytest.fixture
+def procfs(tmp_path):
+    """Return a procfs scanner on a synthetic /proc tree."""
+    return GlancesProcfs(procfs_path=str(make_procfs(tmp_path)))
+
+
+def test_procfs_scan_synthetic(procfs):
+    """Check the parsing of the /proc files."""
+    processes = {p['pid']: p for p in procfs.scan(ATTRS + ['cmdline'])}
+    assert len(processes) == 100
+    p = processes[1042]
+    assert p['name'] == 'proc 1042'
+    assert p['status'] == psutil.STATUS_SLEEPING
+    assert p['cpu_times']['user'] == 1042 / procfs.clock_ticks
+    assert p['cpu_times']['system'] == 50 / procfs.clock_ticks
+    assert p['nice'] == 0
+    assert p['num_threads'] == 3
+    assert p['cpu_num'] == 1
+    assert p['memory_info']['rss'] == 200 * procfs.page_size
+    assert p['memory_info']['vms'] == 1000 * procfs.page_size
+    assert p['gids'] == {'real': 0, 'effective': 0, 'saved': 0}
+    assert p['io_counters'] == (3, 4, 4096, 8192)
+    assert p['cmdline'] == ['/usr/bin/proc', '--pid', '1042']
+    # First scan: no CPU percent
+    assert p['cpu_percent'] == 0.0
+
+
+def test_procfs_cpu_percent(procfs, tmp_path):
+    """Check the CPU percent is computed between two scans (and reset if the pid is reused)."""
+    procfs.scan(['cpu_percent'])
+    stat = tmp_path / '1000' / 'stat'
+    stat.write_text(stat.read_text().replace(' 1000 50 ', f' {1000 + procfs.clock_ticks} 50 '))
+    time.sleep(0.1)
+    processes = {p['pid']: p for p in procfs.scan(['cpu_percent'])}
+    assert processes[1000]['cpu_percent'] > 100
+    assert processes[1001]['cpu_percent'] == 0.0
+    # Same pid but new process (start time changed)
+    stat.write_text(stat.read_text().replace(' 10000', ' 20000'))
+    processes = {p['pid']: p for p in procfs.scan(['cpu_percent'])}
+    assert processes[1000]['cpu_percent'] == 0.0
+
+
+def test_procfs_username(procfs):
+    """Check the user name (uid without name)."""
+    p = procfs.scan(['username'], pids=[1001])[0]
+    try:
+        assert p['username'] == pwd.getpwuid(1001).pw_name
+    except KeyError:
+        assert p['username'] == '1001'
+    # Process has gone
+    assert procfs.scan(['name'], pids=[999999]) == []
+
+
+def test_procfs_same_as_psutil():
+    """Compare the procfs backend with PsUtil for the current process."""
+    procfs = GlancesProcfs()
+    p = procfs.scan(ATTRS + ['cmdline', 'username'], pids=[os.getpid()])[0]
+    ref = psutil.Process().as_dict(attrs=ATTRS + ['cmdline', 'username'], ad_value=None)
+    for k in ['pid', 'name', 'status', 'num_threads', 'nice', 'cmdline', 'username']:
+        assert p[k] == ref[k], k
+    assert p['gids'] == ref['gids']._asdict()
+    # Memory, CPU and IO could change between the two grabs
+    assert p['memory_info']['vms'] > 0 and ref['memory_info'].vms > 0
+    assert p['cpu_times']['user'] <= ref['cpu_times'].user
+    assert p['io_counters'][2] <= ref['io_counters'].read_bytes
+
+
+def test_processes_procfs_backend():
+    """Check the processes list built with the procfs backend."""
+    glances_processes.set_backend('procfs')
+    try:
+        assert glances_processes.backend == 'procfs'
+        processlist = glances_processes.update()
+        assert len(processlist) > 0
+        me = [p for p in processlist if p['pid'] == os.getpid()][0]
+        assert me['key'] == 'pid'
+        assert len(me['io_counters']) == 5
+        assert isinstance(me['cpu_times'], dict)
+        assert glances_processes.processcount['total'] == len(processlist)
+    finally:
+        glances_processes.set_backend('psutil')
+    assert glances_processes.backend == 'psutil'
+    glances_processes.set_backend('unknown')
+    assert glances_processes.backend == 'psutil'
+
+
+def test_processes_table(tmp_path):
+    """Check the processes table (records kept between two updates, pid reuse and dead processes)."""
+    glances_processes.set_backend('procfs')
+    glances_processes._procfs = GlancesProcfs(procfs_path=str(make_procfs(tmp_path)))
+    try:
+        processes = {p['pid']: p for p in glances_processes.update()}
+        assert len(glances_processes.processes_table) == 100
+        assert processes[1000]['io_counters'] == [4096, 8192, 0, 0, 0]
+        record = glances_processes.processes_table[(1000, processes[1000]['create_time'])]
+        assert record.io_old == [4096, 8192]
+        assert record.cached['cmdline'] == ['/usr/bin/proc', '--pid', '1000']
+        # IO rate (previous IO counters are taken from the record)
+        io = tmp_path / '1000' / 'io'
+        io.write_text(io.read_text().replace('read_bytes: 4096', 'read_bytes: 6144'))
+        # Dead process
+        for f in (tmp_path / '1001').iterdir():
+            f.unlink()
+        (tmp_path / '1001').rmdir()
+        # Same pid but new process (start time changed)
+        stat = tmp_path / '1002' / 'stat'
+        stat.write_text(stat.read_text().replace(' 10020', ' 20020'))
+        processes = {p['pid']: p for p in glances_processes.update()}
+        assert processes[1000]['io_counters'] == [6144, 8192, 4096, 8192, 1]
+        assert glances_processes.processes_table[(1000, processes[1000]['create_time'])] is record
+        assert processes[1002]['io_counters'][4] == 0
+        assert len(glances_processes.processes_table) == 99
+        assert 1001 not in [pid for pid, _ in glances_processes.processes_table]
+    finally:
+        glances_processes.set_backend('psutil')
+
+
+def test_processes_full_stats_top(tmp_path):
+    """Check the two tiers collection (full stats only for the top, exported and watched processes)."""
+    glances_processes.set_backend('procfs')
+    glances_processes._procfs = GlancesProcfs(procfs_path=str(make_procfs(tmp_path)))
+    glances_processes.full_stats_top = 10
+    glances_processes.set_sort_key('name', False)
+    glances_processes.export_process_filter = 'proc 1050'
+    glances_processes.set_watched_regex(['proc 1060', '[bad regex'])
+    args = glances_processes.args
+    try:
+        # Programs are the aggregation of all the processes: all the stats are grabbed
+        glances_processes.args = argparse.Namespace(programs=False, disable_programlist=False)
+        assert glances_processes.get_details_attrs() == []
+        glances_processes.args = argparse.Namespace(programs=False, disable_programlist=True)
+        assert 'memory_info' in glances_processes.get_details_attrs()
+        for _ in range(2):
+            processes = glances_processes.update()
+        full = [p['pid'] for p in processes if p['memory_info'] is not None]
+        assert full == list(range(1000, 1010)) + [1050, 1060]
+        assert processes[0]['io_counters'] == [4096, 8192, 4096, 8192, 1]
+        assert processes[0]['nice'] == 0
+        assert processes[20]['io_counters'] == [0, 0, 0, 0, 0]
+        assert processes[20]['nice'] is None
+        # Stats needed to sort and filter are grabbed for all the processes
+        assert all(p['cmdline'] and p['cpu_percent'] is not None for p in processes)
+        assert [p['pid'] for p in glances_processes.get_export()] == [1050]
+    finally:
+        glances_processes.args = args
+        glances_processes.full_stats_top = None
+        glances_processes.set_sort_key('auto')
+        glances_processes._filter_export = GlancesFilterList()
+        glances_processes.set_watched_regex([])
+        glances_processes.set_backend('psutil')
+
+
+def test_processes_background_collector(tmp_path):
+    """Check the background collector (snapshot published by the thread, extended stats applied on read)."""
+    glances_processes.set_backend('procfs')
+    glances_processes._procfs = GlancesProcfs(procfs_path=str(make_procfs(tmp_path)))
+    glances_processes.start_collector(0.05)
+    try:
+        assert len(glances_processes.update()) == 100
+        assert glances_processes.get_count()['total'] == 100
+        for f in (tmp_path / '1001').iterdir():
+            f.unlink()
+        (tmp_path / '1001').rmdir()
+        for _ in range(100):
+            if len(glances_processes.update()) == 99:
+                break
+            time.sleep(0.05)
+        assert glances_processes.get_count()['total'] == 99
+        # Extended stats are only added to the current stats (not to the snapshot)
+        snapshot = glances_processes._snapshot
+        glances_processes.extended_process = {'pid': 1000}
+        glances_processes.set_extended_stats = lambda proc: {'num_fds': 42, 'extended_stats': True}
+        processlist = glances_processes.set_snapshot(snapshot)
+        assert [p for p in processlist if p['pid'] == 1000][0]['num_fds'] == 42
+        assert glances_processes.extended_process['num_fds'] == 42
+        assert all('num_fds' not in p for p in snapshot.processlist)
+    finally:
+        del glances_processes.set_extended_stats
+        glances_processes.extended_process = None
+        glances_processes.stop_collector()
+        glances_processes.set_backend('psutil')
+    assert glances_processes._collector is None
+
+
+def test_processes_scan_lock(tmp_path):
+    """Check a change of the scan state waits for the end of the running scan (background collector)."""
+    glances_processes.set_backend('procfs')
+    glances_processes._procfs = GlancesProcfs(procfs_path=str(make_procfs(tmp_path)))
+    scanning, release = threading.Event(), threading.Event()
+    build_process_list = glances_processes.build_process_list
+
+    def blocking_build_process_list(sorted_attrs):
+        scanning.set()
+        release.wait(5)
+        return build_process_list(sorted_attrs)
+
+    glances_processes.build_process_list = blocking_build_process_list
+    scan = threading.Thread(target=glances_processes.scan, args=(GlancesSortCache(),))
+    reset = threading.Thread(target=glances_processes.reset_internal_cache)
+    try:
+        scan.start()
+        assert scanning.wait(5)
+        reset.start()
+        reset.join(0.2)
+        # The reset waits for the scan
+        assert reset.is_alive()
+        release.set()
+        scan.join(5)
+        reset.join(5)
+        assert not reset.is_alive()
+        assert all(r.cached is None for r in glances_processes.processes_table.values())
+    finally:
+        release.set()
+        del glances_processes.build_process_list
+        glances_processes.set_backend('psutil')
+
+
+def test_procfs_scan_sharded(tmp_path):
+    """Check the sharded scan returns the same stats than the scan in the current process."""
+    path = str(make_procfs(tmp_path))
+    # Gids above 2**31 - 1 (nfsnobody, user namespaces)
+    (tmp_path / '1001' / 'status').write_text('Name:\tproc\nUid:\t0\t0\t0\t0\nGid:\t4294967294\t4294967294\t0\t0\n')
+    attrs = ATTRS + ['cmdline', 'username']
+    ref = {p['pid']: p for p in GlancesProcfs(procfs_path=path).scan(attrs)}
+    procfs = GlancesProcfs(procfs_path=path, workers=3)
+    try:
+        processes = {p['pid']: p for p in procfs.scan(attrs)}
+        assert processes == ref
+        assert processes[1001]['gids'] == {'real': 4294967294, 'effective': 4294967294, 'saved': 0}
+        assert procfs.workers == 3
+        # Memory percent without the memory info (details only grabbed for the top processes)
+        attrs = ['memory_percent', 'name', 'cpu_percent']
+        processes = {p['pid']: p for p in procfs.scan(attrs)}
+        ref = {p['pid']: p for p in GlancesProcfs(procfs_path=path).scan(attrs)}
+        assert {pid: p['memory_percent'] for pid, p in processes.items()} == {
+            pid: p['memory_percent'] for pid, p in ref.items()
+        }
+        assert all(p['memory_percent'] > 0 and 'memory_info' not in p for p in processes.values())
+        # CPU percent is computed by the main process (between two sharded scans)
+        stat = tmp_path / '1000' / 'stat'
+        stat.write_text(stat.read_text().replace(' 1000 50 ', f' {1000 + procfs.clock_ticks} 50 '))
+        time.sleep(0.1)
+        processes = {p['pid']: p for p in procfs.scan(['cpu_percent', 'name'])}
+        assert processes[1000]['cpu_percent'] > 100
+        assert processes[1001] == {'pid': 1001, 'cpu_percent': 0.0, 'name': 'proc 1001'}
+        # Fallback to the scan in the current process: the previous CPU times are kept
+        procfs.close()
+        procfs.workers = 1
+        stat.write_text(
+            stat.read_text().replace(f' {1000 + procfs.clock_ticks} 50 ', f' {1000 + 2 * procfs.clock_ticks} 50 ')
+        )
+        time.sleep(0.1)
+        processes = {p['pid']: p for p in procfs.scan(['cpu_percent', 'name'])}
+        assert processes[1000]['cpu_percent'] > 100
+    finally:
+        procfs.close()
+
+
+def test_proc_connector_events(tmp_path):
+    """Check the pids set maintained with (injected) proc connector events."""
+    connector = GlancesProcConnector(procfs_path=str(make_procfs(tmp_path)))
+    assert len(connector.get_pids()) == 100
+    make_procfs(tmp_path, nb=1, start=5000)
+    connector.inject(PROC_EVENT_FORK, 1000, 1000, 5000, 5000)
+    # Thread (pid != tgid)
+    connector.inject(PROC_EVENT_FORK, 1000, 1000, 5001, 5000)
+    connector.inject(PROC_EVENT_EXIT, 1001, 1001)
+    connector.inject(PROC_EVENT_EXEC, 1002, 1002)
+    # Several events in a single message
+    connector.handle_message(
+        pack_proc_event(PROC_EVENT_EXIT, 1003, 1003) + pack_proc_event(PROC_EVENT_EXEC, 1004, 1004)
+    )
+    pids = connector.get_pids()
+    assert 5000 in pids and 5001 not in pids
+    assert 1001 not in pids and 1003 not in pids
+    assert len(pids) == 99
+    assert connector.pop_exec() == {1002, 1004}
+    assert connector.pop_exec() == set()
+
+
+def test_processes_proc_connector(tmp_path):
+    """Check the processes list built with the proc connector (and the fallback to the scan)."""
+    glances_processes.set_backend('procfs')
+    glances_processes._procfs = GlancesProcfs(procfs_path=str(make_procfs(tmp_path)))
+    connector = GlancesProcConnector(procfs_path=str(tmp_path))
+    try:
+        assert glances_processes.enable_proc_connector(connector)
+        assert len(glances_processes.update()) == 100
+        # Exited process (event lost): its pid is forgotten by the scan
+        for f in (tmp_path / '1001').iterdir():
+            f.unlink()
+        (tmp_path / '1001').rmdir()
+        # New program executed by an existing process: cached command line is refreshed
+        (tmp_path / '1002' / 'cmdline').write_bytes(b'/usr/bin/new\x00')
+        connector.inject(PROC_EVENT_EXEC, 1002, 1002)
+        processes = {p['pid']: p for p in glances_processes.update()}
+        assert len(processes) == 99
+        assert 1001 not in connector.get_pids()
+        assert processes[1002]['cmdline'] == ['/usr/bin/new']
+        assert processes[1003]['cmdline'] == ['/usr/bin/proc', '--pid', '1003']
+    finally:
+        glances_processes.set_backend('psutil')
+    # Fallback when the proc connector is not available
+    glances_processes.set_backend('procfs')
+    try:
+        with patch('socket.socket', side_effect=OSError('Operation not permitted')):
+            assert not glances_processes.enable_proc_connector()
+        assert glances_processes._procfs.proc_connector is None
+    finally:
+        glances_processes.set_backend('psutil')
+    assert not glances_processes.enable_proc_connector()
+
+
+def test_proc_connector_live():
+    """Check the proc connector events sent by the kernel (if available)."""
+    connector = GlancesProcConnector()
+    if not connector.start():
+        pytest.skip("Proc connector is not available")
+    try:
+        connector.get_pids()
+        p = subprocess.Popen(['sleep', '1'])
+        for _ in range(50):
+            if p.pid in connector.get_pids():
+                break
+            time.sleep(0.05)
+        assert p.pid in connector.get_pids()
+        p.wait()
+        for _ in range(50):
+            if p.pid not in connector.get_pids():
+                break
+            time.sleep(0.05)
+        assert p.pid not in connector.get_pids()
+    finally:
+        connector.stop()
+
+
+def test_extended_stats_worker():
+    """Check the extended stats are grabbed in background (the caller never waits)."""
+    grabbed = []
+
+    def grab(pid):
+        time.sleep(0.2)
+        grabbed.append(pid)
+        if pid == 2:
+            raise psutil.NoSuchProcess(pid)
+        if pid == 3 and grabbed.count(3) == 1:
+            raise UnboundLocalError('unexpected error')
+        return {'num_fds': pid}
+
+    worker = GlancesExtendedStatsWorker(grab, refresh=0.05)
+    try:
+        start = time.perf_counter()
+        worker.request(1)
+        assert worker.get(1) is None
+        assert time.perf_counter() - start < 0.1
+        for _ in range(50):
+            if worker.get(1):
+                break
+            time.sleep(0.05)
+        assert worker.get(1) == {'num_fds': 1}
+        # Refreshed in background
+        for _ in range(50):
+            if len(grabbed) > 2:
+                break
+            time.sleep(0.05)
+        assert grabbed[:3] == [1, 1, 1]
+        # Process has gone
+        worker.request(2)
+        assert worker.get(2) is None
+        for _ in range(50):
+            if worker.get(2) is False:
+                break
+            time.sleep(0.05)
+        assert worker.get(2) is False
+        # Unexpected error: the thread is still running and grabs the stats again
+        worker.request(3)
+        for _ in range(50):
+            if worker.get(3):
+                break
+            time.sleep(0.05)
+        assert worker.get(3) == {'num_fds': 3}
+        assert grabbed.count(3) >= 2
+        worker.cancel()
+        assert worker.get(3) is None
+    finally:
+        worker.stop()
+
+
+def test_processes_extended_stats():
+    """Check the extended stats of the selected process are added from the worker."""
+    me = {'pid': os.getpid(), 'cpu_percent': 10.0, 'memory_percent': 1.0}
+    glances_processes.extended_process = dict(me)
+    ret = glances_processes.set_extended_stats(dict(me))
+    assert ret['extended_stats'] and ret['cpu_min'] == 10.0
+    for _ in range(100):
+        ret = glances_processes.set_extended_stats(dict(me))
+        if 'num_ctx_switches' in ret:
+            break
+        time.sleep(0.05)
+    assert ret['num_fds'] > 0
+    assert ret['cpu_mean_counter'] > 1
+    glances_processes.extended_process = None
+    glances_processes.extended_stats_worker.cancel()
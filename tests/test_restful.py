@@ -139,6 +139,7 @@ class TestGlances(unittest.TestCase):
                 'containers',
                 'vms',
                 'npu',
+                'selfmon',
             ):
                 if isinstance(req.json(), dict) and not req.json():
                     # Specific case for plugins that can be empty on VM (like sensors, containers...)
@@ -236,6 +237,14 @@ class TestGlances(unittest.TestCase):
         req = self.http_get(f"{URL}/cpu/system/{method}")
         self.assertIsInstance(req.json(), list)
         self.assertIsInstance(req.json()[0], list)
+        print(f"HTTP RESTful request: {URL}/cpu/{method}?resolution=1m")
+        req = self.http_get(f"{URL}/cpu/{method}?resolution=1m&consolidation=max")
+        self.assertIsInstance(req.json(), dict)
+        self.assertTrue(len(req.json()['user']) > 0)
+        req = self.http_get(f"{URL}/cpu/system/{method}?resolution=15m&since=3600")
+        self.assertIsInstance(req.json(), list)
+        req = self.http_get(f"{URL}/cpu/{method}?resolution=1y")
+        self.assertEqual(req.status_code, 400)
         print(f"HTTP RESTful request: {URL}/cpu/system/{method}/3")
         req = self.http_get(f"{URL}/cpu/system/{method}/3")
         self.assertIsInstance(req.json(), list)
@@ -327,6 +336,35 @@ class TestGlances(unittest.TestCase):
             self.assertIsInstance(req.json(), dict)
             self.assertIsInstance(req.json()[item], int)
 
+    def test_018_internal_cache(self):
+        """Check the stats cache counters."""
+        method = "internal/cache"
+        print('INFO: [TEST_018] Stats cache counters')
+        # Two requests in a row: the second one should be served by the cache
+        self.http_get(f"{URL}/mem")
+        self.http_get(f"{URL}/mem")
+        print(f"HTTP RESTful request: {URL}/{method}")
+        req = self.http_get(f"{URL}/{method}")
+
+        self.assertTrue(req.ok)
+        self.assertIsInstance(req.json()['plugins'], dict)
+        self.assertIsInstance(req.json()['restful'], dict)
+        self.assertGreater(req.json()['plugins']['keys']['mem']['hit'], 0)
+
+    def test_019_internal_perf(self):
+        """Check the self-monitoring stats."""
+        method = "internal/perf"
+        print('INFO: [TEST_019] Self-monitoring stats')
+        self.http_get(f"{URL}/mem")
+        print(f"HTTP RESTful request: {URL}/{method}")
+        req = self.http_get(f"{URL}/{method}")
+
+        self.assertTrue(req.ok)
+        self.assertIn('mem', req.json()['plugin'])
+        mem = req.json()['plugin']['mem']
+        self.assertGreater(mem['durations']['update']['count'], 0)
+        self.assertGreater(mem['memory'], 0)
+
     def test_100_browser(self):
         """Get /serverslist (for Glances Central Browser)."""
         print('INFO: [TEST_100] Get /serverslist (for Glances Central Browser)')